@@ -14,6 +14,11 @@ from app.db.base import Base
 from app.models.user import User  # noqa
 from app.models.job import Job  # noqa
 from app.models.application import Application  # noqa
+from app.models.email_outbox import EmailOutbox  # noqa
+from app.models.pending_notification import PendingNotification  # noqa
+from app.models.resume_fingerprint import ResumeFingerprint, ResumeLSHBucket  # noqa
+from app.models.candidate_profile import CandidateProfile, CandidateSkill  # noqa
+from app.models.job_requirement import JobRequirement, RequirementVerdict  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,74 @@
+"""Store ai_analysis as native JSON/JSONB with generated score columns
+
+Revision ID: 1100000000000
+Revises: 99ddb2cd0294
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '1100000000000'
+down_revision = '99ddb2cd0294'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # Existing rows were written with json.dumps, so the cast is safe
+        op.alter_column(
+            'application', 'ai_analysis',
+            type_=postgresql.JSONB(),
+            existing_type=sa.Text(),
+            postgresql_using='ai_analysis::jsonb',
+        )
+        op.add_column('application', sa.Column(
+            'match_count', sa.Integer(),
+            sa.Computed("CAST(ai_analysis ->> 'match_count' AS INTEGER)", persisted=True),
+        ))
+        op.add_column('application', sa.Column(
+            'total_must_haves', sa.Integer(),
+            sa.Computed("CAST(ai_analysis ->> 'total_must_haves' AS INTEGER)", persisted=True),
+        ))
+        op.execute(
+            "CREATE INDEX ix_application_gap_analysis ON application "
+            "USING gin ((ai_analysis -> 'gap_analysis'))"
+        )
+    else:
+        # SQLite cannot ALTER a column type or add STORED columns in place; rebuild the table
+        with op.batch_alter_table('application', recreate='always') as batch_op:
+            batch_op.alter_column('ai_analysis', type_=sa.JSON(), existing_type=sa.Text())
+            batch_op.add_column(sa.Column(
+                'match_count', sa.Integer(),
+                sa.Computed("CAST(json_extract(ai_analysis, '$.match_count') AS INTEGER)", persisted=True),
+            ))
+            batch_op.add_column(sa.Column(
+                'total_must_haves', sa.Integer(),
+                sa.Computed("CAST(json_extract(ai_analysis, '$.total_must_haves') AS INTEGER)", persisted=True),
+            ))
+
+    op.create_index('ix_application_job_match_count', 'application', ['job_id', 'match_count'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_application_job_match_count', table_name='application')
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_application_gap_analysis")
+        op.drop_column('application', 'total_must_haves')
+        op.drop_column('application', 'match_count')
+        op.alter_column(
+            'application', 'ai_analysis',
+            type_=sa.Text(),
+            existing_type=postgresql.JSONB(),
+            postgresql_using='ai_analysis::text',
+        )
+    else:
+        with op.batch_alter_table('application', recreate='always') as batch_op:
+            batch_op.drop_column('total_must_haves')
+            batch_op.drop_column('match_count')
+            batch_op.alter_column('ai_analysis', type_=sa.Text(), existing_type=sa.JSON())
@@ -0,0 +1,23 @@
+"""Add row version to job for optimistic locking and ETags
+
+Revision ID: 1200000000000
+Revises: 1100000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '1200000000000'
+down_revision = '1100000000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('job', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    op.drop_column('job', 'version')
@@ -0,0 +1,42 @@
+"""Create emailoutbox table for transactional email delivery
+
+Revision ID: 1300000000000
+Revises: 1200000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '1300000000000'
+down_revision = '1200000000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'emailoutbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('to_email', sa.String(), nullable=False),
+        sa.Column('subject', sa.String(), nullable=False),
+        sa.Column('text_body', sa.Text(), nullable=False),
+        sa.Column('html_body', sa.Text(), nullable=True),
+        sa.Column('status', sa.Enum('PENDING', 'SENT', 'DEAD', name='emailstatus'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_emailoutbox_id'), 'emailoutbox', ['id'], unique=False)
+    op.create_index('ix_emailoutbox_status_next_attempt', 'emailoutbox', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_emailoutbox_status_next_attempt', table_name='emailoutbox')
+    op.drop_index(op.f('ix_emailoutbox_id'), table_name='emailoutbox')
+    op.drop_table('emailoutbox')
+    sa.Enum(name='emailstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,38 @@
+"""Create pendingnotification table for digest emails
+
+Revision ID: 1400000000000
+Revises: 1300000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '1400000000000'
+down_revision = '1300000000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'pendingnotification',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('recipient_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['recipient_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['job_id'], ['job.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_pendingnotification_id'), 'pendingnotification', ['id'], unique=False)
+    op.create_index('ix_pendingnotification_recipient_created', 'pendingnotification', ['recipient_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pendingnotification_recipient_created', table_name='pendingnotification')
+    op.drop_index(op.f('ix_pendingnotification_id'), table_name='pendingnotification')
+    op.drop_table('pendingnotification')
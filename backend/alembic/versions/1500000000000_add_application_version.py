@@ -0,0 +1,23 @@
+"""Add row version to application for optimistic concurrency
+
+Revision ID: 1500000000000
+Revises: 1400000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '1500000000000'
+down_revision = '1400000000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('application', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    op.drop_column('application', 'version')
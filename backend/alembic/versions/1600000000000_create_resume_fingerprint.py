@@ -0,0 +1,50 @@
+"""Create resumefingerprint and resumelshbucket tables for near-duplicate resumes
+
+Revision ID: 1600000000000
+Revises: 1500000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '1600000000000'
+down_revision = '1500000000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'resumefingerprint',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('minhash', sa.LargeBinary(), nullable=False),
+        sa.Column('words', sa.LargeBinary(), nullable=False),
+        sa.Column('requirements_hash', sa.String(length=64), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['application_id'], ['application.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_resumefingerprint_id'), 'resumefingerprint', ['id'], unique=False)
+    op.create_index('ix_resumefingerprint_user_requirements', 'resumefingerprint', ['user_id', 'requirements_hash'], unique=False)
+    op.create_index('ix_resumefingerprint_application_id', 'resumefingerprint', ['application_id'], unique=False)
+    op.create_table(
+        'resumelshbucket',
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.Column('fingerprint_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['fingerprint_id'], ['resumefingerprint.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('bucket', 'fingerprint_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('resumelshbucket')
+    op.drop_index('ix_resumefingerprint_application_id', table_name='resumefingerprint')
+    op.drop_index('ix_resumefingerprint_user_requirements', table_name='resumefingerprint')
+    op.drop_index(op.f('ix_resumefingerprint_id'), table_name='resumefingerprint')
+    op.drop_table('resumefingerprint')
@@ -0,0 +1,44 @@
+"""Create candidateprofile and candidateskill tables for skill search
+
+Revision ID: 1700000000000
+Revises: 1600000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '1700000000000'
+down_revision = '1600000000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'candidateprofile',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('titles', sa.JSON(), nullable=False),
+        sa.Column('employers', sa.JSON(), nullable=False),
+        sa.Column('extracted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_table(
+        'candidateskill',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('skill', sa.String(length=64), nullable=False),
+        sa.Column('years', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['candidateprofile.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'skill'),
+    )
+    # Read backwards by skill search: most years first, unknown years last
+    op.create_index('ix_candidateskill_skill_years_user', 'candidateskill', ['skill', sa.text('years NULLS FIRST'), 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidateskill_skill_years_user', table_name='candidateskill')
+    op.drop_table('candidateskill')
+    op.drop_table('candidateprofile')
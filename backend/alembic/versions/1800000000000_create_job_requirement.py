@@ -0,0 +1,49 @@
+"""Create jobrequirement and requirementverdict tables, add application.resume_hash
+
+Revision ID: 1800000000000
+Revises: 1700000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '1800000000000'
+down_revision = '1700000000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'jobrequirement',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=8), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('requirement_hash', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['job.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_jobrequirement_id'), 'jobrequirement', ['id'], unique=False)
+    op.create_index('ix_jobrequirement_job_kind_position', 'jobrequirement', ['job_id', 'kind', 'position'], unique=False)
+    op.create_table(
+        'requirementverdict',
+        sa.Column('resume_hash', sa.String(length=64), nullable=False),
+        sa.Column('requirement_hash', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('note', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('resume_hash', 'requirement_hash'),
+    )
+    op.add_column('application', sa.Column('resume_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('application', 'resume_hash')
+    op.drop_table('requirementverdict')
+    op.drop_index('ix_jobrequirement_job_kind_position', table_name='jobrequirement')
+    op.drop_index(op.f('ix_jobrequirement_id'), table_name='jobrequirement')
+    op.drop_table('jobrequirement')
@@ -0,0 +1,35 @@
+"""Add trigram index for admin user search
+
+Revision ID: 1900000000000
+Revises: 1800000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '1900000000000'
+down_revision = '1800000000000'
+branch_labels = None
+depends_on = None
+
+# Must stay identical to SEARCH_DOCUMENT in app/models/user.py, or the planner won't use the index
+SEARCH_DOCUMENT = (
+    "lower(coalesce(email, '') || ' ' || coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(company_name, '') || ' ' || coalesce(city, '') || ' ' || coalesce(state, ''))"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute(f'CREATE INDEX ix_user_search_trgm ON "user" USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_user_search_trgm', table_name='user')
@@ -0,0 +1,46 @@
+"""Add normalized location columns to job and user
+
+Revision ID: 2000000000000
+Revises: 1900000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2000000000000'
+down_revision = '1900000000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('job', sa.Column('city', sa.String(), nullable=True))
+    op.add_column('job', sa.Column('state', sa.String(), nullable=True))
+    op.add_column('job', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('job', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('job', sa.Column('geohash', sa.BigInteger(), nullable=True))
+    op.add_column('job', sa.Column('is_remote', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_index('ix_job_state_city', 'job', ['state', 'city'], unique=False)
+    op.create_index('ix_job_geohash', 'job', ['geohash'], unique=False)
+    op.add_column('user', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('user', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('user', sa.Column('geohash', sa.BigInteger(), nullable=True))
+    op.create_index('ix_user_geohash', 'user', ['geohash'], unique=False)
+    # Existing rows: python -m app.services.locations
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_geohash', table_name='user')
+    op.drop_column('user', 'geohash')
+    op.drop_column('user', 'longitude')
+    op.drop_column('user', 'latitude')
+    op.drop_index('ix_job_geohash', table_name='job')
+    op.drop_index('ix_job_state_city', table_name='job')
+    op.drop_column('job', 'is_remote')
+    op.drop_column('job', 'geohash')
+    op.drop_column('job', 'longitude')
+    op.drop_column('job', 'latitude')
+    op.drop_column('job', 'state')
+    op.drop_column('job', 'city')
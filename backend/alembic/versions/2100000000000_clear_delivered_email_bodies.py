@@ -0,0 +1,23 @@
+"""Clear the bodies of delivered and dead-lettered outbox emails
+
+Revision ID: 2100000000000
+Revises: 2000000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2100000000000'
+down_revision = '2000000000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Password reset emails carry the temporary password; the sender now clears bodies itself
+    op.execute("UPDATE emailoutbox SET text_body = '', html_body = NULL WHERE status IN ('SENT', 'DEAD')")
+
+
+def downgrade() -> None:
+    pass
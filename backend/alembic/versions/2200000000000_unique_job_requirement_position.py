@@ -0,0 +1,29 @@
+"""Make jobrequirement (job_id, kind, position) unique
+
+Revision ID: 2200000000000
+Revises: 2100000000000
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2200000000000'
+down_revision = '2100000000000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Concurrent first screenings could both insert a job's rows; keep the first copy
+    op.execute(
+        "DELETE FROM jobrequirement WHERE id NOT IN "
+        "(SELECT MIN(id) FROM jobrequirement GROUP BY job_id, kind, position)"
+    )
+    op.drop_index('ix_jobrequirement_job_kind_position', table_name='jobrequirement')
+    op.create_unique_constraint('uq_jobrequirement_job_kind_position', 'jobrequirement', ['job_id', 'kind', 'position'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_jobrequirement_job_kind_position', 'jobrequirement', type_='unique')
+    op.create_index('ix_jobrequirement_job_kind_position', 'jobrequirement', ['job_id', 'kind', 'position'], unique=False)
@@ -17,9 +17,34 @@ reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login/access-token"
 )
 
+optional_oauth2 = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/login/access-token", auto_error=False
+)
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db), token: str = Depends(reusable_oauth2)
 ) -> User:
+    return await _user_from_token(db, token)
+
+async def get_current_user_for_stream(
+    db: AsyncSession = Depends(get_db),
+    token: Optional[str] = Depends(optional_oauth2),
+    access_token: Optional[str] = None,
+) -> User:
+    """
+    Like get_current_user, but also accepts ?access_token= because browser
+    EventSource connections cannot send an Authorization header.
+    """
+    token = token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await _user_from_token(db, token)
+
+async def _user_from_token(db: AsyncSession, token: str) -> User:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -1,24 +1,38 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from typing import Any, List, Optional
+import anyio.to_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.api import deps
 from app.models.user import User, UserRole
-from app.schemas.user import User as UserSchema
+from app.schemas.user import CandidateMatch, DuplicateAccounts, User as UserSchema
 from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.profiling import MemoryCapture, SamplingProfiler
+from app.core.serialization import RowLayout, serialize_list
+from app.services import candidate_profiles, job_cache, resume_dedup, user_search
 
 router = APIRouter()
 
+# One profile per worker at a time; they would distort each other
+_profile_lock = asyncio.Lock()
+
 @router.get("/users", response_model=List[UserSchema])
 async def read_users(
     db: AsyncSession = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    q: Optional[str] = Query(None, description="Search email, name, company, city and state; typo tolerant on Postgres"),
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """
-    Retrieve all users. Admin only.
+    Retrieve users, optionally searched and filtered, best matches first. The number
+    of matching users is returned in the X-Total-Count header. Admin only.
     """
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -26,10 +40,11 @@ async def read_users(
             detail="Not authorized",
         )
     
-    stmt = select(User).offset(skip).limit(limit)
-    result = await db.execute(stmt)
-    users = result.scalars().all()
-    return users
+    layout = RowLayout(User, UserSchema)
+    rows, total = await user_search.search_users(db, layout.columns, q, role, is_active, skip, limit)
+    response = serialize_list(UserSchema, layout.build_all(rows))
+    response.headers["X-Total-Count"] = str(total)
+    return response
 
 @router.put("/users/{user_id}/status", response_model=UserSchema)
 async def update_user_status(
@@ -62,4 +77,115 @@ async def update_user_status(
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    await job_cache.owner_changed(user)
     return user
+
+@router.get("/duplicate-resumes", response_model=List[DuplicateAccounts])
+async def read_duplicate_resumes(
+    db: AsyncSession = Depends(deps.get_db),
+    threshold: float = Query(0.8, ge=0.5, le=1),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Pairs of accounts (any emails or roles) that uploaded near-identical resumes,
+    most similar first. Admin only.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized",
+        )
+    return await resume_dedup.find_duplicate_accounts(db, threshold, limit)
+
+
+@router.get("/candidates", response_model=List[CandidateMatch])
+async def search_candidates(
+    db: AsyncSession = Depends(deps.get_db),
+    skill: List[str] = Query(..., description='Required skills, optionally with minimum years: "kubernetes:5"'),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Active candidates with every given skill, from the profiles extracted from their
+    resumes. Skill names are normalized ("k8s" finds Kubernetes). Admin only.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized",
+        )
+    if len(skill) > candidate_profiles.MAX_SEARCH_SKILLS:
+        raise HTTPException(status_code=400, detail=f"At most {candidate_profiles.MAX_SEARCH_SKILLS} skills per search")
+    try:
+        requirements = [candidate_profiles.parse_skill_filter(value) for value in skill]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    layout = RowLayout(User, UserSchema)
+    rows, skills = await candidate_profiles.search_candidates(db, requirements, layout.columns, skip, limit)
+    width = len(layout.columns)
+    items = [
+        {"user": layout.build(row), "titles": row[width], "employers": row[width + 1], "skills": skills.get(row.id, [])}
+        for row in rows
+    ]
+    return serialize_list(CandidateMatch, items)
+
+
+def _check_profiling(current_user: User, seconds: float) -> None:
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized",
+        )
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if seconds > settings.PROFILING_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be at most {settings.PROFILING_MAX_SECONDS}")
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+
+@router.post("/profile/cpu", response_class=PlainTextResponse)
+async def profile_cpu(
+    seconds: float = Query(10, gt=0),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Sample this worker's stacks for `seconds` and return them in collapsed
+    (flamegraph) format. Admin only.
+    """
+    _check_profiling(current_user, seconds)
+    async with _profile_lock:
+        profiler = SamplingProfiler(seconds, interval_ms / 1000)
+        # Sample from a thread so the event loop keeps serving the traffic being profiled
+        await anyio.to_thread.run_sync(profiler.run)
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={
+            "Content-Disposition": 'attachment; filename="cpu-profile.collapsed"',
+            "X-Profile-Samples": str(profiler.samples),
+        },
+    )
+
+@router.post("/profile/memory")
+async def profile_memory(
+    seconds: float = Query(30, gt=0),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    limit: int = Query(50, ge=1, le=500),
+    frames: int = Query(10, ge=1, le=64),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Trace allocations for `seconds` and return the largest growth between the start
+    and end snapshots. Admin only.
+    """
+    _check_profiling(current_user, seconds)
+    async with _profile_lock:
+        capture = MemoryCapture(frames)
+        await anyio.to_thread.run_sync(capture.start)
+        await asyncio.sleep(seconds)
+        result = await anyio.to_thread.run_sync(capture.finish, group_by, limit)
+    return {"seconds": seconds, "group_by": group_by, **result}
+
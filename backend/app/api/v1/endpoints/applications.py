@@ -1,16 +1,35 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+import asyncio
+from typing import Any, List, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import aliased, selectinload
 from sqlalchemy.sql import func
 
 from app.api import deps
 from app.models.application import Application, ApplicationStatus
+from app.models.candidate_profile import CandidateProfile
 from app.models.job import Job
 from app.models.user import User, UserRole
-from app.schemas.application import ApplicationCreate, ApplicationResponse
+from app.schemas.application import (
+    ApplicationBulkResult,
+    ApplicationBulkReviewedUpdate,
+    ApplicationBulkStatusUpdate,
+    ApplicationBulkTarget,
+    ApplicationCreate,
+    ApplicationResponse,
+    ApplicationVersion,
+)
+from app.schemas.job import JobResponse
+from app.schemas.user import User as UserSchema, UserInDBBase
 from app.api.deps import get_current_user
+from app.core.serialization import RowLayout, serialize_list
+from app.core import metrics, tracing
+from app.core.config import settings
+from app.core.events import candidate_topic, event_broker, publish_application_event, sse_stream
+from app.services import application_filters, candidate_profiles, notifications, requirement_screening, resume_dedup
+from app.services.email_outbox import wake_outbox_sender
 
 router = APIRouter()
 
@@ -54,13 +73,16 @@ async def create_application(
 
     # Save resume file
     file_location = f"uploads/{current_user.id}_{job_id}_{resume.filename}"
-    file_content = await resume.read()
-    with open(file_location, "wb+") as file_object:
-        file_object.write(file_content)
+    with tracing.span("resume.upload") as span:
+        file_content = await resume.read()
+        span.set_attribute("resume.bytes", len(file_content))
+        with open(file_location, "wb+") as file_object:
+            file_object.write(file_content)
+    metrics.upload_bytes.inc(amount=len(file_content))
+    metrics.upload_size.observe(len(file_content))
     
     # Extract text and run AI screening
     from app.services.ai_screening import ai_screening_service
-    import json
     
     resume_text = ai_screening_service.extract_text(file_content, resume.filename)
     
@@ -69,20 +91,45 @@ async def create_application(
          # For now proceeding with empty text which will likely give poor AI results, but better than crashing.
          print(f"Warning: Could not extract text from {resume.filename}")
 
-    ai_result = await ai_screening_service.evaluate_candidate(
-        resume_text=resume_text,
-        job_title=job.title,
-        must_have_requirements=job.requirements or "",
-        nice_to_have_requirements=job.nice_to_have_requirements
-    )
+    fingerprint = resume_dedup.fingerprint(resume_text) if settings.RESUME_DEDUP_ENABLED else None
+    resume_hash = None
+    if resume_text.strip():
+        resume_hash = fingerprint.content_hash if fingerprint is not None else resume_dedup.content_hash(resume_text)
+    profile_task = None
+    if settings.CANDIDATE_PROFILE_EXTRACTION_ENABLED and resume_hash:
+        # Extract skills once per distinct resume, concurrently with the screening below
+        profile = await db.get(CandidateProfile, current_user.id)
+        if profile is None or profile.content_hash != resume_hash:
+            profile_task = asyncio.create_task(ai_screening_service.extract_profile(resume_text))
+    requirements_hash = resume_dedup.requirements_hash(job.title, job.requirements, job.nice_to_have_requirements)
+    ai_result = None
+    if fingerprint is not None:
+        ai_result, outcome = await resume_dedup.find_reusable_screening(
+            db, current_user.id, fingerprint, requirements_hash,
+            resume_dedup.requirement_words(job.title, job.requirements, job.nice_to_have_requirements),
+        )
+        metrics.screening_reuse.inc(outcome)
+    if ai_result is None and settings.REQUIREMENT_SCREENING_ENABLED and resume_hash:
+        ai_result = await requirement_screening.screen(db, job, resume_text, resume_hash)
+    if ai_result is None:
+        ai_result = await ai_screening_service.evaluate_candidate(
+            resume_text=resume_text,
+            job_title=job.title,
+            must_have_requirements=job.requirements or "",
+            nice_to_have_requirements=job.nice_to_have_requirements
+        )
+        ai_result = ai_screening_service.normalize_result(ai_result)
     
+    email_queued = False
     if existing_application:
         # Update existing
         existing_application.resume_path = file_location
+        existing_application.resume_hash = resume_hash
         existing_application.ai_score = ai_result.get("score", 0)
-        existing_application.ai_analysis = json.dumps(ai_result)
+        existing_application.ai_analysis = ai_result
         existing_application.created_at = func.now() # Update timestamp
         application = existing_application
+        await resume_dedup.remove_fingerprints(db, application.id)
     else:
         # Create new
         application = Application(
@@ -90,21 +137,156 @@ async def create_application(
             job_id=job_id,
             status=ApplicationStatus.APPLIED,
             resume_path=file_location,
+            resume_hash=resume_hash,
             ai_score=ai_result.get("score", 0),
-            ai_analysis=json.dumps(ai_result)
+            ai_analysis=ai_result
         )
         db.add(application)
-        
-    await db.commit()
-    await db.refresh(application)
-    await db.refresh(job) # Refresh job to ensure back_populates works if needed
-    await db.refresh(current_user) # Refresh user to ensure attributes are loaded
+        await db.flush()
+        email_queued = notifications.notify_application_received(db, current_user, job)
+        notifications.record_new_applicant(db, application, current_user, job)
+    if fingerprint is not None:
+        resume_dedup.add_fingerprint(db, fingerprint, current_user.id, application.id, requirements_hash)
+    if profile_task is not None:
+        await candidate_profiles.save_profile(db, current_user.id, resume_hash, await profile_task, profile)
+
+    with tracing.span("db.commit"):
+        await db.commit()
+    if email_queued:
+        wake_outbox_sender()
+    with tracing.span("db.refresh"):
+        await db.refresh(application)
+        await db.refresh(job) # Refresh job to ensure back_populates works if needed
+        await db.refresh(current_user) # Refresh user to ensure attributes are loaded
     application.job = job
     application.user = current_user
-    application.ai_analysis_json = ai_result
+
+    if not existing_application:
+        await publish_application_event("application.created", application, status=application.status.value)
+    await publish_application_event(
+        "application.screened", application,
+        ai_score=application.ai_score,
+        match_count=application.match_count,
+        total_must_haves=application.total_must_haves,
+    )
     
     return application
 
+async def _bulk_update(
+    db: AsyncSession,
+    current_user: User,
+    target: ApplicationBulkTarget,
+    column: Any,
+    value: Any,
+) -> Tuple[ApplicationBulkResult, List[Any]]:
+    """
+    Set `column` to `value` on the targeted applications with a single UPDATE.
+    Authorization, the target filter and expected versions are all WHERE clauses;
+    rows already holding `value` are left alone. Does not commit.
+    """
+    requested = target.ids if target.ids is not None else [item.id for item in target.items or []]
+    if target.filter is None and not requested:
+        return ApplicationBulkResult(updated=0, ids=[]), []
+    if len(requested) > settings.BULK_UPDATE_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BULK_UPDATE_MAX_IDS} applications per request")
+
+    scope = application_filters.manageable_by(current_user)
+    if target.filter is not None:
+        scope += application_filters.bulk_filter_clauses(db.get_bind().dialect.name, target.filter)
+    else:
+        scope.append(Application.id.in_(requested))
+
+    version_check = []
+    if target.items is not None:
+        expected = {item.id: item.version for item in target.items}
+        version_check.append(Application.version == case(expected, value=Application.id))
+
+    stmt = (
+        update(Application)
+        .where(*scope, *version_check, column != value)
+        .values({column: value, Application.version: Application.version + 1})
+        .returning(Application.id, Application.job_id, Application.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    rows = result.all()
+    updated_ids = sorted(row.id for row in rows)
+
+    bulk_result = ApplicationBulkResult(updated=len(rows), ids=updated_ids)
+    leftover = set(requested) - set(updated_ids)
+    if leftover:
+        # Explain the rows the UPDATE skipped
+        result = await db.execute(
+            select(Application.id, Application.version, column.label("current"))
+            .where(Application.id.in_(leftover), *scope)
+        )
+        found = set()
+        for row in result.all():
+            found.add(row.id)
+            if row.current == value:
+                bulk_result.unchanged.append(row.id)
+            else:
+                bulk_result.conflicts.append(ApplicationVersion(id=row.id, version=row.version))
+        bulk_result.unchanged.sort()
+        bulk_result.conflicts.sort(key=lambda item: item.id)
+        bulk_result.not_found = sorted(leftover - found)
+    return bulk_result, rows
+
+@router.patch("/bulk/status", response_model=ApplicationBulkResult)
+async def bulk_update_status(
+    body: ApplicationBulkStatusUpdate,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Move many applications to one status, e.g. every applicant scoring under 40 on a
+    job to REJECTED. Target them by `ids`, by `items` (id + expected version; rows
+    edited since are reported as conflicts) or by `filter`. Only the job owner or an admin.
+    """
+    if current_user.role == UserRole.CANDIDATE:
+        raise HTTPException(status_code=403, detail="Candidates cannot change application status")
+
+    bulk_result, rows = await _bulk_update(db, current_user, body, Application.status, body.status)
+
+    emails_queued = False
+    if rows and notifications.notifications_enabled():
+        result = await db.execute(
+            select(User.email, User.first_name, Job.title)
+            .select_from(Application)
+            .join(User, Application.user_id == User.id)
+            .join(Job, Application.job_id == Job.id)
+            .where(Application.id.in_(bulk_result.ids))
+        )
+        for recipient in result.all():
+            # The row carries both the candidate's and the job's fields
+            emails_queued |= notifications.notify_status_changed(db, recipient, recipient, body.status.value)
+    await db.commit()
+    if emails_queued:
+        wake_outbox_sender()
+
+    for row in rows:
+        await publish_application_event("application.status_changed", row, status=body.status.value)
+    return bulk_result
+
+@router.patch("/bulk/reviewed", response_model=ApplicationBulkResult)
+async def bulk_set_reviewed(
+    body: ApplicationBulkReviewedUpdate,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Set is_reviewed on many applications at once. Targets as for /bulk/status.
+    """
+    if current_user.role == UserRole.CANDIDATE:
+        raise HTTPException(status_code=403, detail="Candidates cannot mark applications as reviewed")
+
+    bulk_result, rows = await _bulk_update(db, current_user, body, Application.is_reviewed, body.is_reviewed)
+    await db.commit()
+
+    for row in rows:
+        await publish_application_event("application.reviewed", row, is_reviewed=body.is_reviewed)
+    return bulk_result
+
 @router.patch("/{application_id}/reviewed")
 async def toggle_reviewed(
     application_id: int,
@@ -126,8 +308,68 @@ async def toggle_reviewed(
     application.is_reviewed = not application.is_reviewed
     await db.commit()
     await db.refresh(application)
+    await publish_application_event("application.reviewed", application, is_reviewed=application.is_reviewed)
     return {"id": application.id, "is_reviewed": application.is_reviewed}
 
+@router.patch("/{application_id}/status")
+async def update_application_status(
+    application_id: int,
+    new_status: ApplicationStatus = Query(..., alias="status"),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Move an application to a new status. Only the job owner or an admin.
+    """
+    if current_user.role == UserRole.CANDIDATE:
+        raise HTTPException(status_code=403, detail="Candidates cannot change application status")
+
+    stmt = select(Application).options(
+        selectinload(Application.job), selectinload(Application.user)
+    ).where(Application.id == application_id)
+    result = await db.execute(stmt)
+    application = result.scalars().first()
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    if current_user.role == UserRole.CLIENT and application.job.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to update this application")
+
+    previous_status = application.status
+    application.status = new_status
+    email_queued = previous_status != new_status and notifications.notify_status_changed(
+        db, application.user, application.job, new_status.value
+    )
+    await db.commit()
+    await db.refresh(application)
+    if email_queued:
+        wake_outbox_sender()
+    if previous_status != new_status:
+        await publish_application_event(
+            "application.status_changed", application,
+            status=new_status.value, previous_status=previous_status.value,
+        )
+    return {"id": application.id, "status": application.status}
+
+@router.get("/me/events")
+async def stream_my_application_events(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user_for_stream),
+) -> Any:
+    """
+    Server-sent events for my applications: screening results, status changes.
+    """
+    topic = candidate_topic(current_user.id)
+    # Don't hold a pooled connection for the lifetime of the stream
+    await db.close()
+    subscription = event_broker.subscribe(topic)
+    return StreamingResponse(
+        sse_stream(request, subscription, settings.EVENT_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/me", response_model=List[ApplicationResponse])
 async def read_my_applications(
     db: AsyncSession = Depends(deps.get_db),
@@ -145,25 +387,24 @@ async def read_my_applications(
         # or just return whatever they have (if any).
         pass
 
-    stmt = select(Application).options(
-        selectinload(Application.job).selectinload(Job.owner)
-    ).where(
-        Application.user_id == current_user.id
-    ).offset(skip).limit(limit)
+    owner = aliased(User)
+    layout = RowLayout(
+        Application, ApplicationResponse,
+        job=RowLayout(Job, JobResponse, owner=RowLayout(owner, UserSchema)),
+        user=RowLayout(User, UserInDBBase),
+    )
+    stmt = (
+        select(*layout.columns)
+        .select_from(Application)
+        .join(Job, Application.job_id == Job.id)
+        .outerjoin(owner, Job.owner_id == owner.id)
+        .join(User, Application.user_id == User.id)
+        .where(Application.user_id == current_user.id)
+        .offset(skip).limit(limit)
+    )
     
     result = await db.execute(stmt)
-    applications = result.scalars().all()
-    
-    # Parse JSON for response
-    import json
-    for app in applications:
-        if app.ai_analysis:
-            try:
-                app.ai_analysis_json = json.loads(app.ai_analysis)
-            except:
-                app.ai_analysis_json = None
-                
-    return applications
+    return serialize_list(ApplicationResponse, layout.build_all(result.all()))
 
 @router.get("/{id}", response_model=ApplicationResponse)
 async def read_application(
@@ -195,13 +436,5 @@ async def read_application(
         # Check if client owns the job
         if application.job.owner_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to view this application")
-            
-    # Parse JSON
-    import json
-    if application.ai_analysis:
-        try:
-            application.ai_analysis_json = json.loads(application.ai_analysis)
-        except:
-             application.ai_analysis_json = None
              
     return application
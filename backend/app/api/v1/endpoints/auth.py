@@ -12,6 +12,7 @@ from app.core import security
 from app.core.config import settings
 from app.models.user import User, UserRole
 from app.schemas.user import Token, UserCreate
+from app.services import locations
 from app.db.session import get_db
 
 router = APIRouter()
@@ -85,8 +86,7 @@ async def signup(
         middle_initial=user_in.middle_initial,
         last_name=user_in.last_name,
         phone_number=user_in.phone_number,
-        city=user_in.city,
-        state=user_in.state,
+        **locations.user_location_fields(user_in.city, user_in.state),
         years_of_experience=user_in.years_of_experience,
         work_permit_type=user_in.work_permit_type,
         linkedin_url=user_in.linkedin_url,
@@ -122,7 +122,8 @@ async def reset_password(
     """
     import secrets
     import string
-    from app.core.email import send_password_reset_email
+    from app.core.email import queue_password_reset_email
+    from app.services.email_outbox import wake_outbox_sender
 
     try:
         user_role = UserRole(body.role.lower())
@@ -143,12 +144,12 @@ async def reset_password(
     temp_password = ''.join(secrets.choice(alphabet) for _ in range(8))
 
     user.hashed_password = security.get_password_hash(temp_password)
+    # Queue the email in the same transaction; the outbox sender delivers it
+    email_sent = queue_password_reset_email(db, body.email, temp_password, body.role)
     await db.commit()
 
-    # Send email
-    email_sent = send_password_reset_email(body.email, temp_password, body.role)
-
     if email_sent:
+        wake_outbox_sender()
         return {"message": "A temporary password has been sent to your email address."}
     else:
         # Fallback for dev/demo when SMTP is not configured
@@ -9,6 +9,7 @@ from app.api import deps
 from app.core import security
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserUpdate
+from app.services import job_cache, locations
 from app.db.session import get_db
 
 router = APIRouter()
@@ -68,10 +69,13 @@ async def update_user_me(
         current_user.last_name = last_name
     if phone_number is not None:
         current_user.phone_number = phone_number
-    if city is not None:
-        current_user.city = city
-    if state is not None:
-        current_user.state = state
+    if city is not None or state is not None:
+        fields = locations.user_location_fields(
+            city if city is not None else current_user.city,
+            state if state is not None else current_user.state,
+        )
+        for field, value in fields.items():
+            setattr(current_user, field, value)
     if years_of_experience is not None:
         current_user.years_of_experience = years_of_experience
     if work_permit_type is not None:
@@ -86,4 +90,5 @@ async def update_user_me(
     db.add(current_user)
     await db.commit()
     await db.refresh(current_user)
+    await job_cache.owner_changed(current_user)
     return current_user
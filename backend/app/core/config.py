@@ -25,12 +25,137 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: Optional[str] = None
     GEMINI_MODEL: str = "gemini-pro"
 
+    # LLM prices (USD per million tokens, input/output) for the llm_cost_usd_total metric
+    OPENAI_PRICE_PER_MILLION_INPUT: float = 0.15
+    OPENAI_PRICE_PER_MILLION_OUTPUT: float = 0.60
+    GEMINI_PRICE_PER_MILLION_INPUT: float = 0.50
+    GEMINI_PRICE_PER_MILLION_OUTPUT: float = 1.50
+
     # SMTP / Email (Gmail)
     SMTP_HOST: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
     SMTP_USER: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
     SMTP_FROM_EMAIL: Optional[str] = None
+    SMTP_STARTTLS: bool = True
+
+    # Email outbox sender
+    EMAIL_OUTBOX_WORKER: bool = True
+    EMAIL_POOL_SIZE: int = 2
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_POLL_SECONDS: float = 5
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_SECONDS: float = 30
+
+    # Application notifications; new-applicant emails to job owners are batched into digests
+    NOTIFICATIONS_ENABLED: bool = True
+    NOTIFICATION_DIGEST_WINDOW_SECONDS: int = 3600
+    NOTIFICATION_FLUSH_SECONDS: float = 60
+    NOTIFICATION_DIGEST_MAX_JOBS: int = 20
+    NOTIFICATION_DIGEST_MAX_NAMES: int = 5
+
+    # Bulk job import/export and applicant export
+    JOB_IMPORT_BATCH_SIZE: int = 500
+    JOB_IMPORT_MAX_ERRORS: int = 1000
+    JOB_EXPORT_BATCH_SIZE: int = 1000
+    APPLICANT_EXPORT_BATCH_SIZE: int = 1000
+
+    # Bulk application updates
+    BULK_UPDATE_MAX_IDS: int = 5000
+
+    # HTTP caching (read_jobs / read_job)
+    HTTP_CACHE_CANDIDATE_MAX_AGE: int = 30
+    JOB_VERSION_MAP_TTL_SECONDS: float = 10
+    # Facet counts of unfiltered job lists (per role scope), keyed by the set's version
+    JOB_FACET_CACHE_SIZE: int = 256
+    # Cached job reads (read_jobs pages, jobs by id): a per-worker LRU plus an optional shared
+    # tier ("none", "memory" or "redis"). Writes invalidate them through EVENT_BACKEND; with
+    # "memory" events, other workers serve an entry for up to the local TTL after a write.
+    JOB_CACHE_ENABLED: bool = True
+    JOB_CACHE_BACKEND: str = "none"
+    JOB_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    JOB_CACHE_SIZE: int = 1024
+    JOB_CACHE_TTL_SECONDS: float = 60
+    JOB_CACHE_LOCAL_TTL_SECONDS: float = 10
+    # Higher refreshes popular entries earlier before they expire (1.0 is the usual choice)
+    JOB_CACHE_EARLY_REFRESH_BETA: float = 1.0
+
+    # Per-request SQL stats; headers (Server-Timing, X-DB-*) are meant for development
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_STATS_HEADERS: bool = False
+    QUERY_STATS_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Prometheus metrics at /metrics; set a token to require "Authorization: Bearer <token>"
+    METRICS_ENABLED: bool = True
+    METRICS_BEARER_TOKEN: Optional[str] = None
+    # Queue depth gauges are counted at most this often per worker
+    METRICS_QUEUE_CACHE_SECONDS: float = 5
+
+    # Admin CPU/memory profiling of a live worker; idle until a profile is requested
+    PROFILING_ENABLED: bool = True
+    PROFILING_MAX_SECONDS: float = 120
+
+    # Tracing (OpenTelemetry API). Unless an SDK provider is configured, spans go to a
+    # local exporter: "file" (JSON lines in TRACING_FILE) or "console"
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_EXPORTER: str = "file"
+    TRACING_FILE: str = "traces.jsonl"
+
+    # Create missing tables (and the first superuser) when the app starts
+    INIT_DB_ON_STARTUP: bool = True
+
+    # Production launcher (python -m app.server). SERVER_WORKERS=0 sizes the pool from
+    # the available CPUs and memory; workers are recycled after SERVER_MAX_REQUESTS
+    SERVER_WORKERS: int = 0
+    SERVER_WORKERS_PER_CPU: float = 2
+    SERVER_WORKER_MEMORY_MB: int = 192
+    SERVER_MAX_WORKERS: int = 8
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_GRACEFUL_TIMEOUT: float = 8
+    SERVER_WORKER_TIMEOUT: float = 60
+
+    # Reuse the screening of a near-identical resume (MinHash similarity) of the same
+    # candidate for the same job requirements instead of calling the LLM again
+    RESUME_DEDUP_ENABLED: bool = True
+    RESUME_DEDUP_THRESHOLD: float = 0.9
+
+    # Extract skills, titles and employers from each new resume into candidateskill rows
+    # (one LLM call per distinct resume, run alongside the screening)
+    CANDIDATE_PROFILE_EXTRACTION_ENABLED: bool = True
+
+    # Screen against atomic requirements and cache a verdict per (resume, requirement);
+    # after a requirements edit, existing applicants are re-scored for the changes only
+    REQUIREMENT_SCREENING_ENABLED: bool = True
+    RESCREEN_CONCURRENCY: int = 4
+
+    # Job and candidate locations are resolved against this CSV (city, state, latitude,
+    # longitude, aliases); defaults to the bundled app/core/gazetteer.csv
+    GAZETTEER_PATH: Optional[str] = None
+    # Upper bound for the "within N miles" job filter
+    MAX_SEARCH_RADIUS_MILES: float = 500
+
+    # Import the lazily loaded SDKs/parsers in the background once the worker is up
+    PREWARM_IMPORTS: bool = True
+    PREWARM_DELAY_SECONDS: float = 2
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_THREAD_MINIMUM_SIZE: int = 256 * 1024
+
+    # Uploaded resumes: serve cached gzip variants when they save space
+    UPLOADS_PRECOMPRESS: bool = False
+    UPLOADS_PRECOMPRESSED_DIR: str = "uploads_precompressed"
+
+    # Real-time events (SSE): "memory" for a single worker, "postgres" for LISTEN/NOTIFY
+    EVENT_BACKEND: str = "memory"
+    EVENT_SUBSCRIBER_BUFFER: int = 100
+    EVENT_HEARTBEAT_SECONDS: float = 15
+    # "postgres": delay before re-connecting a dropped LISTEN connection, doubling per failed attempt
+    EVENT_RECONNECT_BASE_SECONDS: float = 0.5
+    EVENT_RECONNECT_MAX_SECONDS: float = 30
 
     # First Superuser (for initial setup)
     FIRST_SUPERUSER: Optional[str] = None
@@ -0,0 +1,142 @@
+"""
+Notification email templates, compiled once at import time.
+
+A template is split into literal chunks and {{ placeholder }} names when the module
+loads; rendering is a single "".join over the precompiled parts, with values
+HTML-escaped for the html variant. Subjects are header values, so line breaks and
+other control characters in the values inserted there are collapsed into spaces.
+"""
+import html
+import re
+from typing import Any, Dict, List, NamedTuple
+
+_PLACEHOLDER = re.compile(r"{{\s*(\w+)\s*}}")
+_LINE_BREAKS = re.compile(r"[\s\x00-\x1f\x7f]+")
+
+
+class CompiledTemplate:
+    __slots__ = ("literals", "names", "escape", "single_line")
+
+    def __init__(self, source: str, escape: bool = False, single_line: bool = False):
+        parts = _PLACEHOLDER.split(source)
+        self.literals: List[str] = parts[0::2]
+        self.names: List[str] = parts[1::2]
+        self.escape = escape
+        self.single_line = single_line
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """Render with `context`; values listed in context["_raw"] are inserted unescaped."""
+        raw = context.get("_raw", ())
+        out = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            value = str(context[name])
+            if self.single_line:
+                value = _LINE_BREAKS.sub(" ", value).strip()
+            if self.escape and name not in raw:
+                value = html.escape(value)
+            out.append(value)
+            out.append(literal)
+        return "".join(out)
+
+
+class EmailTemplate(NamedTuple):
+    subject: CompiledTemplate
+    text: CompiledTemplate
+    html: CompiledTemplate
+
+    def render(self, **context: Any) -> Dict[str, str]:
+        return {
+            "subject": self.subject.render(context),
+            "text_body": self.text.render(context),
+            "html_body": self.html.render(context),
+        }
+
+
+_LAYOUT = """
+<html>
+<body style="font-family: Arial, sans-serif; color: #333; max-width: 500px; margin: 0 auto;">
+    <div style="background: linear-gradient(135deg, #0d6efd 0%, #0a58ca 100%); padding: 1.5rem; border-radius: 8px 8px 0 0; text-align: center; color: #fff;">
+        <h2 style="margin: 0;">__HEADING__</h2>
+    </div>
+    <div style="padding: 1.5rem; border: 1px solid #ddd; border-top: none; border-radius: 0 0 8px 8px;">
+        __CONTENT__
+        <hr style="border: none; border-top: 1px solid #eee; margin: 1.5rem 0;" />
+        <p style="font-size: 0.85rem; color: #888;">— Boutique Staffing Portal</p>
+    </div>
+</body>
+</html>
+"""
+
+
+def _compile(heading: str, subject: str, text: str, html_content: str) -> EmailTemplate:
+    return EmailTemplate(
+        CompiledTemplate(subject, single_line=True),
+        CompiledTemplate(text),
+        CompiledTemplate(_LAYOUT.replace("__HEADING__", heading).replace("__CONTENT__", html_content), escape=True),
+    )
+
+
+PASSWORD_RESET = EmailTemplate(
+    CompiledTemplate("Boutique Staffing Portal – Password Reset ({{ role }})", single_line=True),
+    CompiledTemplate("Your temporary password is: {{ temp_password }}"),
+    CompiledTemplate("""
+<html>
+<body style="font-family: Arial, sans-serif; color: #333; max-width: 500px; margin: 0 auto;">
+    <div style="background: linear-gradient(135deg, #ffc107 0%, #e0a800 100%); padding: 1.5rem; border-radius: 8px 8px 0 0; text-align: center; color: #fff;">
+        <h2 style="margin: 0;">🔑 Password Reset</h2>
+    </div>
+    <div style="padding: 1.5rem; border: 1px solid #ddd; border-top: none; border-radius: 0 0 8px 8px;">
+        <p>Hello,</p>
+        <p>We received a password reset request for your <strong>{{ role }}</strong> account.</p>
+        <p>Your temporary password is:</p>
+        <div style="text-align: center; margin: 1rem 0;">
+            <span style="display: inline-block; padding: 0.75rem 1.5rem; background: #f8f9fa; border: 2px dashed #28a745; border-radius: 8px; font-family: monospace; font-size: 1.3rem; font-weight: bold; letter-spacing: 2px;">
+                {{ temp_password }}
+            </span>
+        </div>
+        <p>Please log in with this password and change it immediately from your <strong>Profile</strong> page.</p>
+        <hr style="border: none; border-top: 1px solid #eee; margin: 1.5rem 0;" />
+        <p style="font-size: 0.85rem; color: #888;">If you did not request a password reset, please ignore this email or contact support.</p>
+        <p style="font-size: 0.85rem; color: #888;">— Boutique Staffing Portal</p>
+    </div>
+</body>
+</html>
+""", escape=True),
+)
+
+APPLICATION_RECEIVED = _compile(
+    "Application Received",
+    "Application received – {{ job_title }}",
+    "Hello {{ first_name }},\n\nWe received your application for {{ job_title }}. "
+    "You can follow its progress from My Applications.\n\n— Boutique Staffing Portal",
+    """<p>Hello {{ first_name }},</p>
+        <p>We received your application for <strong>{{ job_title }}</strong>.</p>
+        <p>You can follow its progress from <strong>My Applications</strong>.</p>""",
+)
+
+STATUS_CHANGED = _compile(
+    "Application Update",
+    "Update on your application – {{ job_title }}",
+    "Hello {{ first_name }},\n\n{{ message }}\n\n— Boutique Staffing Portal",
+    """<p>Hello {{ first_name }},</p>
+        <p>{{ message }}</p>""",
+)
+
+# Per-status wording for STATUS_CHANGED; other statuses send no email
+STATUS_MESSAGES = {
+    "INTERVIEW": "Good news! The hiring team would like to interview you for {job_title}. They will be in touch with details.",
+    "OFFER": "Congratulations! You have received an offer for {job_title}.",
+    "REJECTED": "Thank you for your interest in {job_title}. The hiring team has decided not to move forward with your application.",
+}
+
+NEW_APPLICANTS_DIGEST = _compile(
+    "New Applicants",
+    "{{ total }} new applicant(s) for your jobs",
+    "Hello {{ first_name }},\n\nYou have {{ total }} new applicant(s):\n\n{{ text_rows }}\n\n— Boutique Staffing Portal",
+    """<p>Hello {{ first_name }},</p>
+        <p>You have <strong>{{ total }}</strong> new applicant(s):</p>
+        <ul>{{ html_rows }}</ul>""",
+)
+
+DIGEST_JOB_ROW = CompiledTemplate("<li><strong>{{ job_title }}</strong>: {{ count }} new ({{ names }})</li>", escape=True)
+DIGEST_JOB_TEXT_ROW = CompiledTemplate("- {{ job_title }}: {{ count }} new ({{ names }})")
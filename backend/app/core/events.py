@@ -0,0 +1,262 @@
+"""
+In-process pub/sub for real-time application updates, streamed to clients as SSE.
+
+Topics are strings such as "job:12" (recruiter view of one job) and "candidate:7"
+(a candidate's own applications). Each subscriber gets a bounded queue; a slow
+subscriber drops its oldest events and is told to resync instead of growing memory.
+
+The broker fans out locally. A backend carries events between workers:
+InProcessBackend (default, single worker) or PostgresNotifyBackend, which relays
+through LISTEN/NOTIFY so every worker sees every event. Listeners are callbacks for
+in-process bookkeeping (cache invalidation) rather than client streams.
+
+If the LISTEN connection drops, PostgresNotifyBackend reconnects with exponential
+backoff and listens again. Events published in between are lost, so afterwards every
+subscriber and listener gets RESYNC_EVENT.
+"""
+import asyncio
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+
+import orjson
+
+from app.core.config import settings
+
+Event = Dict[str, Any]
+Dispatch = Callable[[List[str], Event], None]
+Resync = Callable[[], None]
+Listener = Callable[[Event], None]
+
+RESYNC_EVENT: Event = {"type": "resync"}
+
+
+class Subscription:
+    def __init__(self, broker: "EventBroker", topics: List[str], maxsize: int):
+        self.broker = broker
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.lagged = False
+
+    def deliver(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the oldest event and tell the client its view is incomplete
+            self.queue.get_nowait()
+            self.queue.put_nowait(event)
+            self.lagged = True
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        """Next event, RESYNC_EVENT after an overflow, or None on timeout."""
+        if self.lagged:
+            self.lagged = False
+            return RESYNC_EVENT
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class InProcessBackend:
+    def attach(self, dispatch: Dispatch, resync: Resync) -> None:
+        self._dispatch = dispatch
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, topics: List[str], event: Event) -> None:
+        self._dispatch(topics, event)
+
+
+class PostgresNotifyBackend:
+    """Relays events through Postgres NOTIFY so subscribers on any worker receive them."""
+    channel = "application_events"
+
+    def __init__(self, database_url: str):
+        self.dsn = database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def attach(self, dispatch: Dispatch, resync: Resync) -> None:
+        self._dispatch = dispatch
+        self._resync = resync
+
+    async def _connect(self) -> None:
+        import asyncpg
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(self.channel, self._on_notify)
+        conn.add_termination_listener(self._on_termination)
+        self._conn = conn
+
+    async def start(self) -> None:
+        self._stopping = False
+        await self._connect()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            try:
+                await self._reconnect_task
+            except asyncio.CancelledError:
+                pass
+            self._reconnect_task = None
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    def _on_termination(self, connection: Any) -> None:
+        if self._stopping or connection is not self._conn:
+            return
+        print("[EVENTS ERROR] LISTEN connection lost; reconnecting")
+        self._conn = None
+        if self._reconnect_task is None:
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        attempt = 0
+        try:
+            while True:
+                delay = settings.EVENT_RECONNECT_BASE_SECONDS * 2 ** attempt
+                await asyncio.sleep(min(delay, settings.EVENT_RECONNECT_MAX_SECONDS))
+                try:
+                    await self._connect()
+                except Exception as e:
+                    attempt += 1
+                    print(f"[EVENTS ERROR] Reconnect attempt {attempt} failed: {e}")
+                    continue
+                print("[EVENTS] LISTEN connection restored")
+                self._resync()
+                return
+        finally:
+            self._reconnect_task = None
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        message = orjson.loads(payload)
+        self._dispatch(message["topics"], message["event"])
+
+    async def publish(self, topics: List[str], event: Event) -> None:
+        payload = orjson.dumps({"topics": topics, "event": event}).decode()
+        # One connection serves both LISTEN and NOTIFY; asyncpg allows one query at a time
+        async with self._lock:
+            if self._conn is None:
+                raise ConnectionError("LISTEN connection is down, reconnecting")
+            await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+
+class EventBroker:
+    def __init__(self, backend: Any = None):
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._listeners: Dict[str, List[Listener]] = defaultdict(list)
+        self.backend = backend or InProcessBackend()
+        self.backend.attach(self._dispatch, self.resync)
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    def subscribe(self, *topics: str, maxsize: Optional[int] = None) -> Subscription:
+        subscription = Subscription(self, list(topics), maxsize or settings.EVENT_SUBSCRIBER_BUFFER)
+        for topic in topics:
+            self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def add_listener(self, topic: str, listener: Listener) -> None:
+        """Call `listener` with every event published to `topic`, by any worker."""
+        self._listeners[topic].append(listener)
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._subscribers.get(topic, ()))
+
+    async def publish(self, topics: Iterable[str], event: Event) -> None:
+        """Publish an event; failures are logged, never raised into the request."""
+        try:
+            await self.backend.publish(list(topics), event)
+        except Exception as e:
+            print(f"[EVENTS ERROR] Failed to publish {event.get('type')}: {e}")
+
+    def resync(self) -> None:
+        """Send RESYNC_EVENT to every listener and subscriber, after events may have been lost."""
+        for topic, listeners in list(self._listeners.items()):
+            for listener in listeners:
+                try:
+                    listener(RESYNC_EVENT)
+                except Exception as e:
+                    print(f"[EVENTS ERROR] Listener for {topic} failed: {e}")
+        for subscription in {s for subscribers in self._subscribers.values() for s in subscribers}:
+            subscription.deliver(RESYNC_EVENT)
+
+    def _dispatch(self, topics: List[str], event: Event) -> None:
+        for topic in topics:
+            for listener in self._listeners.get(topic, ()):
+                try:
+                    listener(event)
+                except Exception as e:
+                    print(f"[EVENTS ERROR] Listener for {topic} failed: {e}")
+            for subscription in list(self._subscribers.get(topic, ())):
+                subscription.deliver(event)
+
+
+def create_backend(name: str) -> Any:
+    if name == "postgres":
+        return PostgresNotifyBackend(settings.DATABASE_URL)
+    return InProcessBackend()
+
+
+event_broker = EventBroker(create_backend(settings.EVENT_BACKEND))
+
+
+def job_topic(job_id: int) -> str:
+    return f"job:{job_id}"
+
+
+def candidate_topic(user_id: int) -> str:
+    return f"candidate:{user_id}"
+
+
+async def publish_application_event(event_type: str, application: Any, **fields: Any) -> None:
+    """Publish a small delta about `application` to its job's and its candidate's topics."""
+    event = {
+        "type": event_type,
+        "application_id": application.id,
+        "job_id": application.job_id,
+        "user_id": application.user_id,
+        **fields,
+    }
+    await event_broker.publish([job_topic(application.job_id), candidate_topic(application.user_id)], event)
+
+
+def format_sse(event: Event) -> bytes:
+    return b"event: " + event["type"].encode() + b"\ndata: " + orjson.dumps(event) + b"\n\n"
+
+
+async def sse_stream(request: Any, subscription: Subscription, heartbeat: float) -> AsyncIterator[bytes]:
+    """Yield SSE frames for `subscription` until the client disconnects."""
+    try:
+        yield b"retry: 5000\n\n"
+        while not await request.is_disconnected():
+            event = await subscription.get(timeout=heartbeat)
+            if event is None:
+                yield b": keep-alive\n\n"
+            else:
+                yield format_sse(event)
+    finally:
+        subscription.close()
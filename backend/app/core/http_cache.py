@@ -0,0 +1,99 @@
+"""
+Conditional GET support (weak ETags, If-None-Match, Cache-Control) for read endpoints.
+
+Responses are per-user (Authorization header), so every directive is `private`.
+Candidates browsing the job board get a short max-age; clients and admins, who edit
+jobs, always revalidate so their own changes show up immediately.
+"""
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+
+def content_digest(*parts: Any) -> str:
+    return hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+
+
+def weak_etag(*parts: Any) -> str:
+    return f'W/"{content_digest(*parts)}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of `etag` against the request's If-None-Match header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def cache_control_for(user: User) -> str:
+    if user.role == UserRole.CANDIDATE:
+        return f"private, max-age={settings.HTTP_CACHE_CANDIDATE_MAX_AGE}, must-revalidate"
+    return "private, no-cache"
+
+
+def set_cache_headers(response: Response, etag: str, user: User) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control_for(user)
+    response.headers["Vary"] = "Authorization"
+
+
+def not_modified(etag: str, user: User) -> Response:
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, user)
+    return response
+
+
+class VersionMap:
+    """
+    Process-local map of row id -> current version (or ETag), used to answer
+    conditional requests without touching the database. Writes drop entries, in other
+    workers too when something relays the invalidation to them; entries also expire
+    after `ttl` seconds, which bounds staleness when nothing does.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: int) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, expires_at = entry
+        if expires_at < time.monotonic():
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        return version
+
+    def set(self, key: int, version: Any) -> None:
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl)
+
+    def discard(self, key: int) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Job id -> ETag of its read_job response
+job_versions = VersionMap(ttl=settings.JOB_VERSION_MAP_TTL_SECONDS)
+
+
+def job_etag(job_id: int, version: int, body: str) -> str:
+    """The body covers what the row version doesn't, such as the embedded owner's profile."""
+    return weak_etag("job", job_id, version, content_digest(body))
@@ -0,0 +1,218 @@
+"""
+Location normalization and geohash cells.
+
+Job locations are free text ("NYC", "New York, NY", "Remote - US", "Hybrid - Austin,
+TX") and candidates give a city and a state. Both are resolved against an offline
+gazetteer (gazetteer.csv next to this file, or GAZETTEER_PATH) into a canonical city
+and state with coordinates, so "NYC" and "New York, NY" become the same place and can
+be matched by equality on indexed columns. When no known city is named, only what
+can be recognized is kept: a state, and/or the remote flag. A name that several
+cities share resolves to the first one in the file, which lists the largest first.
+
+Coordinates are also stored as a geohash: the latitude and longitude bits interleaved
+into one integer (the binary form of the usual base32 geohash strings). Nearby points
+share a prefix, so a "within N miles" search becomes a few integer range scans on one
+B-tree index (the cells covering the circle's bounding box), then a distance check on
+the rows those ranges return.
+"""
+import csv
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+STATES: Dict[str, str] = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California",
+    "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware", "FL": "Florida", "GA": "Georgia",
+    "HI": "Hawaii", "ID": "Idaho", "IL": "Illinois", "IN": "Indiana", "IA": "Iowa",
+    "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
+    "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi", "MO": "Missouri",
+    "MT": "Montana", "NE": "Nebraska", "NV": "Nevada", "NH": "New Hampshire", "NJ": "New Jersey",
+    "NM": "New Mexico", "NY": "New York", "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio",
+    "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
+    "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont",
+    "VA": "Virginia", "WA": "Washington", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming",
+    "DC": "District of Columbia", "PR": "Puerto Rico",
+}
+_STATE_CODES: Dict[str, str] = {}
+for _code, _name in STATES.items():
+    _STATE_CODES[_code.lower()] = _code
+    _STATE_CODES[_name.lower()] = _code
+
+_REMOTE = re.compile(r"\b(?:remote|work from home|wfh|telecommute|anywhere)\b", re.IGNORECASE)
+# Words around a place name that don't change the place
+_NOISE = re.compile(
+    r"\b(?:hybrid|on-?site|in-office|office|hq|greater|metro|metropolitan|area|downtown|"
+    r"usa|u\.s\.a\.|us|u\.s\.|united states|based)\b",
+    re.IGNORECASE,
+)
+# " - ", parentheses, slashes and pipes separate alternatives; a hyphen inside a name does not
+_SEGMENTS = re.compile(r"\s+[-–—]\s+|[()/|;]")
+_SPACES = re.compile(r"\s+")
+
+# 52 bits in all: about a metre per cell, and still fits a signed 64-bit column
+GEOHASH_BITS = 26
+MILES_PER_DEGREE = 69.09
+# Most cells (before merging adjacent ones) a radius search is split into
+MAX_COVER_CELLS = 16
+
+
+@dataclass(frozen=True)
+class Place:
+    city: Optional[str] = None
+    state: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    remote: bool = False
+
+    @property
+    def geohash(self) -> Optional[int]:
+        if self.latitude is None or self.longitude is None:
+            return None
+        return geohash(self.latitude, self.longitude)
+
+
+class Gazetteer:
+    def __init__(self, path: Path):
+        self.by_name: Dict[str, Place] = {}
+        self.by_city_state: Dict[Tuple[str, str], Place] = {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                place = Place(row["city"], row["state"].upper(), float(row["latitude"]), float(row["longitude"]))
+                for name in [place.city, *(row.get("aliases") or "").split("|")]:
+                    if name.strip():
+                        # Earlier (larger) cities keep a shared name
+                        self.by_name.setdefault(_key(name), place)
+                        self.by_city_state.setdefault((_key(name), place.state), place)
+
+
+@lru_cache(maxsize=1)
+def gazetteer() -> Gazetteer:
+    return Gazetteer(Path(settings.GAZETTEER_PATH or Path(__file__).with_name("gazetteer.csv")))
+
+
+def _key(text: str) -> str:
+    return _SPACES.sub(" ", text.strip(" ,.").lower())
+
+
+def state_code(text: str) -> Optional[str]:
+    """"tx", "Texas", "D.C." -> the two-letter code."""
+    return _STATE_CODES.get(_key(text).replace(".", "")) or _STATE_CODES.get(_key(text))
+
+
+def _split_state(text: str) -> Tuple[str, Optional[str]]:
+    """"austin, texas" / "austin tx" / "new york ny" -> (city part, state code)."""
+    if "," in text:
+        city, _, state = text.rpartition(",")
+        code = state_code(state)
+        return (city.strip(" ,"), code) if code else (text, None)
+    words = text.split()
+    for n in (2, 1):
+        if len(words) >= n:
+            code = state_code(" ".join(words[-n:]))
+            if code:
+                return " ".join(words[:-n]), code
+    return text, None
+
+
+def _resolve(segment: str) -> Optional[Place]:
+    places = gazetteer()
+    stripped = _SPACES.sub(" ", _NOISE.sub(" ", segment)).strip(" ,.")
+    for text in dict.fromkeys((_key(segment), _key(stripped))):
+        if not text:
+            continue
+        place = places.by_name.get(text)
+        if place:
+            return place
+        city, code = _split_state(text)
+        # A bare "in", "or", "me" is a word, not a state, unless written in capitals
+        if code and not city and len(text) == 2 and code not in segment:
+            continue
+        if code:
+            city = _key(city)
+            return places.by_city_state.get((city, code)) or Place(state=code)
+    return None
+
+
+@lru_cache(maxsize=4096)
+def normalize_location(text: Optional[str]) -> Optional[Place]:
+    """Canonical place for free-text location, or None when nothing in it is recognized."""
+    if not text or not text.strip():
+        return None
+    remote = bool(_REMOTE.search(text))
+    for segment in _SEGMENTS.split(_REMOTE.sub(" ", text)):
+        place = _resolve(segment)
+        if place:
+            return Place(place.city, place.state, place.latitude, place.longitude, remote)
+    return Place(remote=True) if remote else None
+
+
+def _spread(value: int) -> int:
+    """Insert a zero bit above each bit of `value`."""
+    result = 0
+    for bit in range(GEOHASH_BITS):
+        result |= ((value >> bit) & 1) << (2 * bit)
+    return result
+
+
+def _cell(value: float, low: float, high: float, bits: int) -> int:
+    cells = 1 << bits
+    return min(cells - 1, max(0, int((value - low) / (high - low) * cells)))
+
+
+def geohash(latitude: float, longitude: float) -> int:
+    """Interleaved bits, longitude first, like base32 geohash strings."""
+    x = _cell(longitude, -180, 180, GEOHASH_BITS)
+    y = _cell(latitude, -90, 90, GEOHASH_BITS)
+    return (_spread(x) << 1) | _spread(y)
+
+
+def bounding_box(latitude: float, longitude: float, miles: float) -> Tuple[float, float, float, float]:
+    """(min latitude, max latitude, min longitude, max longitude) around a circle."""
+    dlat = miles / MILES_PER_DEGREE
+    dlon = miles / (MILES_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return (
+        max(-90.0, latitude - dlat), min(90.0, latitude + dlat),
+        max(-180.0, longitude - dlon), min(180.0, longitude + dlon),
+    )
+
+
+def geohash_ranges(latitude: float, longitude: float, miles: float) -> List[Tuple[int, int]]:
+    """
+    Half-open [low, high) geohash ranges that together cover the circle's bounding box:
+    the smallest cells for which the box spans at most MAX_COVER_CELLS, with adjacent
+    cells merged.
+    """
+    lat_min, lat_max, lon_min, lon_max = bounding_box(latitude, longitude, miles)
+    bits = 1
+    for candidate in range(GEOHASH_BITS, 0, -1):
+        xs = _cell(lon_max, -180, 180, candidate) - _cell(lon_min, -180, 180, candidate) + 1
+        ys = _cell(lat_max, -90, 90, candidate) - _cell(lat_min, -90, 90, candidate) + 1
+        if xs * ys <= MAX_COVER_CELLS:
+            bits = candidate
+            break
+    shift = 2 * (GEOHASH_BITS - bits)
+    cells = sorted(
+        (_spread(x) << 1) | _spread(y)
+        for x in range(_cell(lon_min, -180, 180, bits), _cell(lon_max, -180, 180, bits) + 1)
+        for y in range(_cell(lat_min, -90, 90, bits), _cell(lat_max, -90, 90, bits) + 1)
+    )
+    ranges: List[Tuple[int, int]] = []
+    for cell in cells:
+        low, high = cell << shift, (cell + 1) << shift
+        if ranges and ranges[-1][1] == low:
+            ranges[-1] = (ranges[-1][0], high)
+        else:
+            ranges.append((low, high))
+    return ranges
+
+
+def distance_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle (haversine) distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * 3958.8 * math.asin(math.sqrt(a))
@@ -0,0 +1,306 @@
+"""
+In-process metrics rendered in the Prometheus text format at GET /metrics.
+
+Counters, gauges and histograms keep plain per-label-tuple values that are updated
+from the event loop thread without locks (an increment is a dict lookup and an add;
+a histogram observation adds a bisect), so instrumenting a request costs
+microseconds. Values that are cheaper to read than to maintain (DB pool state,
+email queue depth, per-route SQL totals from app/core/query_stats.py) are collected
+when /metrics is scraped.
+"""
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import query_stats
+from app.core.query_stats import route_template
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+SIZE_BUCKETS = (10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self.values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels: str, value: float) -> None:
+        self.values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (non-cumulative, last is +Inf), sum]
+        self.values: Dict[Labels, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def count(self, *labels: str) -> int:
+        entry = self.values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        """`collector` builds metrics on each scrape."""
+        self.collectors.append(collector)
+
+    def render(self, extra: Iterable[_Metric] = ()) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        for metric in extra:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# HTTP
+http_requests = registry.counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time to the end of the response body", ("method", "route")
+)
+# Routing happens inside the app, so requests in flight are only known per method
+http_in_flight = registry.gauge("http_requests_in_flight", "Requests being handled", ("method",))
+
+# AI screening
+llm_requests = registry.counter("llm_requests_total", "LLM calls by provider and outcome", ("provider", "outcome"))
+llm_duration = registry.histogram(
+    "llm_request_duration_seconds", "LLM call latency", ("provider", "outcome"), buckets=LLM_BUCKETS
+)
+llm_tokens = registry.counter("llm_tokens_total", "Tokens used by provider and kind (prompt/completion)", ("provider", "kind"))
+llm_cost = registry.counter("llm_cost_usd_total", "Estimated LLM spend from the configured per-token prices", ("provider",))
+llm_fallbacks = registry.counter("llm_fallbacks_total", "Falls back from OpenAI to Gemini", ("reason",))
+text_extraction_duration = registry.histogram(
+    "resume_text_extraction_seconds", "Resume text extraction time", ("format", "outcome"),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+screening_reuse = registry.counter(
+    "screening_reuse_total", "Near-duplicate resume lookups before screening", ("outcome",)
+)
+requirement_verdicts = registry.counter(
+    "requirement_verdicts_total", "Per-requirement screening verdicts by source", ("source",)
+)
+job_facet_cache = registry.counter("job_facet_cache_total", "Facet count lookups for unfiltered job lists", ("result",))
+query_cache = registry.counter("query_cache_total", "Query result cache lookups", ("cache", "result"))
+upload_bytes = registry.counter("resume_upload_bytes_total", "Bytes of uploaded resumes")
+upload_size = registry.histogram("resume_upload_size_bytes", "Size of uploaded resumes", buckets=SIZE_BUCKETS)
+
+
+def record_llm_call(
+    provider: str,
+    outcome: str,
+    seconds: float,
+    prompt_tokens: Optional[int] = None,
+    completion_tokens: Optional[int] = None,
+    price_per_million: Tuple[float, float] = (0.0, 0.0),
+) -> None:
+    llm_requests.inc(provider, outcome)
+    llm_duration.observe(seconds, provider, outcome)
+    if prompt_tokens:
+        llm_tokens.inc(provider, "prompt", amount=prompt_tokens)
+    if completion_tokens:
+        llm_tokens.inc(provider, "completion", amount=completion_tokens)
+    cost = ((prompt_tokens or 0) * price_per_million[0] + (completion_tokens or 0) * price_per_million[1]) / 1_000_000
+    if cost:
+        llm_cost.inc(provider, amount=cost)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_in_flight.dec(method)
+            route = route_template(scope)
+            http_requests.inc(method, route, str(status_code))
+            http_request_duration.observe(time.perf_counter() - started, method, route)
+
+
+def pool_metrics(engine) -> List[_Metric]:
+    """Connection pool utilisation of an (async) engine; pools without a size report nothing."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return []
+    gauges = [
+        ("db_pool_size", "Configured pool size", pool.size()),
+        ("db_pool_checked_out", "Connections in use", pool.checkedout()),
+        ("db_pool_checked_in", "Idle connections in the pool", pool.checkedin()),
+        ("db_pool_overflow", "Connections above pool_size (negative: unopened pool slots)", pool.overflow()),
+    ]
+    metrics = []
+    for name, help, value in gauges:
+        gauge = Gauge(name, help)
+        gauge.set(value=value)
+        metrics.append(gauge)
+    return metrics
+
+
+def query_metrics() -> List[_Metric]:
+    """Per-route SQL totals collected by QueryStatsMiddleware."""
+    labelnames = ("method", "route")
+    queries = Counter("db_queries_total", "SQL statements executed", labelnames)
+    seconds = Counter("db_query_seconds_total", "Time spent executing SQL", labelnames)
+    rows = Counter("db_rows_total", "Rows fetched or affected", labelnames)
+    n_plus_one = Counter("db_n_plus_one_requests_total", "Requests with repeated identical statements", labelnames)
+    for (method, path), totals in query_stats.route_totals.items():
+        queries.inc(method, path, amount=totals.queries)
+        seconds.inc(method, path, amount=totals.db_seconds)
+        rows.inc(method, path, amount=totals.rows)
+        n_plus_one.inc(method, path, amount=totals.n_plus_one)
+    return [queries, seconds, rows, n_plus_one]
+
+
+_queue_cache: Tuple[float, List[_Metric]] = (0.0, [])
+
+
+async def queue_metrics(db) -> List[_Metric]:
+    """Unsent email outbox rows by status and notifications waiting for their digest.
+
+    SENT rows are kept as a record and grow without bound, so they are not counted;
+    PENDING/DEAD are read through the (status, next_attempt_at) index. The result is
+    reused for METRICS_QUEUE_CACHE_SECONDS so frequent scrapes cost no queries.
+    """
+    global _queue_cache
+    from sqlalchemy import func, select
+
+    from app.core.config import settings
+    from app.models.email_outbox import EmailOutbox, EmailStatus
+    from app.models.pending_notification import PendingNotification
+
+    expires, cached = _queue_cache
+    if time.monotonic() < expires:
+        return cached
+    unsent = [status for status in EmailStatus if status != EmailStatus.SENT]
+    outbox = Gauge("email_outbox_messages", "Unsent email outbox rows by status", ("status",))
+    for status in unsent:
+        outbox.set(status.value, value=0)
+    result = await db.execute(
+        select(EmailOutbox.status, func.count())
+        .where(EmailOutbox.status.in_(unsent))
+        .group_by(EmailOutbox.status)
+    )
+    for status, count in result.all():
+        outbox.set(status.value, value=count)
+    pending = Gauge("notification_digest_pending", "New-applicant notifications waiting for a digest")
+    pending.set(value=(await db.execute(select(func.count()).select_from(PendingNotification))).scalar_one())
+    _queue_cache = (time.monotonic() + settings.METRICS_QUEUE_CACHE_SECONDS, [outbox, pending])
+    return [outbox, pending]
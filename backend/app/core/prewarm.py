@@ -0,0 +1,67 @@
+"""
+Background pre-warming of modules that are imported on first use.
+
+Provider SDKs and document parsers (openai, google.generativeai, pypdf, docx, aiosmtplib)
+are kept out of the `app.main` import graph so a cold worker opens its port quickly.
+Once it is serving, this imports them in a worker thread, so the first apply request
+does not pay for them either. Importing holds the import lock but releases the GIL
+for file I/O, so requests keep being served while it runs.
+"""
+import asyncio
+import importlib
+import sys
+import time
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.email import smtp_configured
+
+_task: Optional[asyncio.Task] = None
+
+
+def prewarm_modules() -> List[str]:
+    modules = ["app.services.ai_screening", "openai", "pypdf", "docx"]
+    if settings.GEMINI_API_KEY:
+        modules.append("google.generativeai")
+    if smtp_configured():
+        modules.append("aiosmtplib")
+    return modules
+
+
+def _import(name: str) -> None:
+    started = time.perf_counter()
+    try:
+        importlib.import_module(name)
+    except Exception as e:
+        # Loaded on first use instead; that path reports the error
+        print(f"[PREWARM] Could not import {name}: {e}")
+        return
+    print(f"[PREWARM] {name} imported in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+async def prewarm(modules: List[str], delay: float = 0) -> None:
+    modules = [name for name in modules if name not in sys.modules]
+    if not modules:
+        return
+    if delay:
+        await asyncio.sleep(delay)
+    for name in modules:
+        await asyncio.to_thread(_import, name)
+
+
+def start() -> None:
+    global _task
+    if _task is None and settings.PREWARM_IMPORTS:
+        _task = asyncio.create_task(prewarm(prewarm_modules(), settings.PREWARM_DELAY_SECONDS))
+
+
+async def stop() -> None:
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
@@ -0,0 +1,140 @@
+"""
+On-demand CPU and memory profiling of a live worker (admin endpoints in admin.py).
+
+Nothing runs until a profile is requested: the CPU sampler is a thread that only
+exists for the requested duration, and tracemalloc is started for a memory capture
+and stopped again afterwards (unless it was already tracing).
+
+CPU profiles are statistical: every `interval` seconds the sampler reads the stack of
+every other thread via sys._current_frames() and counts identical stacks. The result
+is in the collapsed format ("frame;frame;frame count" per line) that flamegraph.pl,
+speedscope and inferno read. The event loop thread shows the coroutine that is
+running at the time of each sample, so CPU-bound handlers (bcrypt, pypdf,
+serialization) stand out; an idle loop shows up as its selector wait.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+_PATH_PREFIXES = sorted({os.path.abspath(p) + os.sep for p in sys.path if p and os.path.isdir(p)}, key=len, reverse=True)
+
+
+def _short_path(filename: str) -> str:
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def _frame_label(code: Any) -> str:
+    # ";" separates frames in the collapsed format
+    return f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    def __init__(self, duration: float, interval: float = 0.01, max_depth: int = 128):
+        self.duration = duration
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._labels: Dict[Any, str] = {}
+
+    def _label(self, code: Any) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _frame_label(code)
+        return label
+
+    def _sample(self, own_ident: int, thread_names: Dict[int, str]) -> None:
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack: List[str] = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.append(thread_names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def run(self) -> "SamplingProfiler":
+        """Sample until `duration` has passed. Blocks the calling thread."""
+        own_ident = threading.get_ident()
+        deadline = time.perf_counter() + self.duration
+        next_sample = time.perf_counter()
+        while next_sample < deadline:
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            self._sample(own_ident, thread_names)
+            next_sample += self.interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (e.g. GIL contention); skip the missed ticks rather than bursting
+                next_sample = time.perf_counter()
+        return self
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def memory_diff(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, group_by: str = "lineno", limit: int = 50
+) -> List[Dict[str, Any]]:
+    """Largest allocation growth between two snapshots."""
+    ignore = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+    before, after = before.filter_traces(ignore), after.filter_traces(ignore)
+    entries = []
+    for stat in after.compare_to(before, group_by)[:limit]:
+        entries.append({
+            "location": [f"{_short_path(frame.filename)}:{frame.lineno}" for frame in stat.traceback],
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+            "size": stat.size,
+            "count": stat.count,
+        })
+    return entries
+
+
+class MemoryCapture:
+    """Snapshot now, snapshot again later; tracemalloc runs only in between."""
+
+    def __init__(self, frames: int = 10):
+        self.frames = frames
+        self.started_tracing = False
+        self.before: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+        self.before = tracemalloc.take_snapshot()
+
+    def finish(self, group_by: str = "lineno", limit: int = 50) -> Dict[str, Any]:
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self.started_tracing:
+            tracemalloc.stop()
+        return {
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "top": memory_diff(self.before, after, group_by, limit),
+        }
+
+
+def parse_collapsed(text: str) -> List[Tuple[List[str], int]]:
+    """Inverse of SamplingProfiler.collapsed(), for tooling and tests."""
+    parsed = []
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(" ")
+        parsed.append((stack.split(";"), int(count)))
+    return parsed
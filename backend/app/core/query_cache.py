@@ -0,0 +1,303 @@
+"""
+Two-tier cache for query results, with request coalescing, early refresh and
+tag-based invalidation.
+
+Tier one is a bounded LRU in each worker. Tier two is an optional shared backend
+(MemoryBackend, or RedisBackend for several workers or hosts) that every worker
+reads, so a result one worker computed serves the others. Values must be JSON
+serializable to go through the shared tier.
+
+Every entry has tags. Invalidating a tag bumps its generation in the shared backend
+(entries are stored with the generations they were computed under, and ignored once
+one has moved), drops matching entries from this worker's LRU, and is relayed
+through the event broker so the other workers drop theirs. With EVENT_BACKEND
+"memory" that relay stays in-process; then the local TTL bounds how long another
+worker can serve an entry after a write.
+
+Concurrent misses for one key share a single load. A hit close to expiry is
+refreshed early with a probability that grows as expiry nears: the request refreshes
+when now - delta * beta * ln(rand) >= expiry, delta being how long the load took.
+So one request recomputes a popular entry shortly before it expires, while the rest
+keep getting the cached value, instead of every request missing at once after it.
+"""
+import asyncio
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+
+from app.core import metrics
+
+Loader = Callable[[], Awaitable[Any]]
+
+# Generations must outlive every value stored under them
+GENERATION_TTL_FACTOR = 10
+# Tags per relayed invalidation event
+INVALIDATION_BATCH = 200
+
+
+@dataclass
+class Entry:
+    value: Any
+    tags: Tuple[str, ...]
+    # Seconds the load took, and when the value expires (time.time())
+    delta: float
+    expires_at: float
+    # When this worker's copy must be checked against the shared tier again
+    local_until: float
+
+    def should_refresh(self, now: float, beta: float) -> bool:
+        return now - self.delta * beta * math.log(1.0 - random.random()) >= self.expires_at
+
+
+class LoadAborted(Exception):
+    """The request loading a value was cancelled; requests waiting on it load again."""
+
+
+class _Load:
+    def __init__(self, tags: Sequence[str]):
+        self.tags = set(tags)
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Set when a tag is invalidated while the load runs; its value is not stored
+        self.stale = False
+
+
+class MemoryBackend:
+    """Shared tier inside this process: a single worker, or tests."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._values: Dict[str, Tuple[bytes, float]] = {}
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        now = time.time()
+        values = []
+        for key in keys:
+            stored = self._values.get(key)
+            values.append(stored[0] if stored is not None and stored[1] > now else None)
+        return values
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._values.pop(key, None)
+        self._values[key] = (value, time.time() + ttl)
+        if len(self._values) > self.max_entries:
+            now = time.time()
+            for stale in [k for k, (_, expires_at) in self._values.items() if expires_at <= now]:
+                del self._values[stale]
+            while len(self._values) > self.max_entries:
+                del self._values[next(iter(self._values))]
+
+    async def incr(self, key: str, ttl: float) -> int:
+        stored = (await self.get_many([key]))[0]
+        value = int(stored or 0) + 1
+        await self.set(key, str(value).encode(), ttl)
+        return value
+
+    async def close(self) -> None:
+        self._values.clear()
+
+
+class RedisBackend:
+    """Shared tier in Redis. Needs the optional `redis` package."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._client = redis.from_url(url)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return await self._client.mget(list(keys))
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(key, value, px=max(1, int(ttl * 1000)))
+
+    async def incr(self, key: str, ttl: float) -> int:
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, max(1, int(ttl)))
+            value, _ = await pipe.execute()
+        return value
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_shared_backend(name: str, redis_url: str) -> Any:
+    if name == "redis":
+        return RedisBackend(redis_url)
+    if name == "memory":
+        return MemoryBackend()
+    return None
+
+
+class QueryCache:
+    def __init__(
+        self,
+        name: str,
+        *,
+        size: int,
+        ttl: float,
+        local_ttl: float,
+        beta: float = 1.0,
+        shared: Any = None,
+        broker: Any = None,
+        enabled: bool = True,
+    ):
+        self.name = name
+        self.size = size
+        self.ttl = ttl
+        self.local_ttl = min(local_ttl, ttl)
+        self.beta = beta
+        self.shared = shared
+        self.broker = broker
+        self.enabled = enabled
+        self.topic = f"cache:{name}"
+        # Invalidations this worker published come back through the broker; skip those
+        self.origin = uuid.uuid4().hex
+        self._local: "OrderedDict[str, Entry]" = OrderedDict()
+        self._loads: Dict[str, _Load] = {}
+        if broker is not None:
+            broker.add_listener(self.topic, self._on_invalidation)
+
+    async def get_or_load(self, key: str, tags: Sequence[str], load: Loader) -> Any:
+        """The value cached under `key`, or the result of `load()`, stored with `tags`."""
+        if not self.enabled:
+            return await load()
+        now = time.time()
+        entry = self._local.get(key)
+        result = "hit"
+        if entry is not None and entry.local_until <= now:
+            del self._local[key]
+            entry = None
+        if entry is None and self.shared is not None:
+            entry = await self._shared_get(key, tags, now)
+            result = "shared_hit"
+        if entry is not None:
+            if key in self._loads or not entry.should_refresh(now, self.beta):
+                metrics.query_cache.inc(self.name, result)
+                return entry.value
+            metrics.query_cache.inc(self.name, "early_refresh")
+        while key in self._loads:
+            metrics.query_cache.inc(self.name, "coalesced")
+            try:
+                return await asyncio.shield(self._loads[key].future)
+            except LoadAborted:
+                continue
+        if entry is None:
+            metrics.query_cache.inc(self.name, "miss")
+        return await self._load(key, tuple(tags), load)
+
+    async def _load(self, key: str, tags: Tuple[str, ...], load: Loader) -> Any:
+        pending = self._loads[key] = _Load(tags)
+        try:
+            generations = await self._generations(tags)
+            started = time.perf_counter()
+            value = await load()
+            delta = time.perf_counter() - started
+        except BaseException as e:
+            pending.future.set_exception(e if isinstance(e, Exception) else LoadAborted())
+            # Mark it retrieved: waiters re-raise it, but there may be none
+            pending.future.exception()
+            raise
+        finally:
+            if self._loads.get(key) is pending:
+                del self._loads[key]
+        pending.future.set_result(value)
+        if not pending.stale:
+            now = time.time()
+            self._store_local(key, Entry(value, tags, delta, now + self.ttl, now + self.local_ttl))
+            if generations is not None:
+                await self._shared_set(key, value, generations, delta, now + self.ttl)
+        return value
+
+    def _store_local(self, key: str, entry: Entry) -> None:
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        while len(self._local) > self.size:
+            self._local.popitem(last=False)
+
+    def _value_key(self, key: str) -> str:
+        return f"{self.name}:value:{key}"
+
+    def _generation_key(self, tag: str) -> str:
+        return f"{self.name}:generation:{tag}"
+
+    async def _generations(self, tags: Sequence[str]) -> Optional[List[int]]:
+        if self.shared is None:
+            return None
+        try:
+            stored = await self.shared.get_many([self._generation_key(tag) for tag in tags])
+        except Exception as e:
+            print(f"[CACHE ERROR] {self.name}: reading generations failed: {e}")
+            return None
+        return [int(value or 0) for value in stored]
+
+    async def _shared_get(self, key: str, tags: Sequence[str], now: float) -> Optional[Entry]:
+        try:
+            stored = await self.shared.get_many([self._value_key(key), *(self._generation_key(tag) for tag in tags)])
+        except Exception as e:
+            print(f"[CACHE ERROR] {self.name}: shared read failed: {e}")
+            return None
+        if stored[0] is None:
+            return None
+        record = orjson.loads(stored[0])
+        if record["generations"] != [int(value or 0) for value in stored[1:]]:
+            return None
+        entry = Entry(record["value"], tuple(tags), record["delta"], record["expires_at"], min(record["expires_at"], now + self.local_ttl))
+        self._store_local(key, entry)
+        return entry
+
+    async def _shared_set(self, key: str, value: Any, generations: List[int], delta: float, expires_at: float) -> None:
+        record = {"value": value, "generations": generations, "delta": delta, "expires_at": expires_at}
+        try:
+            await self.shared.set(self._value_key(key), orjson.dumps(record), self.ttl)
+        except Exception as e:
+            print(f"[CACHE ERROR] {self.name}: shared write failed: {e}")
+
+    def drop_local(self, tags: Iterable[str]) -> None:
+        """Forget this worker's entries and running loads that have any of `tags`."""
+        tags = set(tags)
+        for key in [key for key, entry in self._local.items() if tags.intersection(entry.tags)]:
+            del self._local[key]
+        for key, pending in list(self._loads.items()):
+            if tags & pending.tags:
+                # Requests from now on load again rather than join a read that may predate the write
+                pending.stale = True
+                del self._loads[key]
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop entries with any of `tags` in every worker. Call after the write commits."""
+        tags = list(dict.fromkeys(tags))
+        if not self.enabled or not tags:
+            return
+        self.drop_local(tags)
+        if self.shared is not None:
+            try:
+                for tag in tags:
+                    await self.shared.incr(self._generation_key(tag), self.ttl * GENERATION_TTL_FACTOR)
+            except Exception as e:
+                print(f"[CACHE ERROR] {self.name}: invalidating {tags} failed: {e}")
+        if self.broker is not None:
+            # Postgres NOTIFY payloads are limited to 8000 bytes
+            for start in range(0, len(tags), INVALIDATION_BATCH):
+                event = {"type": "cache.invalidate", "origin": self.origin, "tags": tags[start:start + INVALIDATION_BATCH]}
+                await self.broker.publish([self.topic], event)
+
+    def _on_invalidation(self, event: Dict[str, Any]) -> None:
+        if event.get("type") == "resync":
+            # Invalidations may have been missed
+            self.clear()
+        elif event.get("origin") != self.origin:
+            self.drop_local(event.get("tags", ()))
+
+    def clear(self) -> None:
+        """Forget this worker's entries (the shared tier is left alone)."""
+        self._local.clear()
+
+    async def close(self) -> None:
+        if self.shared is not None:
+            await self.shared.close()
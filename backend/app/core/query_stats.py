@@ -0,0 +1,181 @@
+"""
+Per-request SQL instrumentation: statement count, DB time and rows fetched.
+
+Engine events (registered on every Engine) feed whichever collectors are active in
+the current context: QueryStatsMiddleware opens one per HTTP request, and
+track_queries() opens one around arbitrary code (tests use it to cap query counts).
+Collectors nest, so a test's collector also sees the queries of the requests it makes.
+
+Per request the middleware
+    - adds Server-Timing and X-DB-* headers when QUERY_STATS_HEADERS is on (dev)
+    - adds the request to per-route totals (route_totals) for metrics
+    - logs statements repeated QUERY_STATS_N_PLUS_ONE_THRESHOLD or more times as
+      N+1 candidates (same SQL text, i.e. the same query with different parameters)
+
+Rows are counted for buffered results (everything except stream()/yield_per results)
+and for DML row counts.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_START_KEY = "query_stats_start"
+
+
+class QueryStats:
+    __slots__ = ("count", "db_seconds", "rows", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.statements: Dict[str, int] = {}
+
+    def record(self, statement: str, seconds: float, rows: int) -> None:
+        self.count += 1
+        self.db_seconds += seconds
+        self.rows += rows
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times, most repeated first."""
+        return sorted(
+            ((statement, n) for statement, n in self.statements.items() if n >= threshold),
+            key=lambda item: -item[1],
+        )
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_seconds * 1000:.1f};desc="{self.count} queries, {self.rows} rows"'
+
+
+_collectors: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats_collectors", default=())
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _collectors.get():
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _collectors.get()
+    starts = conn.info.get(_START_KEY)
+    if not collectors or not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if cursor.description is not None:
+        # The async adapters buffer non-streamed results on the cursor
+        rows = len(getattr(cursor, "_rows", ()))
+    else:
+        rows = max(cursor.rowcount, 0)
+    for stats in collectors:
+        stats.record(statement, elapsed, rows)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    starts = connection.info.get(_START_KEY) if connection is not None else None
+    if starts:
+        starts.pop()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements executed in this context (including nested requests)."""
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+class RouteTotals:
+    __slots__ = ("requests", "queries", "db_seconds", "rows", "n_plus_one")
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.n_plus_one = 0
+
+
+# (method, route path template) -> totals since startup
+route_totals: Dict[Tuple[str, str], RouteTotals] = {}
+
+
+def route_template(scope: Scope) -> str:
+    # Routes of included routers keep their prefix-less path; FastAPI's effective
+    # route context carries the full template
+    route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+    return getattr(route, "path_format", None) or "<unmatched>"
+
+
+def record_request(method: str, path: str, stats: QueryStats, threshold: int) -> None:
+    totals = route_totals.get((method, path))
+    if totals is None:
+        totals = route_totals[(method, path)] = RouteTotals()
+    totals.requests += 1
+    totals.queries += stats.count
+    totals.db_seconds += stats.db_seconds
+    totals.rows += stats.rows
+    repeated = stats.repeated(threshold)
+    if repeated:
+        totals.n_plus_one += 1
+        for statement, n in repeated:
+            print(f"[N+1] {method} {path}: {n}x {' '.join(statement.split())[:200]}")
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp, headers: bool = False, n_plus_one_threshold: int = 5):
+        self.app = app
+        self.headers = headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats: Optional[QueryStats] = None
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+                headers["X-DB-Queries"] = str(stats.count)
+                headers["X-DB-Rows"] = str(stats.rows)
+                repeated = stats.repeated(self.n_plus_one_threshold)
+                if repeated:
+                    headers["X-DB-N-Plus-One"] = str(len(repeated))
+            await send(message)
+
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_with_headers if self.headers else send)
+            finally:
+                record_request(scope["method"], route_template(scope), stats, self.n_plus_one_threshold)
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Per-route totals keyed "METHOD /path", for metrics exporters and debugging."""
+    return {
+        f"{method} {path}": {
+            "requests": totals.requests,
+            "queries": totals.queries,
+            "db_seconds": round(totals.db_seconds, 6),
+            "rows": totals.rows,
+            "n_plus_one": totals.n_plus_one,
+        }
+        for (method, path), totals in sorted(route_totals.items())
+    }
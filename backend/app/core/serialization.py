@@ -0,0 +1,121 @@
+"""
+Fast read-path serialization.
+
+List endpoints select plain column tuples, assemble them into nested dicts with a
+RowLayout, and validate + dump them through a TypeAdapter that is built once per
+schema. This skips per-attribute ORM access, FastAPI's per-request response_model
+validation and stdlib json.
+"""
+from copy import copy
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, EmailStr, TypeAdapter, create_model
+from sqlalchemy import inspect as sa_inspect
+from starlette.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class: orjson instead of stdlib json for dict payloads."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _read_annotation(annotation: Any) -> Any:
+    if annotation is EmailStr:
+        return str
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return read_model(annotation)
+    if get_origin(annotation) is Union:
+        return Union[tuple(_read_annotation(arg) for arg in get_args(annotation))]
+    if get_origin(annotation) is list:
+        return List[_read_annotation(get_args(annotation)[0])]
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def read_model(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Mirror of `schema` for data read back from our own database. Stored values were
+    validated on write, so EmailStr (which runs email_validator per value and dominates
+    list validation cost) is relaxed to str. Output JSON is identical: every field keeps
+    its FieldInfo (defaults, default_factory, aliases), only the annotation changes.
+    """
+    fields = {}
+    for name, field in schema.model_fields.items():
+        annotation = _read_annotation(field.annotation)
+        info = copy(field)
+        info.annotation = annotation
+        fields[name] = (annotation, info)
+    return create_model(f"{schema.__name__}Read", **fields)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter for List[read_model(schema)], compiled once and reused for every request."""
+    return TypeAdapter(List[read_model(schema)])
+
+
+def serialize_list(schema: Type[BaseModel], items: List[Dict[str, Any]]) -> Response:
+    """Validate plain dicts against `schema` and return them as a JSON response."""
+    adapter = list_adapter(schema)
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(items)),
+        media_type="application/json",
+    )
+
+
+@lru_cache(maxsize=None)
+def model_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter for read_model(schema), for responses that wrap a list in an object."""
+    return TypeAdapter(read_model(schema))
+
+
+def serialize_model(schema: Type[BaseModel], item: Dict[str, Any]) -> Response:
+    """Validate a plain dict against `schema` and return it as a JSON response."""
+    adapter = model_adapter(schema)
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(item)),
+        media_type="application/json",
+    )
+
+
+class RowLayout:
+    """
+    Describes how a flat column select maps onto a (possibly nested) response schema.
+
+    Only columns the schema exposes are selected. Relations are given as keyword
+    arguments, e.g. RowLayout(Job, JobResponse, owner=RowLayout(owner_alias, User)).
+    A relation whose primary key comes back NULL (outer join miss) becomes None.
+    """
+
+    def __init__(self, entity: Any, schema: Type[BaseModel], **relations: "RowLayout"):
+        mapper_columns = sa_inspect(entity).mapper.columns
+        self.keys: List[str] = []
+        own_columns = []
+        for name, field in schema.model_fields.items():
+            key = field.validation_alias if isinstance(field.validation_alias, str) else name
+            if key in mapper_columns:
+                self.keys.append(key)
+                own_columns.append(getattr(entity, key))
+        self.relations: List[Tuple[str, "RowLayout"]] = list(relations.items())
+        self.columns = own_columns + [c for _, layout in self.relations for c in layout.columns]
+
+    def _build(self, row: Sequence[Any], start: int) -> Tuple[Optional[Dict[str, Any]], int]:
+        end = start + len(self.keys)
+        item = dict(zip(self.keys, row[start:end]))
+        for name, layout in self.relations:
+            item[name], end = layout._build(row, end)
+        if "id" in item and item["id"] is None:
+            return None, end
+        return item, end
+
+    def build(self, row: Sequence[Any]) -> Optional[Dict[str, Any]]:
+        return self._build(row, 0)[0]
+
+    def build_all(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        return [self._build(row, 0)[0] for row in rows]
@@ -0,0 +1,171 @@
+"""
+Skill normalization dictionary.
+
+Resumes and LLM output spell the same skill many ways ("k8s", "Kubernetes",
+"Postgres", "PostgreSQL 14"). Skills are stored under one canonical lowercase name so
+that candidate search is an equality match on an indexed column. Unknown skills are
+kept, lowercased and whitespace-collapsed, so the table still grows with the market;
+add an alias here when two spellings of a popular skill show up separately.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+# canonical name -> other spellings
+SKILLS: Dict[str, List[str]] = {
+    "python": ["python3", "py"],
+    "java": ["java se", "java ee", "j2ee"],
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": ["ts"],
+    "go": ["golang"],
+    "rust": [],
+    "c": [],
+    "c++": ["cpp", "cplusplus"],
+    "c#": ["csharp", "c sharp"],
+    ".net": ["dotnet", ".net core", "asp.net", "asp.net core"],
+    "ruby": [],
+    "ruby on rails": ["rails", "ror"],
+    "php": [],
+    "kotlin": [],
+    "swift": [],
+    "scala": [],
+    "r": [],
+    "sql": [],
+    "bash": ["shell scripting", "shell"],
+    "node.js": ["node", "nodejs", "node js"],
+    "react": ["react.js", "reactjs", "react js"],
+    "angular": ["angular.js", "angularjs"],
+    "vue": ["vue.js", "vuejs"],
+    "next.js": ["nextjs"],
+    "django": [],
+    "flask": [],
+    "fastapi": [],
+    "spring": ["spring boot", "springboot"],
+    "graphql": [],
+    "rest apis": ["rest", "restful", "rest api", "restful apis"],
+    "postgresql": ["postgres", "psql", "pgsql"],
+    "mysql": ["mariadb"],
+    "sql server": ["mssql", "ms sql", "microsoft sql server"],
+    "oracle": ["oracle db", "oracle database"],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "elasticsearch": ["elastic search", "opensearch"],
+    "kafka": ["apache kafka"],
+    "rabbitmq": [],
+    "spark": ["apache spark", "pyspark"],
+    "airflow": ["apache airflow"],
+    "snowflake": [],
+    "dbt": [],
+    "hadoop": [],
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": ["microsoft azure"],
+    "docker": ["containers"],
+    "kubernetes": ["k8s", "kube", "eks", "gke", "aks"],
+    "terraform": [],
+    "ansible": [],
+    "jenkins": [],
+    "github actions": [],
+    "ci/cd": ["cicd", "ci cd", "continuous integration"],
+    "linux": ["unix"],
+    "git": [],
+    "machine learning": ["ml"],
+    "deep learning": ["dl"],
+    "pytorch": ["torch"],
+    "tensorflow": ["tf"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "pandas": [],
+    "numpy": [],
+    "nlp": ["natural language processing"],
+    "llms": ["llm", "large language models"],
+    "data analysis": ["data analytics"],
+    "tableau": [],
+    "power bi": ["powerbi"],
+    "excel": ["microsoft excel", "ms excel"],
+    "salesforce": [],
+    "sap": [],
+    "jira": [],
+    "agile": ["scrum", "kanban"],
+    "project management": ["pmp"],
+    "product management": [],
+    "figma": [],
+    "ux design": ["ux", "user experience"],
+    "ui design": ["ui"],
+    "html": ["html5"],
+    "css": ["css3", "sass", "scss"],
+    "ios": [],
+    "android": [],
+    "microservices": ["micro services"],
+    "security": ["cybersecurity", "cyber security", "infosec"],
+    "networking": ["tcp/ip"],
+    "accounting": ["gaap"],
+    "recruiting": ["talent acquisition"],
+}
+
+_ALIASES: Dict[str, str] = {}
+for _canonical, _spellings in SKILLS.items():
+    _ALIASES[_canonical] = _canonical
+    for _spelling in _spellings:
+        _ALIASES[_spelling] = _canonical
+
+# Version suffixes ("python 3.11", "postgresql 14") don't make a different skill
+_VERSION = re.compile(r"\s*v?\d+(\.\d+)*x?$")
+_SPACES = re.compile(r"\s+")
+MAX_SKILL_LENGTH = 64
+
+
+def normalize_skill(name: str) -> Optional[str]:
+    skill = _SPACES.sub(" ", name.strip().lower()).strip(" ,;:()[]")
+    if skill in _ALIASES:
+        return _ALIASES[skill]
+    skill = _VERSION.sub("", skill)
+    if not skill:
+        return None
+    return _ALIASES.get(skill, skill[:MAX_SKILL_LENGTH])
+
+
+@lru_cache(maxsize=1)
+def _known_skills_pattern() -> "re.Pattern[str]":
+    # Longest spelling first, so "spring boot" wins over "spring"; short aliases that
+    # are also common words ("r", "c", "go", "ui", "ts") are not matched in free text
+    spellings = sorted((s for s in _ALIASES if len(s) > 2 or s in ("c#", "c++", "ml", "aws", "gcp")), key=len, reverse=True)
+    alternatives = "|".join(re.escape(spelling) for spelling in spellings)
+    return re.compile(rf"(?<![\w+#.])({alternatives})(?![\w+#])", re.IGNORECASE)
+
+
+def find_skills(text: str) -> List[str]:
+    """Canonical names of the dictionary skills mentioned in `text`, in order of first mention."""
+    found: Dict[str, None] = {}
+    for match in _known_skills_pattern().finditer(text):
+        found.setdefault(_ALIASES[match.group(1).lower()])
+    return list(found)
+
+
+# A period only ends a sentence before whitespace, so "node.js" and "2.5 years" survive
+_SENTENCE = re.compile(r"[;\n]+|\.(?=\s|$)")
+_YEARS = re.compile(r"(\d{1,2}(?:\.\d)?)\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+_YEAR_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10}
+_YEARS_IN_WORDS = re.compile(rf"\b({'|'.join(_YEAR_WORDS)})\+?\s+years?\b", re.IGNORECASE)
+MAX_YEARS = 50
+
+
+def find_skills_with_years(text: str) -> List[Dict[str, Any]]:
+    """
+    Dictionary-only extraction, used when no LLM is configured or it fails: every known
+    skill mentioned, with the largest "N years" stated in the same sentence, if any.
+    """
+    years: Dict[str, Optional[float]] = {}
+    for sentence in _SENTENCE.split(text):
+        skills = find_skills(sentence)
+        if not skills:
+            continue
+        stated = [float(value) for value in _YEARS.findall(sentence)]
+        stated += [float(_YEAR_WORDS[word.lower()]) for word in _YEARS_IN_WORDS.findall(sentence)]
+        sentence_years = min(max(stated), MAX_YEARS) if stated else None
+        for skill in skills:
+            previous = years.get(skill)
+            if sentence_years is not None and (previous is None or sentence_years > previous):
+                years[skill] = sentence_years
+            else:
+                years.setdefault(skill, previous)
+    return [{"name": skill, "years": value} for skill, value in years.items()]
@@ -0,0 +1,80 @@
+"""Minimal local SMTP sink for development and tests. Accepts every message, delivers none.
+
+Usage:
+    python -m app.core.smtp_sink [port]
+
+Then run the backend with SMTP_HOST=localhost SMTP_PORT=1025 SMTP_STARTTLS=false
+(SMTP_USER/SMTP_PASSWORD can be any value; the sink accepts any login).
+"""
+import asyncio
+import sys
+from email import message_from_bytes
+from email.message import Message
+from typing import List, Optional
+
+
+class SMTPSink:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, echo: bool = False):
+        self.host = host
+        self.port = port
+        self.echo = echo
+        self.messages: List[Message] = []
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def reply(line: str) -> None:
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        await reply("220 smtp-sink ready")
+        try:
+            while line := await reader.readline():
+                command = line.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+                if verb in ("EHLO", "HELO"):
+                    await reply("250-smtp-sink")
+                    await reply("250 AUTH PLAIN LOGIN")
+                elif verb == "AUTH":
+                    if command.upper().startswith("AUTH LOGIN"):
+                        for prompt in ("VXNlcm5hbWU6", "UGFzc3dvcmQ6"):
+                            await reply(f"334 {prompt}")
+                            await reader.readline()
+                    await reply("235 Authentication successful")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = bytearray()
+                    while (chunk := await reader.readline()) not in (b".\r\n", b""):
+                        data += chunk[1:] if chunk.startswith(b"..") else chunk
+                    message = message_from_bytes(bytes(data))
+                    self.messages.append(message)
+                    if self.echo:
+                        print(f"--- {message['To']}: {message['Subject']}")
+                    await reply("250 OK queued")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    # MAIL, RCPT, RSET, NOOP
+                    await reply("250 OK")
+        finally:
+            writer.close()
+
+
+async def _main(port: int) -> None:
+    sink = SMTPSink(port=port, echo=True)
+    await sink.start()
+    print(f"SMTP sink listening on {sink.host}:{sink.port}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(int(sys.argv[1]) if len(sys.argv) > 1 else 1025))
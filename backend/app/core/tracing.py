@@ -0,0 +1,313 @@
+"""
+Tracing on the OpenTelemetry API, with a built-in provider for local inspection.
+
+Spans are created through `opentelemetry.trace`, so FastAPI's native telemetry (one
+SERVER span per request plus dependency/endpoint/serialization spans), the SQL spans
+below and the app's own spans (text extraction, LLM calls, email sends) share one
+trace per request, and W3C `traceparent` headers continue incoming traces.
+
+configure_tracing() installs LocalTracerProvider unless a provider is already set
+(e.g. the opentelemetry-sdk via `opentelemetry-instrument`, which then receives all
+these spans and exports them over OTLP instead). The local provider:
+
+    - samples head-based: a new trace is kept with probability TRACING_SAMPLE_RATIO
+      (decided from the trace id, like the SDK's TraceIdRatioBased), and child spans
+      and remote parents keep their parent's decision
+    - exports each finished span synchronously, one JSON object per line (OTLP field
+      names, hex ids) to TRACING_FILE, or as a readable line on the console
+
+Unsampled spans are non-recording, and with tracing disabled every span is a no-op.
+"""
+import random
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import orjson
+from opentelemetry import trace
+from opentelemetry.trace import (
+    NonRecordingSpan,
+    Span,
+    SpanContext,
+    SpanKind,
+    Status,
+    StatusCode,
+    TraceFlags,
+    format_span_id,
+    format_trace_id,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+tracer = trace.get_tracer("app")
+
+_SQL_SPANS_KEY = "tracing_spans"
+_SQL_TEXT_LIMIT = 1000
+_ID_MASK_64 = (1 << 64) - 1
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None, kind: SpanKind = SpanKind.INTERNAL):
+    """Context manager for a child span of the current one."""
+    return tracer.start_as_current_span(name, kind=kind, attributes=attributes)
+
+
+class RecordingSpan(Span):
+    def __init__(
+        self,
+        provider: "LocalTracerProvider",
+        scope: str,
+        name: str,
+        context: SpanContext,
+        parent: Optional[SpanContext],
+        kind: SpanKind,
+        attributes: Optional[Dict[str, Any]],
+        start_time: Optional[int],
+    ):
+        self.provider = provider
+        self.scope = scope
+        self.name = name
+        self.context = context
+        self.parent = parent
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status = Status(StatusCode.UNSET)
+        self.start_time = start_time or time.time_ns()
+        self.end_time: Optional[int] = None
+
+    def get_span_context(self) -> SpanContext:
+        return self.context
+
+    def is_recording(self) -> bool:
+        return self.end_time is None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.end_time is None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        if self.end_time is None:
+            self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None, timestamp: Optional[int] = None) -> None:
+        if self.end_time is None:
+            self.events.append({"name": name, "timeUnixNano": timestamp or time.time_ns(), "attributes": dict(attributes or {})})
+
+    def update_name(self, name: str) -> None:
+        if self.end_time is None:
+            self.name = name
+
+    def set_status(self, status: Any, description: Optional[str] = None) -> None:
+        if self.end_time is None:
+            self.status = status if isinstance(status, Status) else Status(status, description)
+
+    def record_exception(self, exception: BaseException, attributes: Optional[Dict[str, Any]] = None, timestamp: Optional[int] = None, escaped: bool = False) -> None:
+        self.add_event("exception", {
+            "exception.type": type(exception).__qualname__,
+            "exception.message": str(exception),
+            "exception.stacktrace": "".join(traceback.format_exception(exception)),
+            **(attributes or {}),
+        }, timestamp)
+
+    def end(self, end_time: Optional[int] = None) -> None:
+        if self.end_time is not None:
+            return
+        self.end_time = end_time or time.time_ns()
+        self.provider.on_end(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        status = {"code": self.status.status_code.name}
+        if self.status.description:
+            status["message"] = self.status.description
+        return {
+            "traceId": format_trace_id(self.context.trace_id),
+            "spanId": format_span_id(self.context.span_id),
+            "parentSpanId": format_span_id(self.parent.span_id) if self.parent else None,
+            "name": self.name,
+            "kind": self.kind.name,
+            "scope": self.scope,
+            "startTimeUnixNano": self.start_time,
+            "endTimeUnixNano": self.end_time,
+            "durationMs": round((self.end_time - self.start_time) / 1e6, 3),
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": status,
+            "resource": self.provider.resource,
+        }
+
+
+class LocalTracer(trace.Tracer):
+    def __init__(self, provider: "LocalTracerProvider", scope: str):
+        self.provider = provider
+        self.scope = scope
+
+    def start_span(
+        self,
+        name: str,
+        context: Any = None,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        links: Optional[Sequence[Any]] = None,
+        start_time: Optional[int] = None,
+        record_exception: bool = True,
+        set_status_on_exception: bool = True,
+    ) -> Span:
+        parent = trace.get_current_span(context).get_span_context()
+        if parent.is_valid:
+            trace_id, sampled = parent.trace_id, parent.trace_flags.sampled
+        else:
+            trace_id = random.getrandbits(128) or 1
+            sampled = self.provider.should_sample(trace_id)
+        span_context = SpanContext(
+            trace_id, random.getrandbits(64) or 1, is_remote=False,
+            trace_flags=TraceFlags(TraceFlags.SAMPLED if sampled else TraceFlags.DEFAULT),
+        )
+        if not sampled:
+            return NonRecordingSpan(span_context)
+        return RecordingSpan(
+            self.provider, self.scope, name, span_context, parent if parent.is_valid else None,
+            kind, attributes, start_time,
+        )
+
+    @contextmanager
+    def start_as_current_span(
+        self,
+        name: str,
+        context: Any = None,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        links: Optional[Sequence[Any]] = None,
+        start_time: Optional[int] = None,
+        record_exception: bool = True,
+        set_status_on_exception: bool = True,
+        end_on_exit: bool = True,
+    ) -> Iterator[Span]:
+        new_span = self.start_span(name, context, kind, attributes, links, start_time)
+        with trace.use_span(
+            new_span, end_on_exit=end_on_exit,
+            record_exception=record_exception, set_status_on_exception=set_status_on_exception,
+        ) as current:
+            yield current
+
+
+class LocalTracerProvider(trace.TracerProvider):
+    def __init__(self, sample_ratio: float = 1.0, exporters: Sequence[Callable[[RecordingSpan], None]] = (), resource: Optional[Dict[str, Any]] = None):
+        self.sample_ratio = sample_ratio
+        self.exporters = list(exporters)
+        self.resource = resource or {}
+
+    @property
+    def sample_ratio(self) -> float:
+        return self._sample_ratio
+
+    @sample_ratio.setter
+    def sample_ratio(self, ratio: float) -> None:
+        self._sample_ratio = ratio
+        self._bound = int(min(max(ratio, 0.0), 1.0) * (1 << 64))
+
+    def should_sample(self, trace_id: int) -> bool:
+        return (trace_id & _ID_MASK_64) < self._bound
+
+    def get_tracer(self, instrumenting_module_name: str, *args: Any, **kwargs: Any) -> LocalTracer:
+        return LocalTracer(self, instrumenting_module_name)
+
+    def on_end(self, finished: RecordingSpan) -> None:
+        for export in self.exporters:
+            try:
+                export(finished)
+            except Exception as e:
+                print(f"[TRACING] Export failed: {e}", file=sys.stderr)
+
+
+class FileSpanExporter:
+    """Appends one JSON object per span to `path`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+
+    def __call__(self, finished: RecordingSpan) -> None:
+        line = orjson.dumps(finished.to_dict(), default=str, option=orjson.OPT_APPEND_NEWLINE)
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+
+def console_exporter(finished: RecordingSpan) -> None:
+    data = finished.to_dict()
+    attributes = " ".join(f"{key}={value}" for key, value in data["attributes"].items())
+    status = "" if data["status"]["code"] == "UNSET" else f" [{data['status']['code']}]"
+    print(
+        f"[TRACE] {data['traceId'][:8]} {data['spanId']} <- {data['parentSpanId'] or '-':<16} "
+        f"{data['name']} {data['durationMs']:.1f}ms{status} {attributes}"
+    )
+
+
+def _statement_span(conn, cursor, statement, parameters, context, executemany):
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    new_span = tracer.start_span(operation, kind=SpanKind.CLIENT, attributes={
+        "db.system.name": conn.dialect.name,
+        "db.operation.name": operation,
+        "db.query.text": statement[:_SQL_TEXT_LIMIT],
+    })
+    conn.info.setdefault(_SQL_SPANS_KEY, []).append(new_span)
+
+
+def _end_statement_span(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get(_SQL_SPANS_KEY)
+    if not spans:
+        return
+    finished = spans.pop()
+    if finished.is_recording():
+        if cursor.description is not None:
+            finished.set_attribute("db.response.returned_rows", len(getattr(cursor, "_rows", ())))
+        elif cursor.rowcount >= 0:
+            finished.set_attribute("db.response.affected_rows", cursor.rowcount)
+    finished.end()
+
+
+def _fail_statement_span(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get(_SQL_SPANS_KEY) if connection is not None else None
+    if not spans:
+        return
+    failed = spans.pop()
+    failed.record_exception(exception_context.original_exception)
+    failed.set_status(Status(StatusCode.ERROR, type(exception_context.original_exception).__name__))
+    failed.end()
+
+
+_sql_instrumented = False
+
+
+def instrument_sqlalchemy() -> None:
+    """A CLIENT span per statement on every engine."""
+    global _sql_instrumented
+    if _sql_instrumented:
+        return
+    event.listen(Engine, "before_cursor_execute", _statement_span)
+    event.listen(Engine, "after_cursor_execute", _end_statement_span)
+    event.listen(Engine, "handle_error", _fail_statement_span)
+    _sql_instrumented = True
+
+
+def configure_tracing(
+    sample_ratio: float, exporter: str = "file", path: str = "traces.jsonl", service_name: str = "backend"
+) -> Optional[LocalTracerProvider]:
+    """Install the local provider (unless one is configured) and SQL spans."""
+    instrument_sqlalchemy()
+    if type(trace.get_tracer_provider()).__name__ != "ProxyTracerProvider":
+        print("[TRACING] Using the already configured tracer provider")
+        return None
+    exporters: List[Callable[[RecordingSpan], None]] = []
+    if exporter == "file":
+        exporters.append(FileSpanExporter(path))
+    elif exporter == "console":
+        exporters.append(console_exporter)
+    provider = LocalTracerProvider(sample_ratio, exporters, resource={"service.name": service_name})
+    trace.set_tracer_provider(provider)
+    return provider
@@ -0,0 +1,79 @@
+"""
+Static serving for uploaded resumes.
+
+Byte ranges, ETags and If-None-Match/304 come from Starlette's FileResponse. With
+UPLOADS_PRECOMPRESS enabled, gzip-accepting full-body requests are served from a
+cached .gz variant that is built once per file version (outside the served
+directory) and only kept when it saves at least 10%.
+"""
+import gzip
+import os
+import shutil
+from typing import Optional, Tuple
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.compression import accepted_encodings
+
+MIN_SAVINGS_RATIO = 0.9
+
+
+class UploadFiles(StaticFiles):
+    def __init__(self, *, directory: str, precompress: bool = False, cache_dir: Optional[str] = None):
+        super().__init__(directory=directory)
+        self.precompress = precompress and cache_dir is not None
+        self.cache_dir = cache_dir
+        if self.precompress:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if not self.precompress or not isinstance(response, FileResponse) or response.status_code != 200:
+            return response
+
+        request_headers = Headers(scope=scope)
+        if "range" in request_headers or accepted_encodings(request_headers.get("accept-encoding", "")).get("gzip", 0) <= 0:
+            return response
+
+        variant = await anyio.to_thread.run_sync(self.gzip_variant, str(response.path), response.stat_result)
+        if variant is None:
+            return response
+
+        gz_path, gz_stat = variant
+        gz_response = FileResponse(
+            gz_path,
+            stat_result=gz_stat,
+            media_type=response.media_type,
+            headers={
+                "Content-Encoding": "gzip",
+                "Vary": "Accept-Encoding",
+                "ETag": response.headers["etag"][:-1] + '-gz"',
+                "Last-Modified": response.headers["last-modified"],
+            },
+        )
+        if self.is_not_modified(gz_response.headers, request_headers):
+            return NotModifiedResponse(gz_response.headers)
+        return gz_response
+
+    def gzip_variant(self, full_path: str, stat_result: os.stat_result) -> Optional[Tuple[str, os.stat_result]]:
+        """Return (path, stat) of the cached .gz for this file version, building it if needed."""
+        key = f"{os.path.basename(full_path)}.{stat_result.st_mtime_ns}-{stat_result.st_size}"
+        gz_path = os.path.join(self.cache_dir, key + ".gz")
+        skip_path = os.path.join(self.cache_dir, key + ".skip")
+        if os.path.exists(skip_path):
+            return None
+        if not os.path.exists(gz_path):
+            tmp_path = f"{gz_path}.{os.getpid()}.tmp"
+            with open(full_path, "rb") as src, open(tmp_path, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9, mtime=0) as dst:
+                    shutil.copyfileobj(src, dst)
+            if os.path.getsize(tmp_path) > stat_result.st_size * MIN_SAVINGS_RATIO:
+                os.remove(tmp_path)
+                open(skip_path, "wb").close()
+                return None
+            os.replace(tmp_path, gz_path)
+        return gz_path, os.stat(gz_path)
@@ -0,0 +1,131 @@
+"""
+Worker sizing and the shared worker table used by the production launcher (app/server.py).
+
+The table lives in anonymous shared memory created before the workers are forked: each
+worker writes its own slot (heartbeat, requests served, open connections) from uvicorn's
+0.1s tick, the launcher reads every slot to respawn and kill workers, and any worker can
+report the whole table at /health/workers. A worker whose event loop is blocked stops
+ticking, so a stale heartbeat means a stuck worker rather than an idle one.
+"""
+import ctypes
+import math
+import os
+import time
+from multiprocessing.sharedctypes import RawArray
+from typing import Any, Dict, Optional
+
+_UNLIMITED = 1 << 60
+
+
+class WorkerSlot(ctypes.Structure):
+    _fields_ = [
+        ("pid", ctypes.c_int),
+        ("started", ctypes.c_double),
+        ("heartbeat", ctypes.c_double),
+        ("requests", ctypes.c_long),
+        ("connections", ctypes.c_int),
+        ("restarts", ctypes.c_int),
+        ("max_requests", ctypes.c_long),
+    ]
+
+
+class WorkerTable:
+    def __init__(self, size: int, timeout: float):
+        self.slots = RawArray(WorkerSlot, size)
+        self.timeout = timeout
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def status(self) -> Dict[str, Any]:
+        now = time.time()
+        workers = []
+        for index, slot in enumerate(self.slots):
+            age = now - slot.heartbeat if slot.pid else None
+            workers.append({
+                "index": index,
+                "pid": slot.pid or None,
+                "healthy": bool(slot.pid) and age <= self.timeout,
+                "uptime_seconds": round(now - slot.started, 1) if slot.pid else None,
+                "heartbeat_age_seconds": round(age, 2) if age is not None else None,
+                "requests": slot.requests,
+                "max_requests": slot.max_requests or None,
+                "connections": slot.connections,
+                "restarts": slot.restarts,
+            })
+        healthy = sum(worker["healthy"] for worker in workers)
+        return {
+            "status": "ok" if healthy == len(workers) else "degraded",
+            "mode": "multi",
+            "served_by": os.getpid(),
+            "workers": workers,
+        }
+
+
+# Set by the launcher before forking; None when the app runs under plain uvicorn
+table: Optional[WorkerTable] = None
+
+
+def status() -> Dict[str, Any]:
+    if table is None:
+        return {"status": "ok", "mode": "single", "served_by": os.getpid(), "workers": []}
+    return table.status()
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    cpu_max = _read("/sys/fs/cgroup/cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    quota = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+    period = _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def available_cpus() -> float:
+    """CPUs this process may use: affinity mask, capped by a cgroup CPU quota (containers)."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus: float = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+
+def available_memory() -> Optional[int]:
+    """Memory limit in bytes: the cgroup limit if one is set, else physical memory."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        value = _read(path)
+        if value and value != "max" and int(value) < _UNLIMITED:
+            return int(value)
+    meminfo = _read("/proc/meminfo")
+    if meminfo:
+        for line in meminfo.splitlines():
+            if line.startswith("MemTotal:"):
+                return int(line.split()[1]) * 1024
+    return None
+
+
+def worker_count(
+    cpus: float, memory: Optional[int], per_cpu: float, worker_memory_mb: int, max_workers: int
+) -> int:
+    """
+    `per_cpu` workers per CPU, so one worker blocked on CPU-bound work (bcrypt, pypdf)
+    does not stall the instance, but no more than fit in memory at `worker_memory_mb` each.
+    """
+    by_cpu = math.ceil(cpus * per_cpu)
+    by_memory = memory // (worker_memory_mb * 1024 * 1024) if memory and worker_memory_mb else by_cpu
+    return max(1, min(by_cpu, by_memory, max_workers))
@@ -5,11 +5,19 @@ from app.db.session import engine
 from app.models.user import User
 from app.models.job import Job
 from app.models.application import Application
+from app.models.email_outbox import EmailOutbox
+from app.models.pending_notification import PendingNotification
+from app.models.resume_fingerprint import ResumeFingerprint, ResumeLSHBucket
+from app.models.candidate_profile import CandidateProfile, CandidateSkill
+from app.models.job_requirement import JobRequirement, RequirementVerdict
 
 async def init_db(db_engine: AsyncEngine):
     print("Initializing database tables...")
     try:
         async with db_engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                # Trigram operator class for the user search index
+                await conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
             # Create tables
             await conn.run_sync(Base.metadata.create_all)
         print("Database tables created successfully")
@@ -1,19 +1,64 @@
-from fastapi import FastAPI, Depends
+import hmac
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 from app.api import deps
 from app.core.config import settings
+from app.core.serialization import ORJSONResponse
+from app.core.compression import CompressionMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+from app.core import metrics, prewarm, workers
+from app.core.tracing import configure_tracing
+from app.core.uploads import UploadFiles
+from app.core.events import event_broker
+from app.core.email import smtp_configured
+from app.services import email_outbox, job_cache, notifications
 from app.db.init_db import init_db
-from app.db.session import engine
+from app.db.session import engine, AsyncSessionLocal
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize database tables on startup
-    await init_db(engine)
+    # Initialize database tables on startup (the multi-worker launcher does it once, before forking)
+    if settings.INIT_DB_ON_STARTUP:
+        await init_db(engine)
+    await event_broker.start()
+    if smtp_configured() and settings.EMAIL_OUTBOX_WORKER:
+        email_outbox.outbox_sender = email_outbox.create_outbox_sender(AsyncSessionLocal)
+        email_outbox.outbox_sender.start()
+    if notifications.notifications_enabled():
+        notifications.digest_flusher = notifications.create_digest_flusher(AsyncSessionLocal)
+        notifications.digest_flusher.start()
+    prewarm.start()
     yield
+    await prewarm.stop()
+    if notifications.digest_flusher is not None:
+        await notifications.digest_flusher.stop()
+    if email_outbox.outbox_sender is not None:
+        await email_outbox.outbox_sender.stop()
+    await job_cache.job_cache.close()
+    await event_broker.stop()
 
-app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+if settings.TRACING_ENABLED:
+    configure_tracing(
+        settings.TRACING_SAMPLE_RATIO,
+        exporter=settings.TRACING_EXPORTER,
+        path=settings.TRACING_FILE,
+        service_name=settings.PROJECT_NAME,
+    )
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan, default_response_class=ORJSONResponse)
+
+
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError) -> Response:
+    # A versioned row (job, application) changed between this request's read and its write,
+    # e.g. by a concurrent edit or a bulk update
+    return ORJSONResponse(
+        status_code=409,
+        content={"detail": "This record was changed by another request. Reload it and try again."},
+    )
 
 # CORS — allow all origins for production stability
 app.add_middleware(
@@ -22,18 +67,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        thread_minimum_size=settings.COMPRESSION_THREAD_MINIMUM_SIZE,
+    )
+
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        headers=settings.QUERY_STATS_HEADERS,
+        n_plus_one_threshold=settings.QUERY_STATS_N_PLUS_ONE_THRESHOLD,
+    )
+
+if settings.METRICS_ENABLED:
+    # Outermost, so request durations include every other middleware
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.registry.add_collector(lambda: metrics.pool_metrics(engine))
+    metrics.registry.add_collector(metrics.query_metrics)
+
 from app.api.v1.api import api_router
 
-from fastapi.staticfiles import StaticFiles
 import os
 
 # Create uploads directory if it doesn't exist
 if not os.path.exists("uploads"):
     os.makedirs("uploads")
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount(
+    "/uploads",
+    UploadFiles(
+        directory="uploads",
+        precompress=settings.UPLOADS_PRECOMPRESS,
+        cache_dir=settings.UPLOADS_PRECOMPRESSED_DIR,
+    ),
+    name="uploads",
+)
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -42,11 +115,39 @@ def read_root():
     return {"message": "Welcome to Boutique Staffing Portal API"}
 
 @app.get("/health")
-async def health_check(db: AsyncSession = Depends(deps.get_db)):
+async def health_check(response: Response, db: AsyncSession = Depends(deps.get_db)):
     try:
         from sqlalchemy import text
         await db.execute(text("SELECT 1"))
         return {"status": "ok", "db_connection": "connected"}
     except Exception as e:
-        return {"status": "error", "db_connection": "failed", "error": str(e), "db_url": settings.DATABASE_URL}
+        # Details stay in the server log; they can include connection strings
+        print(f"[HEALTH] Database check failed: {e}")
+        response.status_code = 503
+        return {"status": "error", "db_connection": "failed"}
+
+@app.get("/health/workers")
+def worker_health():
+    # Every worker shares the launcher's table, so any of them can answer for all
+    return workers.status()
+
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics(request: Request, db: AsyncSession = Depends(deps.get_db)):
+    """Prometheus exposition of this worker's metrics.
 
+    Under the prefork launcher (python -m app.server) every worker keeps its own
+    registry, so counters and histograms are per worker: a scrape sees whichever
+    worker answered. Queue depth gauges come from the database and are the same
+    on every worker.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = settings.METRICS_BEARER_TOKEN
+    if token and not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {token}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    try:
+        queues = await metrics.queue_metrics(db)
+    except Exception as e:
+        print(f"[METRICS] Queue depth query failed: {e}")
+        queues = []
+    return Response(metrics.registry.render(queues), media_type=metrics.CONTENT_TYPE)
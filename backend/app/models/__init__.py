@@ -1,3 +1,8 @@
 from .user import User
 from .job import Job
-from .application import Application
\ No newline at end of file
+from .application import Application
+from .email_outbox import EmailOutbox
+from .pending_notification import PendingNotification
+from .resume_fingerprint import ResumeFingerprint, ResumeLSHBucket
+from .candidate_profile import CandidateProfile, CandidateSkill
+from .job_requirement import JobRequirement, RequirementVerdict
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Enum, Text, Boolean, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Enum, Boolean, UniqueConstraint, Index, Computed, JSON, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
 import enum
 
+# JSONB on Postgres (indexable, binary), plain JSON elsewhere (SQLite stores it as TEXT)
+AnalysisJSON = JSON().with_variant(JSONB(), "postgresql")
+
 class ApplicationStatus(str, enum.Enum):
     APPLIED = "APPLIED"
     REVIEWING = "REVIEWING"
@@ -17,14 +21,30 @@ class Application(Base):
     job_id = Column(Integer, ForeignKey("job.id"), nullable=False)
     status = Column(Enum(ApplicationStatus), default=ApplicationStatus.APPLIED)
     resume_path = Column(String, nullable=True)
+    resume_hash = Column(String(64), nullable=True) # normalized resume content; keys the requirement verdict cache
     ai_score = Column(Integer, nullable=True)
-    ai_analysis = Column(Text, nullable=True) # JSON string
+    ai_analysis = Column(AnalysisJSON, nullable=True) # Native JSON / JSONB
     is_reviewed = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Bumped on every update; bulk updates can require an expected version
+    version = Column(Integer, nullable=False, server_default="1")
+
+    # Generated from ai_analysis by the database, never written by the app
+    match_count = Column(Integer, Computed(ai_analysis["match_count"].as_integer(), persisted=True))
+    total_must_haves = Column(Integer, Computed(ai_analysis["total_must_haves"].as_integer(), persisted=True))
     
     user = relationship("User", back_populates="applications")
     job = relationship("Job", back_populates="applications")
 
+    __mapper_args__ = {"version_id_col": version}
+
     __table_args__ = (
         UniqueConstraint('user_id', 'job_id', name='uq_application_user_job'),
+        Index('ix_application_job_match_count', 'job_id', 'match_count'),
+        # GIN index for containment queries such as "applicants missing requirement X"
+        Index(
+            'ix_application_gap_analysis',
+            text("(ai_analysis -> 'gap_analysis')"),
+            postgresql_using='gin',
+        ).ddl_if(dialect='postgresql'),
     )
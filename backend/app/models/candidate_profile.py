@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Float, Index, text
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class CandidateProfile(Base):
+    """Structured facts extracted once from a candidate's latest resume (see app/services/candidate_profiles.py)."""
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    content_hash = Column(String(64), nullable=False) # sha256 of the normalized resume text it was extracted from
+    titles = Column(JSON, nullable=False, default=list) # job titles held, most recent first
+    employers = Column(JSON, nullable=False, default=list)
+    extracted_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class CandidateSkill(Base):
+    """One row per candidate and canonical skill name (app/core/skills.py)."""
+    user_id = Column(Integer, ForeignKey("candidateprofile.user_id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String(64), primary_key=True)
+    years = Column(Float, nullable=True) # None when the resume doesn't say
+
+    __table_args__ = (
+        # Skill search reads this backwards: most years first, unknown years last.
+        # SQLite always sorts NULLs first; Postgres needs to be told (and SQLite can't be)
+        Index('ix_candidateskill_skill_years_user', 'skill', text('years NULLS FIRST'), 'user_id').ddl_if(dialect='postgresql'),
+        Index('ix_candidateskill_skill_years_user', 'skill', 'years', 'user_id').ddl_if(dialect='sqlite'),
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+import enum
+
+class EmailStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    DEAD = "DEAD" # Gave up after EMAIL_MAX_ATTEMPTS
+
+class EmailOutbox(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    text_body = Column(Text, nullable=False)
+    html_body = Column(Text, nullable=True)
+    status = Column(Enum(EmailStatus), nullable=False, default=EmailStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The sender only ever scans due PENDING rows
+        Index('ix_emailoutbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
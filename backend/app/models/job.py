@@ -1,22 +1,38 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, Text, ForeignKey, Boolean, DateTime, Float, Index, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
 
 class Job(Base):
+    __table_args__ = (
+        Index('ix_job_state_city', 'state', 'city'),
+        Index('ix_job_geohash', 'geohash'),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=False)
     requirements = Column(Text, nullable=True) # Must-have
     nice_to_have_requirements = Column(Text, nullable=True) # Desired
     location = Column(String, nullable=True)
+    # Place the location text resolves to (app/services/locations.py)
+    city = Column(String, nullable=True)
+    state = Column(String, nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(BigInteger, nullable=True)
+    is_remote = Column(Boolean(), nullable=False, default=False, server_default=false())
     salary_range = Column(String, nullable=True)
     job_type = Column(String, nullable=True) # e.g. Full-time, Contract
     experience_level = Column(String, nullable=True) # e.g. Junior, Senior
     is_active = Column(Boolean(), default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Row version, bumped by SQLAlchemy on every UPDATE (also used for ETags)
+    version = Column(Integer, nullable=False, server_default="1")
     
     owner_id = Column(Integer, ForeignKey("user.id"))
     owner = relationship("User", back_populates="jobs")
     applications = relationship("Application", back_populates="job")
+
+    __mapper_args__ = {"version_id_col": version}
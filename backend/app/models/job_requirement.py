@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class JobRequirement(Base):
+    """One atomic requirement of a job, parsed from its requirement text (see app/services/requirement_screening.py)."""
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("job.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(8), nullable=False) # "must" or "nice"
+    position = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+    requirement_hash = Column(String(64), nullable=False) # sha256 of the normalized text
+
+    __table_args__ = (
+        UniqueConstraint('job_id', 'kind', 'position', name='uq_jobrequirement_job_kind_position'),
+    )
+
+class RequirementVerdict(Base):
+    """Cached screening verdict of one resume (by normalized content) against one requirement."""
+    resume_hash = Column(String(64), primary_key=True)
+    requirement_hash = Column(String(64), primary_key=True)
+    status = Column(String(16), nullable=False) # "Match", "Weak" or "Missing"
+    note = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class PendingNotification(Base):
+    """An event waiting to be rolled into its recipient's next digest email."""
+    id = Column(Integer, primary_key=True, index=True)
+    recipient_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String, nullable=False) # e.g. "new_applicant"
+    job_id = Column(Integer, ForeignKey("job.id", ondelete="CASCADE"), nullable=True)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # The flusher groups by recipient and checks the oldest event per recipient
+        Index('ix_pendingnotification_recipient_created', 'recipient_id', 'created_at'),
+    )
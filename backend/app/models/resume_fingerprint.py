@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary, BigInteger, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class ResumeFingerprint(Base):
+    """MinHash signature of a screened resume (see app/services/resume_dedup.py)."""
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    application_id = Column(Integer, ForeignKey("application.id", ondelete="CASCADE"), nullable=True)
+    content_hash = Column(String(64), nullable=False) # sha256 of the normalized text
+    minhash = Column(LargeBinary, nullable=False) # packed uint32 min-hash per hash function
+    words = Column(LargeBinary, nullable=False) # sorted packed uint32 hashes of the distinct words
+    requirements_hash = Column(String(64), nullable=True) # job title + requirements it was screened against
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    buckets = relationship("ResumeLSHBucket", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index('ix_resumefingerprint_user_requirements', 'user_id', 'requirements_hash'),
+        Index('ix_resumefingerprint_application_id', 'application_id'),
+    )
+
+class ResumeLSHBucket(Base):
+    """One row per LSH band of a fingerprint; fingerprints sharing a bucket are candidates."""
+    bucket = Column(BigInteger, primary_key=True)
+    fingerprint_id = Column(Integer, ForeignKey("resumefingerprint.id", ondelete="CASCADE"), primary_key=True)
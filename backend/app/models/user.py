@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Enum, UniqueConstraint
+from sqlalchemy import BigInteger, Boolean, Column, Float, Integer, String, Enum, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import enum
@@ -8,9 +8,16 @@ class UserRole(str, enum.Enum):
     CLIENT = "client"
     CANDIDATE = "candidate"
 
+# Text the admin user search matches against. Queries must use this exact expression
+# for Postgres to pick up the trigram index below (app/services/user_search.py).
+SEARCH_FIELDS = ("email", "first_name", "last_name", "company_name", "city", "state")
+SEARCH_DOCUMENT = "lower(" + " || ' ' || ".join(f"coalesce({field}, '')" for field in SEARCH_FIELDS) + ")"
+
 class User(Base):
     __table_args__ = (
         UniqueConstraint('email', 'role', name='uq_user_email_role'),
+        Index('ix_user_search_trgm', text(f"({SEARCH_DOCUMENT}) gin_trgm_ops"), postgresql_using='gin').ddl_if(dialect='postgresql'),
+        Index('ix_user_geohash', 'geohash'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -26,6 +33,10 @@ class User(Base):
     phone_number = Column(String, nullable=True)
     city = Column(String, nullable=True)
     state = Column(String, nullable=True)
+    # Coordinates of city/state from the gazetteer (app/services/locations.py)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(BigInteger, nullable=True)
     years_of_experience = Column(Integer, nullable=True)
     work_permit_type = Column(String, nullable=True)
     linkedin_url = Column(String, nullable=True)
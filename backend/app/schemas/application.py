@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
 from app.schemas.job import JobResponse
 from app.schemas.user import UserInDBBase
@@ -18,9 +18,11 @@ class ApplicationInDBBase(ApplicationBase):
     status: ApplicationStatus
     resume_path: Optional[str] = None
     ai_score: Optional[int] = None
-    ai_analysis: Optional[str] = None # JSON string or Dict? Model has Text.
+    match_count: Optional[int] = None
+    total_must_haves: Optional[int] = None
     is_reviewed: bool = False
     created_at: datetime
+    version: int = 1
     
     class Config:
         from_attributes = True
@@ -28,4 +30,49 @@ class ApplicationInDBBase(ApplicationBase):
 class ApplicationResponse(ApplicationInDBBase):
     job: Optional[JobResponse] = None
     user: Optional[UserInDBBase] = None
-    ai_analysis_json: Optional[dict] = None # Helper field if we parse it
+    # Stored JSON passed through as-is from the native JSON column
+    ai_analysis_json: Optional[Dict[str, Any]] = Field(default=None, validation_alias="ai_analysis")
+
+
+class ApplicationVersion(BaseModel):
+    id: int
+    version: int
+
+class ApplicationBulkFilter(BaseModel):
+    job_id: int
+    status: Optional[List[ApplicationStatus]] = None
+    ai_score_lt: Optional[int] = None
+    ai_score_gte: Optional[int] = None
+    is_reviewed: Optional[bool] = None
+    missing_requirement: Optional[str] = None
+
+class ApplicationBulkTarget(BaseModel):
+    """Exactly one of: plain ids, ids with expected versions, or a filter."""
+    ids: Optional[List[int]] = None
+    items: Optional[List[ApplicationVersion]] = None
+    filter: Optional[ApplicationBulkFilter] = None
+
+    @model_validator(mode='after')
+    def validate_single_target(self) -> 'ApplicationBulkTarget':
+        given = [name for name in ("ids", "items", "filter") if getattr(self, name) is not None]
+        if len(given) != 1:
+            raise ValueError("Provide exactly one of ids, items or filter")
+        if self.items is not None and len({item.id for item in self.items}) != len(self.items):
+            raise ValueError("Duplicate application ids in items")
+        return self
+
+class ApplicationBulkStatusUpdate(ApplicationBulkTarget):
+    status: ApplicationStatus
+
+class ApplicationBulkReviewedUpdate(ApplicationBulkTarget):
+    is_reviewed: bool
+
+class ApplicationBulkResult(BaseModel):
+    updated: int
+    ids: List[int]
+    # Already had the requested value
+    unchanged: List[int] = []
+    # Expected version did not match; carries the current version
+    conflicts: List[ApplicationVersion] = []
+    # Missing, or on a job the caller does not own
+    not_found: List[int] = []
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional, Union
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -23,6 +23,12 @@ class JobUpdate(JobBase):
 class JobInDBBase(JobBase):
     id: int
     owner_id: int
+    # Resolved from `location`
+    city: Optional[str] = None
+    state: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    is_remote: bool = False
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -34,3 +40,18 @@ from app.schemas.user import User
 
 class JobResponse(JobInDBBase):
     owner: Optional[User] = None
+
+class FacetCount(BaseModel):
+    # None counts jobs without a value (e.g. a location that names no known place)
+    value: Optional[Union[bool, str]] = None
+    count: int
+
+class JobFacets(BaseModel):
+    job_type: List[FacetCount] = []
+    experience_level: List[FacetCount] = []
+    location: List[FacetCount] = [] # "City, ST", "ST" or "Remote"; usable as the location filter
+    is_active: List[FacetCount] = []
+
+class JobSearchResult(BaseModel):
+    items: List[JobResponse]
+    facets: JobFacets
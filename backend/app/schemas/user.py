@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr, field_validator, model_validator
 from app.models.user import UserRole
 import re
@@ -199,6 +199,20 @@ class User(UserInDBBase):
 class UserInDB(UserInDBBase):
     hashed_password: str
 
+class DuplicateAccounts(BaseModel):
+    similarity: float # estimated Jaccard similarity of the two resumes
+    users: List[User]
+
+class CandidateSkill(BaseModel):
+    skill: str # canonical name, see app/core/skills.py
+    years: Optional[float] = None
+
+class CandidateMatch(BaseModel):
+    user: User
+    titles: List[str] = []
+    employers: List[str] = []
+    skills: List[CandidateSkill] = []
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -0,0 +1,236 @@
+"""
+Production launcher: a supervisor process and a pool of forked uvicorn workers.
+
+Usage (from backend/, as the Dockerfile does):
+    python -m app.server --host 0.0.0.0 --port 8080
+
+    - sizes the pool from the CPUs and memory the container may use (SERVER_WORKERS=0),
+      see app/core/workers.py
+    - preloads: imports app.main and creates the tables once, then forks, so workers
+      share that memory copy-on-write (gc.freeze() keeps the collector from touching,
+      and so copying, the preloaded objects). The SDKs and parsers that are loaded
+      lazily are still pre-warmed by each worker after it starts serving (see
+      app/core/prewarm.py); importing them here would delay the port opening.
+    - recycles each worker after SERVER_MAX_REQUESTS (+ jitter) requests to cap memory
+      creep, and respawns workers that exit or crash (with backoff)
+    - kills and replaces a worker whose heartbeat is older than SERVER_WORKER_TIMEOUT,
+      i.e. whose event loop is stuck
+    - on SIGTERM/SIGINT, forwards SIGTERM: workers stop accepting, finish in-flight
+      requests for up to SERVER_GRACEFUL_TIMEOUT, run the app's lifespan shutdown (which
+      stops the outbox sender and digest flusher) and exit; stragglers are killed after
+      that, inside Cloud Run's 10s shutdown window
+"""
+import argparse
+import asyncio
+import gc
+import os
+import random
+import signal
+import sys
+import time
+from typing import Dict, List, Optional
+
+import uvicorn
+
+from app.core import workers
+from app.core.config import settings
+
+_CHECK_INTERVAL = 0.2
+_KILL_MARGIN_SECONDS = 1.5
+
+
+class WorkerServer(uvicorn.Server):
+    """uvicorn.Server that publishes its state to a slot of the shared worker table."""
+
+    def __init__(self, config: uvicorn.Config, slot: workers.WorkerSlot):
+        super().__init__(config)
+        self.slot = slot
+
+    async def on_tick(self, counter: int) -> bool:
+        self.slot.heartbeat = time.time()
+        self.slot.requests = self.server_state.total_requests
+        self.slot.connections = len(self.server_state.connections)
+        return await super().on_tick(counter)
+
+
+class Supervisor:
+    def __init__(self, app, host: str, port: int, size: int):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.table = workers.WorkerTable(size, settings.SERVER_WORKER_TIMEOUT)
+        self.pids: Dict[int, int] = {}
+        self.respawn_at: Dict[int, float] = {}
+        self.failures: List[int] = [0] * size
+        self.stopping: Optional[float] = None
+        self.socket = None
+
+    def _config(self, max_requests: Optional[int]) -> uvicorn.Config:
+        return uvicorn.Config(
+            self.app,
+            host=self.host,
+            port=self.port,
+            lifespan="on",
+            proxy_headers=True,
+            forwarded_allow_ips="*",
+            limit_max_requests=max_requests,
+            timeout_graceful_shutdown=int(settings.SERVER_GRACEFUL_TIMEOUT),
+        )
+
+    def spawn(self, index: int) -> None:
+        max_requests = None
+        if settings.SERVER_MAX_REQUESTS:
+            max_requests = settings.SERVER_MAX_REQUESTS + random.randint(0, settings.SERVER_MAX_REQUESTS_JITTER)
+        slot = self.table.slots[index]
+        # Unflushed output would otherwise be written twice, once by each process
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid:
+            slot.pid = pid
+            slot.started = slot.heartbeat = time.time()
+            slot.requests = slot.connections = 0
+            slot.max_requests = max_requests or 0
+            self.pids[pid] = index
+            return
+        # Worker: uvicorn installs its own SIGTERM/SIGINT handlers once it serves
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        code = 0
+        try:
+            server = WorkerServer(self._config(max_requests), slot)
+            server.run(sockets=[self.socket])
+            if not server.started:
+                code = 3
+        except BaseException as e:
+            print(f"[SERVER] Worker {index} failed: {e}", file=sys.stderr)
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    def _on_signal(self, signum, frame) -> None:
+        if self.stopping is None:
+            print(f"[SERVER] {signal.Signals(signum).name}: draining {len(self.pids)} workers")
+            self.stopping = time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT + _KILL_MARGIN_SECONDS
+            self._signal_all(signal.SIGTERM)
+
+    def _signal_all(self, signum: int) -> None:
+        for pid in self.pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _reap(self) -> None:
+        while self.pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            index = self.pids.pop(pid, None)
+            if index is None:
+                continue
+            slot = self.table.slots[index]
+            code = os.waitstatus_to_exitcode(status)
+            uptime = time.time() - slot.started
+            slot.pid = 0
+            if self.stopping is not None:
+                continue
+            if code == 0:
+                print(f"[SERVER] Worker {index} (pid {pid}) recycled after {slot.requests} requests")
+                self.failures[index] = 0
+                self.respawn_at[index] = 0
+            else:
+                # Back off if a worker keeps dying right after it starts (bad config, DB down)
+                self.failures[index] = self.failures[index] + 1 if uptime < 30 else 1
+                delay = min(2 ** (self.failures[index] - 1), 30) if self.failures[index] > 1 else 0
+                print(f"[SERVER] Worker {index} (pid {pid}) exited with {code} after {uptime:.0f}s; restarting in {delay}s")
+                self.respawn_at[index] = time.monotonic() + delay
+            slot.restarts += 1
+
+    def _check_heartbeats(self) -> None:
+        now = time.time()
+        for pid, index in self.pids.items():
+            slot = self.table.slots[index]
+            if now - slot.heartbeat > settings.SERVER_WORKER_TIMEOUT:
+                print(f"[SERVER] Worker {index} (pid {pid}) unresponsive for {now - slot.heartbeat:.0f}s; killing it")
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+    def run(self) -> int:
+        self.socket = self._config(None).bind_socket()
+        workers.table = self.table
+        # Everything imported so far is shared with the workers; keep gc from dirtying it
+        gc.collect()
+        gc.freeze()
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+        print(f"[SERVER] Listening on http://{self.host}:{self.port} with {len(self.table)} workers (pid {os.getpid()})")
+        for index in range(len(self.table)):
+            self.spawn(index)
+        while True:
+            time.sleep(_CHECK_INTERVAL)
+            self._reap()
+            if self.stopping is not None:
+                if not self.pids:
+                    print("[SERVER] All workers stopped")
+                    return 0
+                if time.monotonic() > self.stopping:
+                    print(f"[SERVER] Killing {len(self.pids)} workers still running after the grace period")
+                    self._signal_all(signal.SIGKILL)
+                    self.stopping = float("inf")
+                continue
+            self._check_heartbeats()
+            for index, at in list(self.respawn_at.items()):
+                if time.monotonic() >= at:
+                    del self.respawn_at[index]
+                    self.spawn(index)
+
+
+def preload():
+    """Import the app and create the tables before forking."""
+    from app.db.init_db import init_db
+    from app.db.session import engine
+    from app.main import app
+
+    async def create_tables():
+        await init_db(engine)
+        # No pooled connections may cross the fork
+        await engine.dispose()
+
+    if settings.INIT_DB_ON_STARTUP:
+        asyncio.run(create_tables())
+        settings.INIT_DB_ON_STARTUP = False
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Production server: preforked uvicorn workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8080)))
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS, help="0 sizes from CPUs and memory")
+    args = parser.parse_args()
+
+    size = args.workers
+    if size <= 0:
+        cpus, memory = workers.available_cpus(), workers.available_memory()
+        size = workers.worker_count(
+            cpus, memory, settings.SERVER_WORKERS_PER_CPU, settings.SERVER_WORKER_MEMORY_MB, settings.SERVER_MAX_WORKERS
+        )
+        memory_mb = f"{memory // (1024 * 1024)}MB" if memory else "unknown"
+        print(f"[SERVER] {cpus:g} CPUs, {memory_mb} memory: {size} workers")
+    if size > 1 and settings.EVENT_BACKEND == "memory":
+        print("[SERVER] EVENT_BACKEND=memory only delivers events within one worker; use postgres with several")
+
+    app = preload()
+    sys.exit(Supervisor(app, args.host, args.port, size).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,81 @@
 import json
-from typing import Dict, Any, List
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 import io
-import pypdf
-from openai import AsyncOpenAI
+from opentelemetry.trace import SpanKind, get_current_span
+from app.core import metrics, tracing
 from app.core.config import settings
 
+# Provider SDKs and document parsers (openai, google.generativeai, pypdf, docx) are
+# imported on first use; app/core/prewarm.py loads them in the background after startup.
+
+def _llm_attributes(provider: str, model: str) -> Dict[str, Any]:
+    return {"gen_ai.system": provider, "gen_ai.operation.name": "chat", "gen_ai.request.model": model}
+
+
+def _set_usage(span, prompt_tokens, completion_tokens) -> None:
+    if prompt_tokens is not None:
+        span.set_attribute("gen_ai.usage.input_tokens", prompt_tokens)
+    if completion_tokens is not None:
+        span.set_attribute("gen_ai.usage.output_tokens", completion_tokens)
+
+
+_PRICES = {
+    "openai": lambda: (settings.OPENAI_PRICE_PER_MILLION_INPUT, settings.OPENAI_PRICE_PER_MILLION_OUTPUT),
+    "gemini": lambda: (settings.GEMINI_PRICE_PER_MILLION_INPUT, settings.GEMINI_PRICE_PER_MILLION_OUTPUT),
+}
+
+
+class _LLMCall:
+    def __init__(self, span):
+        self.span = span
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+
+    def usage(self, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+        self.prompt_tokens, self.completion_tokens = prompt_tokens, completion_tokens
+        _set_usage(self.span, prompt_tokens, completion_tokens)
+
+
+@contextmanager
+def _llm_call(
+    provider: str,
+    model: str,
+    span_name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    error_outcome: Callable[[Exception], str] = lambda e: "error",
+) -> Iterator[_LLMCall]:
+    """
+    Span, duration, token and cost metrics around one provider call. The body reports
+    token usage with call.usage(); an exception is recorded under error_outcome(e) and
+    re-raised.
+    """
+    started = time.perf_counter()
+    try:
+        with tracing.span(span_name, {**_llm_attributes(provider, model), **(attributes or {})}, SpanKind.CLIENT) as span:
+            call = _LLMCall(span)
+            yield call
+    except Exception as e:
+        metrics.record_llm_call(provider, error_outcome(e), time.perf_counter() - started)
+        raise
+    metrics.record_llm_call(
+        provider, "ok", time.perf_counter() - started,
+        prompt_tokens=call.prompt_tokens,
+        completion_tokens=call.completion_tokens,
+        price_per_million=_PRICES[provider](),
+    )
+
+
+def _fallback_reason(error_msg: str) -> Optional[str]:
+    """Why an OpenAI error should go to the Gemini fallback, or None if it should not."""
+    if "rate limit" in error_msg.lower():
+        return "rate_limit"
+    if "context_length_exceeded" in error_msg or "string too long" in error_msg:
+        return "context_length"
+    return None
+
+
 class AIScreeningService:
     def __init__(self):
         self._client = None
@@ -15,26 +86,78 @@ class AIScreeningService:
             from openai import AsyncOpenAI
             self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         return self._client
+
+    async def _call_openai(
+        self,
+        span_name: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        attributes: Optional[Dict[str, Any]] = None,
+        error_outcome: Callable[[Exception], str] = lambda e: "error",
+    ) -> str:
+        """One instrumented JSON-mode chat completion; returns the message content."""
+        with _llm_call("openai", settings.OPENAI_MODEL, span_name, attributes, error_outcome) as call:
+            response = await self.client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=temperature
+            )
+            usage = getattr(response, "usage", None)
+            call.usage(getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None))
+        return response.choices[0].message.content
     @staticmethod
     def extract_text(file_content: bytes, filename: str) -> str:
         """Extract text from PDF or DOCX file."""
+        file_format = filename.lower().rsplit(".", 1)[-1] if filename.lower().endswith((".pdf", ".docx")) else "other"
+        with tracing.span("resume.extract_text", {"resume.format": file_format, "resume.bytes": len(file_content)}) as span:
+            started = time.perf_counter()
+            text, outcome = AIScreeningService._extract(file_content, filename, file_format)
+            metrics.text_extraction_duration.observe(time.perf_counter() - started, file_format, outcome)
+            span.set_attributes({"resume.chars": len(text), "resume.extraction_outcome": outcome})
+        return text
+
+    @staticmethod
+    def _extract(file_content: bytes, filename: str, file_format: str) -> Tuple[str, str]:
+        """Returns (text, outcome)."""
         text = ""
         try:
-            if filename.lower().endswith('.pdf'):
+            if file_format == "pdf":
+                import pypdf
                 pdf_reader = pypdf.PdfReader(io.BytesIO(file_content))
                 for page in pdf_reader.pages:
                     text += page.extract_text() + "\n"
-            elif filename.lower().endswith('.docx'):
+            elif file_format == "docx":
                 import docx
                 doc = docx.Document(io.BytesIO(file_content))
                 for para in doc.paragraphs:
                     text += para.text + "\n"
             else:
-                return ""
+                return "", "unsupported"
         except Exception as e:
             print(f"Error extracting text from file {filename}: {e}")
-            return ""
-        return text
+            return "", "error"
+        return text, "ok" if text.strip() else "empty"
+
+    @staticmethod
+    def normalize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Coerce the numeric fields of an LLM result to ints so they can be stored in the
+        JSON column and read back by the generated match_count/total_must_haves columns.
+        """
+        normalized = dict(result)
+        for key in ("match_count", "total_must_haves", "score"):
+            if key not in normalized:
+                continue
+            try:
+                normalized[key] = int(normalized[key])
+            except (TypeError, ValueError):
+                normalized[key] = None if key != "score" else 0
+        return normalized
 
     @staticmethod
     async def evaluate_candidate_with_gemini(
@@ -47,6 +170,7 @@ class AIScreeningService:
         import google.generativeai as genai
         
         if not settings.GEMINI_API_KEY:
+            metrics.llm_requests.inc("gemini", "unconfigured")
             return {
                 "match_count": 0,
                 "total_must_haves": 0,
@@ -81,7 +205,10 @@ class AIScreeningService:
             {resume_text}
             """
             
-            response = await model.generate_content_async(prompt)
+            with _llm_call("gemini", settings.GEMINI_MODEL, "llm.gemini.generate") as call:
+                response = await model.generate_content_async(prompt)
+                usage = getattr(response, "usage_metadata", None)
+                call.usage(getattr(usage, "prompt_token_count", None), getattr(usage, "candidates_token_count", None))
             text = response.text.strip()
             # Clean markdown code blocks if present
             if text.startswith("```json"):
@@ -125,7 +252,7 @@ class AIScreeningService:
             "total_must_haves": int, // Total number of must-have requirements identified
             "score": int, // Weighted score 0-100. (70% based on Must-Haves, 30% on Nice-to-Haves)
             "justification": "string", // Brief summary of why they match or don't match
-            "gap_analysis": [ // List of missing or weak requirements
+            "gap_analysis": [ // One entry per requirement
                 {
                     "requirement": "string",
                     "status": "Missing" | "Weak" | "Match",
@@ -149,23 +276,19 @@ class AIScreeningService:
         """
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1
+            content = await self._call_openai(
+                "llm.openai.chat", system_prompt, user_prompt, temperature=0.1,
+                error_outcome=lambda e: "fallback" if _fallback_reason(str(e)) else "error",
             )
-            
-            content = response.choices[0].message.content
             return json.loads(content)
         except Exception as e:
             error_msg = str(e)
             print(f"OpenAI Error: {e}")
             
-            if "context_length_exceeded" in error_msg or "string too long" in error_msg or "rate limit" in error_msg.lower():
+            reason = _fallback_reason(error_msg)
+            if reason is not None:
+                metrics.llm_fallbacks.inc(reason)
+                get_current_span().add_event("llm.fallback", {"from": "openai", "to": "gemini", "reason": reason})
                 print("Switching to Gemini Fallback...")
                 return await AIScreeningService.evaluate_candidate_with_gemini(
                     resume_text, job_title, must_have_requirements, nice_to_have_requirements
@@ -179,4 +302,98 @@ class AIScreeningService:
                 "gap_analysis": []
             }
 
+    async def evaluate_requirements(
+        self,
+        resume_text: str,
+        job_title: str,
+        requirements: List[Tuple[str, str]],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Verdicts for just the given (id, requirement) pairs, in one OpenAI call: a
+        [{"id", "status", "note"}] list, or None if the call failed (the caller then
+        screens in full with evaluate_candidate, which has the Gemini fallback).
+        """
+        if not settings.OPENAI_API_KEY:
+            return None
+
+        system_prompt = """
+        You are an expert technical recruiter. Decide for each listed requirement whether
+        the candidate's resume shows it.
+
+        Output must be a valid JSON object with the following structure:
+        {
+            "verdicts": [ // One entry per requirement, in the given order
+                {
+                    "id": "string", // The requirement's id, e.g. "M2"
+                    "status": "Missing" | "Weak" | "Match",
+                    "note": "string"
+                }
+            ]
+        }
+        """
+        listed = "\n".join(f"{requirement_id}. {text}" for requirement_id, text in requirements)
+        user_prompt = f"""
+        Job Title: {job_title}
+
+        Requirements:
+        {listed}
+
+        Candidate Resume:
+        {resume_text}
+        """
+
+        try:
+            content = await self._call_openai(
+                "llm.openai.evaluate_requirements", system_prompt, user_prompt, temperature=0.1,
+                attributes={"screening.requirements": len(requirements)},
+            )
+            verdicts = json.loads(content).get("verdicts")
+            if not isinstance(verdicts, list):
+                raise ValueError("unexpected verdicts structure")
+            return verdicts
+        except Exception as e:
+            print(f"OpenAI requirement evaluation error: {e}")
+            return None
+
+    @staticmethod
+    def keyword_profile(resume_text: str) -> Dict[str, Any]:
+        """Profile from the skill dictionary alone; no titles or employers."""
+        from app.core.skills import find_skills_with_years
+        return {"skills": find_skills_with_years(resume_text), "titles": [], "employers": []}
+
+    async def extract_profile(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Extract skills (with years of experience), job titles and employers from a
+        resume with OpenAI. Falls back to the skill dictionary when no API key is set
+        or the call fails, so a profile is always produced.
+        """
+        if not settings.OPENAI_API_KEY:
+            return self.keyword_profile(resume_text)
+
+        system_prompt = """
+        You extract structured data from resumes. Do not infer skills that are not stated.
+
+        Output must be a valid JSON object with the following structure:
+        {
+            "skills": [ // Technologies, tools and professional skills, one entry each
+                {
+                    "name": "string", // Short common name, e.g. "Kubernetes", "PostgreSQL", "Python"
+                    "years": number | null // Years of hands-on experience, from dates or statements; null if unclear
+                }
+            ],
+            "titles": ["string"], // Job titles held, most recent first
+            "employers": ["string"] // Employers, most recent first
+        }
+        """
+
+        try:
+            content = await self._call_openai("llm.openai.extract_profile", system_prompt, f"Resume:\n{resume_text}", temperature=0)
+            profile = json.loads(content)
+            if not isinstance(profile, dict) or not isinstance(profile.get("skills"), list):
+                raise ValueError("unexpected profile structure")
+            return profile
+        except Exception as e:
+            print(f"OpenAI profile extraction error: {e}")
+            return self.keyword_profile(resume_text)
+
 ai_screening_service = AIScreeningService()
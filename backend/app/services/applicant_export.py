@@ -0,0 +1,107 @@
+"""
+Column registry for the streaming applicants export (GET /jobs/{id}/applications/export).
+
+Each export column names the SQL columns it needs and how to turn a result row into
+a cell value, so a request selects only what its chosen columns use. Gap-analysis
+columns flatten the AI result's gap_analysis list into one cell each.
+"""
+import csv
+import io
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.xlsx import escape_formula
+from app.models.application import Application
+from app.models.user import User
+
+
+class ExportColumn(NamedTuple):
+    sources: Tuple[Any, ...]
+    extract: Callable[[Any], Any]
+
+
+def _field(column: Any) -> ExportColumn:
+    key = column.key
+    return ExportColumn((column,), lambda row: getattr(row, key))
+
+
+def _analysis(row: Any) -> Dict[str, Any]:
+    return row.ai_analysis if isinstance(row.ai_analysis, dict) else {}
+
+
+def _gap(status: Optional[str]) -> ExportColumn:
+    """Requirements with the given gap status (all requirements with theirs if None), "; "-joined."""
+    def extract(row: Any) -> str:
+        items = [item for item in _analysis(row).get("gap_analysis") or [] if isinstance(item, dict)]
+        if status is None:
+            return "; ".join(f"{item.get('requirement', '')}: {item.get('status', '')}" for item in items)
+        return "; ".join(str(item.get("requirement", "")) for item in items if item.get("status") == status)
+    return ExportColumn((Application.ai_analysis,), extract)
+
+
+def _full_name(row: Any) -> str:
+    return " ".join(part for part in (row.first_name, row.last_name) if part)
+
+
+COLUMNS: Dict[str, ExportColumn] = {
+    "application_id": ExportColumn((Application.id,), lambda row: row.id),
+    "name": ExportColumn((User.first_name, User.last_name), _full_name),
+    "email": _field(User.email),
+    "phone_number": _field(User.phone_number),
+    "city": _field(User.city),
+    "state": _field(User.state),
+    "years_of_experience": _field(User.years_of_experience),
+    "work_permit_type": _field(User.work_permit_type),
+    "linkedin_url": _field(User.linkedin_url),
+    "status": ExportColumn((Application.status,), lambda row: row.status.value if row.status else None),
+    "ai_score": _field(Application.ai_score),
+    "match_count": _field(Application.match_count),
+    "total_must_haves": _field(Application.total_must_haves),
+    "is_reviewed": _field(Application.is_reviewed),
+    "applied_at": ExportColumn((Application.created_at,), lambda row: row.created_at),
+    "resume_path": _field(Application.resume_path),
+    "justification": ExportColumn((Application.ai_analysis,), lambda row: _analysis(row).get("justification")),
+    "gap_missing": _gap("Missing"),
+    "gap_weak": _gap("Weak"),
+    "gap_matched": _gap("Match"),
+    "gap_analysis": _gap(None),
+}
+
+DEFAULT_COLUMNS = [
+    "name", "email", "status", "ai_score", "match_count", "total_must_haves",
+    "is_reviewed", "applied_at", "gap_missing",
+]
+
+
+def parse_columns(columns: Optional[str]) -> Tuple[List[str], List[str]]:
+    """Split a comma-separated `columns` parameter. Returns (names, unknown names)."""
+    if not columns:
+        return list(DEFAULT_COLUMNS), []
+    names = [name.strip() for name in columns.split(",") if name.strip()]
+    return names, [name for name in names if name not in COLUMNS]
+
+
+def select_sources(names: Sequence[str]) -> List[Any]:
+    """The distinct SQL columns needed by `names`, in first-use order."""
+    sources: Dict[Any, None] = {}
+    for name in names:
+        for source in COLUMNS[name].sources:
+            sources.setdefault(source, None)
+    return list(sources)
+
+
+def row_values(names: Sequence[str], row: Any) -> List[Any]:
+    return [COLUMNS[name].extract(row) for name in names]
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return escape_formula(value) if isinstance(value, str) else value
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
@@ -0,0 +1,52 @@
+"""
+SQL predicates over applications shared by the job listing, export and bulk update endpoints.
+"""
+from typing import Any, List
+
+from sqlalchemy import exists, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.application import Application
+from app.models.job import Job
+from app.models.user import User, UserRole
+from app.schemas.application import ApplicationBulkFilter
+
+
+def missing_requirement_clause(dialect_name: str, requirement: str):
+    """
+    SQL predicate matching applications whose gap analysis lists `requirement` as Missing.
+    Uses JSONB containment on Postgres (served by the GIN index), json_each on SQLite.
+    """
+    if dialect_name == "postgresql":
+        gap_analysis = type_coerce(Application.ai_analysis, JSONB)["gap_analysis"]
+        return gap_analysis.contains([{"requirement": requirement, "status": "Missing"}])
+
+    gaps = func.json_each(Application.ai_analysis, "$.gap_analysis").table_valued("value")
+    return exists(
+        select(1).select_from(gaps).where(
+            func.json_extract(gaps.c.value, "$.requirement") == requirement,
+            func.json_extract(gaps.c.value, "$.status") == "Missing",
+        )
+    )
+
+
+def manageable_by(user: User) -> List[Any]:
+    """Predicates limiting applications to those `user` may change (clients: their own jobs)."""
+    if user.role == UserRole.ADMIN:
+        return []
+    return [Application.job_id.in_(select(Job.id).where(Job.owner_id == user.id))]
+
+
+def bulk_filter_clauses(dialect_name: str, bulk_filter: ApplicationBulkFilter) -> List[Any]:
+    clauses = [Application.job_id == bulk_filter.job_id]
+    if bulk_filter.status:
+        clauses.append(Application.status.in_(bulk_filter.status))
+    if bulk_filter.ai_score_lt is not None:
+        clauses.append(Application.ai_score < bulk_filter.ai_score_lt)
+    if bulk_filter.ai_score_gte is not None:
+        clauses.append(Application.ai_score >= bulk_filter.ai_score_gte)
+    if bulk_filter.is_reviewed is not None:
+        clauses.append(Application.is_reviewed == bulk_filter.is_reviewed)
+    if bulk_filter.missing_requirement:
+        clauses.append(missing_requirement_clause(dialect_name, bulk_filter.missing_requirement))
+    return clauses
@@ -0,0 +1,214 @@
+"""
+Structured candidate profiles and skill search.
+
+Resume content used to exist only inside the screening prompt and the ai_analysis
+blob, so "candidates with Kubernetes and 5+ years" could not be answered without
+re-reading every resume. Each distinct resume is now extracted once into:
+
+    - candidateprofile: one row per candidate with the job titles and employers, and
+      the content hash of the resume they came from (a re-upload of the same text is
+      not extracted again)
+    - candidateskill: one row per candidate and skill, the skill under its canonical
+      name (app/core/skills.py), with the years of experience when the resume says
+
+create_application starts the extraction (AIScreeningService.extract_profile) next to
+the screening call, so it adds no latency. Skill search is then one SQL query: the
+first requested skill is read from the (skill, years, user_id) index, most years
+first, each other skill is a primary-key lookup on (user_id, skill), and the scan
+stops as soon as a page of candidates matched. Recruiters list the skill they care
+about most first; it decides the ranking.
+
+`python -m app.services.candidate_profiles` extracts profiles for candidates who
+applied before this existed, from their latest stored resume.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.skills import MAX_YEARS, normalize_skill
+from app.models.candidate_profile import CandidateProfile, CandidateSkill
+from app.models.user import User, UserRole
+from app.services.resume_dedup import content_hash
+
+MAX_SKILLS = 100
+MAX_LIST_ITEMS = 20
+MAX_SEARCH_SKILLS = 10
+
+
+def _years(value: Any) -> Optional[float]:
+    try:
+        years = round(float(value), 1)
+    except (TypeError, ValueError):
+        return None
+    return years if 0 <= years <= MAX_YEARS else None
+
+
+def _strings(values: Any) -> List[str]:
+    if not isinstance(values, list):
+        return []
+    cleaned = []
+    for value in values:
+        if isinstance(value, str) and value.strip() and value.strip() not in cleaned:
+            cleaned.append(value.strip()[:200])
+    return cleaned[:MAX_LIST_ITEMS]
+
+
+def clean_skills(raw_skills: Any) -> Dict[str, Optional[float]]:
+    """Canonical skill name -> years (the largest stated), from LLM or dictionary output."""
+    skills: Dict[str, Optional[float]] = {}
+    for entry in raw_skills if isinstance(raw_skills, list) else []:
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+            continue
+        skill = normalize_skill(entry["name"])
+        if not skill:
+            continue
+        years = _years(entry.get("years"))
+        if skill not in skills:
+            if len(skills) >= MAX_SKILLS:
+                continue
+            skills[skill] = years
+        elif years is not None and (skills[skill] is None or years > skills[skill]):
+            skills[skill] = years
+    return skills
+
+
+async def save_profile(
+    db: AsyncSession,
+    user_id: int,
+    resume_hash: str,
+    extracted: Dict[str, Any],
+    profile: Optional[CandidateProfile] = None,
+) -> CandidateProfile:
+    """Replace the candidate's profile and skill rows. `profile` is the existing row, if any. Does not commit."""
+    titles, employers = _strings(extracted.get("titles")), _strings(extracted.get("employers"))
+    if profile is None:
+        profile = CandidateProfile(user_id=user_id, content_hash=resume_hash, titles=titles, employers=employers)
+        db.add(profile)
+    else:
+        profile.content_hash, profile.titles, profile.employers = resume_hash, titles, employers
+    # The skill rows reference the profile row
+    await db.flush()
+    await db.execute(delete(CandidateSkill).where(CandidateSkill.user_id == user_id))
+    skills = clean_skills(extracted.get("skills"))
+    if skills:
+        await db.execute(
+            insert(CandidateSkill),
+            [{"user_id": user_id, "skill": skill, "years": years} for skill, years in skills.items()],
+        )
+    return profile
+
+
+def parse_skill_filter(value: str) -> Tuple[str, Optional[float]]:
+    """"kubernetes:5" -> ("kubernetes", 5.0); "K8s" -> ("kubernetes", None)."""
+    name, separator, years = value.rpartition(":")
+    if not separator:
+        name, years = value, ""
+    skill = normalize_skill(name)
+    if not skill:
+        raise ValueError(f"Invalid skill filter: {value!r}")
+    if not years.strip():
+        return skill, None
+    parsed = _years(years)
+    if parsed is None:
+        raise ValueError(f"Invalid years in skill filter: {value!r}")
+    return skill, parsed
+
+
+async def search_candidates(
+    db: AsyncSession,
+    requirements: List[Tuple[str, Optional[float]]],
+    user_columns: List[Any],
+    skip: int = 0,
+    limit: int = 50,
+) -> Tuple[List[Any], Dict[int, List[Dict[str, Any]]]]:
+    """
+    Active candidates that have every (skill, minimum years) in `requirements`, ranked
+    by their years in the first skill. Returns the rows (`user_columns`, then titles
+    and employers) and each returned candidate's skills. Two queries.
+    """
+    wanted: Dict[str, Optional[float]] = {}
+    for skill, years in requirements:
+        if skill not in wanted or (years or 0) > (wanted[skill] or 0):
+            wanted[skill] = years
+    (primary, primary_years), *others = wanted.items()
+
+    stmt = (
+        select(*user_columns, CandidateProfile.titles, CandidateProfile.employers)
+        .select_from(CandidateSkill)
+        .join(User, User.id == CandidateSkill.user_id)
+        .join(CandidateProfile, CandidateProfile.user_id == CandidateSkill.user_id)
+        .where(CandidateSkill.skill == primary, User.is_active == True, User.role == UserRole.CANDIDATE)
+    )
+    if primary_years:
+        stmt = stmt.where(CandidateSkill.years >= primary_years)
+    for skill, years in others:
+        # Primary key lookups on (user_id, skill) for each candidate the first skill yields
+        other = aliased(CandidateSkill)
+        condition = exists().where(other.user_id == CandidateSkill.user_id, other.skill == skill)
+        stmt = stmt.where(condition.where(other.years >= years) if years else condition)
+    # Walks the (skill, years, user_id) index backwards and stops once the page is full
+    result = await db.execute(
+        stmt.order_by(CandidateSkill.years.desc().nulls_last(), CandidateSkill.user_id.desc()).offset(skip).limit(limit)
+    )
+    rows = result.all()
+    skills: Dict[int, List[Dict[str, Any]]] = {}
+    if rows:
+        user_ids = [row.id for row in rows]
+        result = await db.execute(
+            select(CandidateSkill.user_id, CandidateSkill.skill, CandidateSkill.years)
+            .where(CandidateSkill.user_id.in_(user_ids))
+            .order_by(CandidateSkill.user_id, CandidateSkill.years.desc().nulls_last(), CandidateSkill.skill)
+        )
+        for user_id, skill, years in result.all():
+            skills.setdefault(user_id, []).append({"skill": skill, "years": years})
+    return rows, skills
+
+
+async def backfill(batch_size: int = 50) -> int:
+    """Extract profiles for candidates without one, from their latest stored resume."""
+    import os
+
+    from app.db.session import AsyncSessionLocal
+    from app.models.application import Application
+    from app.services.ai_screening import AIScreeningService, ai_screening_service
+
+    extracted = 0
+    last_user_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Application.user_id, Application.resume_path)
+                .where(
+                    Application.user_id > last_user_id,
+                    Application.user_id.not_in(select(CandidateProfile.user_id)),
+                )
+                .order_by(Application.user_id, Application.created_at.desc())
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                return extracted
+            done = set()
+            for user_id, resume_path in rows:
+                last_user_id = user_id
+                if user_id in done or not resume_path or not os.path.exists(resume_path):
+                    continue
+                with open(resume_path, "rb") as f:
+                    text = AIScreeningService.extract_text(f.read(), resume_path)
+                if not text.strip():
+                    continue
+                await save_profile(db, user_id, content_hash(text), await ai_screening_service.extract_profile(text))
+                done.add(user_id)
+                extracted += 1
+            await db.commit()
+        print(f"[PROFILES] Extracted {extracted} candidate profiles so far")
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    print(f"[PROFILES] Extracted {asyncio.run(backfill())} candidate profiles")
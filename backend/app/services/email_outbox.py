@@ -0,0 +1,215 @@
+"""
+Background delivery of queued emails (the EmailOutbox table).
+
+Request handlers only insert outbox rows in their own transaction (see
+app/core/email.py), so their latency does not depend on the mail server. This
+sender drains due rows in batches over a small pool of persistent, already
+authenticated aiosmtplib connections, retries failures with exponential backoff
+and marks rows DEAD after EMAIL_MAX_ATTEMPTS. Bodies can hold secrets (temporary
+passwords), so they are cleared once a row is SENT or DEAD; the row stays as a record.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from typing import TYPE_CHECKING, List, Optional
+
+from opentelemetry.trace import SpanKind
+from sqlalchemy import select
+
+from app.core import tracing
+from app.core.config import settings
+from app.models.email_outbox import EmailOutbox, EmailStatus
+
+if TYPE_CHECKING:
+    import aiosmtplib
+
+
+class SMTPPool:
+    """Up to `size` persistent SMTP connections, reconnected lazily when dropped."""
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: bool = True,
+        size: int = 2,
+        timeout: float = 30,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(None)
+
+    async def _connect(self) -> "aiosmtplib.SMTP":
+        # Imported here so workers without SMTP configured never load it
+        import aiosmtplib
+
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname, port=self.port, start_tls=self.start_tls, timeout=self.timeout
+        )
+        await smtp.connect()
+        if self.username and self.password:
+            await smtp.login(self.username, self.password)
+        return smtp
+
+    async def send(self, message: EmailMessage) -> None:
+        smtp = await self._idle.get()
+        try:
+            if smtp is None or not smtp.is_connected:
+                smtp = await self._connect()
+            await smtp.send_message(message)
+        except Exception:
+            if smtp is not None and smtp.is_connected:
+                smtp.close()
+            smtp = None
+            raise
+        finally:
+            self._idle.put_nowait(smtp)
+
+    async def close(self) -> None:
+        import aiosmtplib
+
+        while not self._idle.empty():
+            smtp = self._idle.get_nowait()
+            if smtp is not None and smtp.is_connected:
+                try:
+                    await smtp.quit()
+                except aiosmtplib.SMTPException:
+                    smtp.close()
+
+
+def build_message(email: EmailOutbox, from_email: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = email.subject
+    message["From"] = from_email
+    message["To"] = email.to_email
+    message.set_content(email.text_body)
+    if email.html_body:
+        message.add_alternative(email.html_body, subtype="html")
+    return message
+
+
+def discard_bodies(email: EmailOutbox) -> None:
+    """Drop the message text of a row that will not be sent again."""
+    email.text_body = ""
+    email.html_body = None
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+class OutboxSender:
+    def __init__(self, session_factory, pool: SMTPPool, from_email: str, batch_size: int = 50, poll_interval: float = 5):
+        self.session_factory = session_factory
+        self.pool = pool
+        self.from_email = from_email
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def wake(self) -> None:
+        """Drain now instead of waiting for the next poll (call after committing new rows)."""
+        self._wakeup.set()
+
+    async def _deliver(self, email: EmailOutbox) -> None:
+        try:
+            attributes = {"email.outbox_id": email.id, "email.attempt": email.attempts + 1, "server.address": self.pool.hostname}
+            with tracing.span("email.send", attributes, SpanKind.CLIENT):
+                await self.pool.send(build_message(email, self.from_email))
+        except Exception as e:
+            email.attempts += 1
+            email.last_error = str(e)[:1000]
+            if email.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                email.status = EmailStatus.DEAD
+                discard_bodies(email)
+                print(f"[EMAIL ERROR] Giving up on email {email.id} to {email.to_email}: {e}")
+            else:
+                email.next_attempt_at = datetime.now(timezone.utc) + retry_delay(email.attempts)
+            return
+        email.attempts += 1
+        email.status = EmailStatus.SENT
+        email.sent_at = datetime.now(timezone.utc)
+        email.last_error = None
+        discard_bodies(email)
+
+    async def drain_once(self) -> int:
+        """Send one batch of due emails. Returns how many rows were processed."""
+        async with self.session_factory() as db:
+            stmt = (
+                select(EmailOutbox)
+                .where(EmailOutbox.status == EmailStatus.PENDING, EmailOutbox.next_attempt_at <= datetime.now(timezone.utc))
+                .order_by(EmailOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(stmt)
+            emails: List[EmailOutbox] = list(result.scalars().all())
+            if not emails:
+                return 0
+            with tracing.span("email.outbox.drain", {"email.batch_size": len(emails)}):
+                await asyncio.gather(*(self._deliver(email) for email in emails))
+                await db.commit()
+            return len(emails)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                processed = await self.drain_once()
+            except Exception as e:
+                print(f"[EMAIL ERROR] Outbox drain failed: {e}")
+                processed = 0
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.pool.close()
+
+
+outbox_sender: Optional[OutboxSender] = None
+
+
+def create_outbox_sender(session_factory) -> OutboxSender:
+    pool = SMTPPool(
+        settings.SMTP_HOST,
+        settings.SMTP_PORT,
+        username=settings.SMTP_USER,
+        password=settings.SMTP_PASSWORD,
+        start_tls=settings.SMTP_STARTTLS,
+        size=settings.EMAIL_POOL_SIZE,
+    )
+    return OutboxSender(
+        session_factory,
+        pool,
+        from_email=settings.SMTP_FROM_EMAIL or settings.SMTP_USER,
+        batch_size=settings.EMAIL_BATCH_SIZE,
+        poll_interval=settings.EMAIL_POLL_SECONDS,
+    )
+
+
+def wake_outbox_sender() -> None:
+    if outbox_sender is not None:
+        outbox_sender.wake()
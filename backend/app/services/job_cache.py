@@ -0,0 +1,137 @@
+"""
+Cached job reads.
+
+read_jobs pages are cached per role scope and normalized filter set: every candidate
+sees the same active jobs, so all candidate dashboards share entries; a client's
+entries cover their own jobs; admins share theirs. Single jobs are cached by id for
+read_job. Writes (create_application included) read jobs from the database, since a
+copy in another worker may predate the latest change.
+
+Entries are tagged with their scope ("list:candidate", "list:client:7",
+"list:admin") or job ("job:12"), plus "jobs" on all of them. A job write invalidates
+exactly what it can change: its owner's and the admin lists, the candidate lists
+when the job was or is active, and the job itself. An owner's profile edit changes
+the embedded owner in any of their jobs, so it drops everything.
+
+Invalidations also drop read_job's ETags from job_versions (app/core/http_cache.py),
+in every worker the event broker reaches, so a 304 is not answered from a stale tag.
+
+See app/core/query_cache.py for the tiers, coalescing and early refresh.
+"""
+import hashlib
+from typing import Any, Dict, Iterable, Optional
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.core.events import event_broker
+from app.core.http_cache import job_etag, job_versions
+from app.core.query_cache import QueryCache, create_shared_backend
+from app.core.serialization import RowLayout, serialize_model
+from app.models.job import Job
+from app.models.user import User, UserRole
+from app.schemas.job import JobResponse
+from app.schemas.user import User as UserSchema
+
+ALL_JOBS = "jobs"
+
+job_cache = QueryCache(
+    "jobs",
+    size=settings.JOB_CACHE_SIZE,
+    ttl=settings.JOB_CACHE_TTL_SECONDS,
+    local_ttl=settings.JOB_CACHE_LOCAL_TTL_SECONDS,
+    beta=settings.JOB_CACHE_EARLY_REFRESH_BETA,
+    shared=create_shared_backend(settings.JOB_CACHE_BACKEND, settings.JOB_CACHE_REDIS_URL),
+    broker=event_broker,
+    enabled=settings.JOB_CACHE_ENABLED,
+)
+
+
+def forget_etags(tags: Iterable[str]) -> None:
+    """Drop the job_versions entries of invalidated jobs ("jobs": all of them)."""
+    for tag in tags:
+        if tag == ALL_JOBS:
+            job_versions.clear()
+            return
+        if tag.startswith("job:"):
+            job_versions.discard(int(tag[len("job:"):]))
+
+
+def _on_invalidation(event: Dict[str, Any]) -> None:
+    # Relayed from other workers (with the job cache off there are none); after a resync, forget everything
+    forget_etags([ALL_JOBS] if event.get("type") == "resync" else event.get("tags", ()))
+
+
+event_broker.add_listener(job_cache.topic, _on_invalidation)
+
+
+def scope_of(user: User) -> str:
+    """Which job lists `user` sees: "candidate" (all active jobs), "client:<id>" (their own) or "admin"."""
+    if user.role == UserRole.CANDIDATE:
+        return "candidate"
+    if user.role == UserRole.CLIENT:
+        return f"client:{user.id}"
+    return "admin"
+
+
+def list_key(scope: str, **filters: Any) -> str:
+    """Key of a read_jobs page; `filters` must already be normalized (None for "not given")."""
+    digest = hashlib.blake2b(orjson.dumps(filters, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+    return f"list:{scope}:{digest}"
+
+
+def list_tags(scope: str) -> tuple:
+    return (ALL_JOBS, f"list:{scope}")
+
+
+def job_tags(job_id: int) -> tuple:
+    return (ALL_JOBS, f"job:{job_id}")
+
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[Dict[str, Any]]:
+    """
+    {"body": JobResponse JSON, "etag": its ETag} for the job, or None if there is
+    none. A missing id is cached too; creating that job invalidates it.
+    """
+    async def load() -> Optional[Dict[str, Any]]:
+        owner = aliased(User)
+        layout = RowLayout(Job, JobResponse, owner=RowLayout(owner, UserSchema))
+        result = await db.execute(
+            select(*layout.columns, Job.version)
+            .select_from(Job)
+            .outerjoin(owner, Job.owner_id == owner.id)
+            .where(Job.id == job_id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        body = serialize_model(JobResponse, layout.build(row)).body.decode()
+        return {"body": body, "etag": job_etag(job_id, row[-1], body)}
+
+    return await job_cache.get_or_load(f"job:{job_id}", job_tags(job_id), load)
+
+
+async def jobs_changed(owner_id: Optional[int], *, active: bool, job_ids: Iterable[int] = ()) -> None:
+    """
+    Invalidate after jobs `job_ids` of `owner_id` were created, updated or deleted.
+    `active`: whether any of them was active before or after the write. New ids must
+    be included too, since lookups of ids that didn't exist yet are cached.
+    """
+    tags = ["list:admin"]
+    if owner_id is not None:
+        tags.append(f"list:client:{owner_id}")
+    if active:
+        tags.append("list:candidate")
+    tags.extend(f"job:{job_id}" for job_id in job_ids)
+    await job_cache.invalidate(tags)
+    forget_etags(tags)
+
+
+async def owner_changed(user: User) -> None:
+    """Invalidate after a profile change of a user whose jobs embed them as owner."""
+    if user.role != UserRole.CANDIDATE:
+        await job_cache.invalidate([ALL_JOBS])
+        forget_etags([ALL_JOBS])
@@ -0,0 +1,128 @@
+"""
+Facet counts for job lists.
+
+The job board shows, next to the results, how many of the filtered jobs there are per
+job type, experience level, location and active status. All four come from one
+grouped query over the same filtered statement read_jobs pages through: GROUPING SETS
+on Postgres (one scan), a UNION ALL of four GROUP BYs elsewhere.
+
+Unfiltered lists (the candidate board, a client's own jobs, the admin list) are what
+almost every dashboard load asks for, so their facets are cached per role scope. The
+cache key includes the version read_jobs already computes for its ETag (count, max id,
+version sum and last change of the filtered set), so any job insert, update or delete,
+from any worker, makes the next request miss and recompute; no entry can be stale.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, literal, null, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.job import Job
+
+FACETS = ("job_type", "experience_level", "location", "is_active")
+# Largest facet lists (locations) are cut to the most common values
+MAX_FACET_VALUES = 50
+
+Facets = Dict[str, List[Dict[str, Any]]]
+
+_cache: "OrderedDict[Tuple[Any, ...], Facets]" = OrderedDict()
+
+
+def location_label(state: Optional[str], city: Optional[str], is_remote: Optional[bool]) -> Optional[str]:
+    """The location filter value that selects a group: "Austin, TX", "TX", "Remote" or None."""
+    if city:
+        return f"{city}, {state}"
+    if state:
+        return state
+    return "Remote" if is_remote else None
+
+
+def _grouped_rows_postgresql(filtered: Select) -> Select:
+    # grouping() has a bit set for each argument that is not part of the row's grouping set
+    mask = func.grouping(Job.job_type, Job.experience_level, Job.state, Job.is_active)
+    return filtered.with_only_columns(
+        mask, Job.job_type, Job.experience_level, Job.state, Job.city, Job.is_remote, Job.is_active, func.count()
+    ).group_by(
+        func.grouping_sets(
+            tuple_(Job.job_type),
+            tuple_(Job.experience_level),
+            tuple_(Job.state, Job.city, Job.is_remote),
+            tuple_(Job.is_active),
+        )
+    )
+
+
+# Grouping set of each grouping() mask, for the Postgres query
+_MASKS = {0b0111: "job_type", 0b1011: "experience_level", 0b1101: "location", 0b1110: "is_active"}
+
+
+def _grouped_rows_union(filtered: Select) -> Select:
+    def facet(name: str, *columns: Any) -> Select:
+        padded = list(columns) + [null()] * (3 - len(columns))
+        return filtered.with_only_columns(literal(name), *padded, func.count()).group_by(*columns)
+
+    return union_all(
+        facet("job_type", Job.job_type),
+        facet("experience_level", Job.experience_level),
+        facet("location", Job.state, Job.city, Job.is_remote),
+        facet("is_active", Job.is_active),
+    )
+
+
+async def compute_facets(db: AsyncSession, filtered: Select) -> Facets:
+    """Facet counts over the rows `filtered` (read_jobs' statement, before paging) selects. One query."""
+    counts: Dict[str, Dict[Any, int]] = {name: {} for name in FACETS}
+    if db.get_bind().dialect.name == "postgresql":
+        result = await db.execute(_grouped_rows_postgresql(filtered))
+        for mask, job_type, experience_level, state, city, is_remote, is_active, count in result.all():
+            name = _MASKS[mask]
+            value = {
+                "job_type": job_type,
+                "experience_level": experience_level,
+                "location": location_label(state, city, is_remote),
+                "is_active": is_active,
+            }[name]
+            counts[name][value] = counts[name].get(value, 0) + count
+    else:
+        result = await db.execute(_grouped_rows_union(filtered))
+        for name, first, second, third, count in result.all():
+            value = location_label(first, second, bool(third)) if name == "location" else first
+            if name == "is_active" and value is not None:
+                value = bool(value)
+            counts[name][value] = counts[name].get(value, 0) + count
+    # Most common first; ties in a stable order
+    return {
+        name: [
+            {"value": value, "count": count}
+            for value, count in sorted(values.items(), key=lambda item: (-item[1], str(item[0])))[:MAX_FACET_VALUES]
+        ]
+        for name, values in counts.items()
+    }
+
+
+async def job_facets(db: AsyncSession, filtered: Select, cache_key: Optional[Tuple[Any, ...]] = None) -> Facets:
+    """
+    compute_facets, cached under `cache_key` when one is given. Callers pass one only
+    for unfiltered lists, and it must include the version of the filtered set.
+    """
+    if cache_key is None:
+        return await compute_facets(db, filtered)
+    facets = _cache.get(cache_key)
+    if facets is not None:
+        _cache.move_to_end(cache_key)
+        metrics.job_facet_cache.inc("hit")
+        return facets
+    metrics.job_facet_cache.inc("miss")
+    facets = await compute_facets(db, filtered)
+    _cache[cache_key] = facets
+    while len(_cache) > settings.JOB_FACET_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return facets
+
+
+def clear_cache() -> None:
+    _cache.clear()
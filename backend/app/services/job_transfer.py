@@ -0,0 +1,140 @@
+"""
+Streaming bulk import and export of jobs as CSV or NDJSON.
+
+Import parses the request body incrementally, so a large upload is never held in
+memory. Records are yielded one at a time and the endpoint validates and inserts
+them in batches. Export turns server-side cursor partitions into encoded chunks.
+"""
+import codecs
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+from pydantic import ValidationError
+
+from app.schemas.job import JobCreate
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+CONTENT_TYPES = {
+    "text/csv": CSV,
+    "application/csv": CSV,
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+}
+
+MEDIA_TYPES = {CSV: "text/csv; charset=utf-8", NDJSON: "application/x-ndjson"}
+
+JOB_FIELDS = list(JobCreate.model_fields)
+EXPORT_FIELDS = ["id", "owner_id", *JOB_FIELDS, "created_at", "updated_at"]
+
+# (row number, parsed record or None, parse error or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def import_format(content_type: Optional[str]) -> Optional[str]:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return CONTENT_TYPES.get(media_type)
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode byte chunks into complete lines (line endings kept)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        text = pending + decoder.decode(chunk)
+        lines = text.splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    row = 0
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield row, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Each line must be a JSON object"
+        else:
+            yield row, record, None
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """CSV with a header row. Quoted fields may span lines (and chunk boundaries)."""
+    header: Optional[List[str]] = None
+    buffer = ""
+    row = 0
+    async for line in _lines(chunks):
+        buffer += line
+        # An odd number of quotes means a quoted field continues on the next line
+        if buffer.count('"') % 2:
+            continue
+        record_text, buffer = buffer, ""
+        if not record_text.strip():
+            continue
+        values = next(csv.reader([record_text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) > len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells are treated as missing so schema defaults apply
+        yield row, {name: value for name, value in zip(header, values) if value != ""}, None
+    if buffer.strip():
+        yield row + 1, None, "Unterminated quoted field"
+
+
+def iter_records(fmt: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    return iter_csv_records(chunks) if fmt == CSV else iter_ndjson_records(chunks)
+
+
+def validate_record(record: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, str]]]:
+    """Validate against JobCreate. Returns (column values, []) or (None, field errors)."""
+    try:
+        job_in = JobCreate.model_validate(record)
+    except ValidationError as e:
+        return None, [
+            {"field": ".".join(str(part) for part in error["loc"]), "message": error["msg"]}
+            for error in e.errors()
+        ]
+    return job_in.model_dump(), []
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_rows(fmt: str, rows: Iterable[Any]) -> bytes:
+    """Encode result rows (with EXPORT_FIELDS columns) as one CSV or NDJSON chunk."""
+    if fmt == NDJSON:
+        return b"".join(orjson.dumps(dict(row._mapping)) + b"\n" for row in rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    return buffer.getvalue().encode()
@@ -0,0 +1,113 @@
+"""
+Normalized job and candidate locations, and the location filters built on them.
+
+Jobs keep the location text the client typed; next to it they store the place it
+resolves to (app/core/locations.py): canonical city and state, coordinates, geohash
+and a remote flag. Candidates store the coordinates and geohash of their city and
+state, and the canonical spelling of both when the city is known.
+
+read_jobs filters on these columns: a location that resolves to a city is an equality
+match on the (state, city) index, "within N miles" is a few range scans on the geohash
+index, and only text that names no known place falls back to a substring match.
+
+`python -m app.services.locations` fills the columns for jobs and users created before
+they existed, or after the gazetteer changed.
+"""
+import math
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.locations import MILES_PER_DEGREE, Place, geohash_ranges, normalize_location
+from app.models.job import Job
+from app.models.user import User
+
+
+def job_location_fields(location: Optional[str]) -> Dict[str, Any]:
+    """Column values for a job with this location text."""
+    place = normalize_location(location) or Place()
+    return {
+        "city": place.city,
+        "state": place.state,
+        "latitude": place.latitude,
+        "longitude": place.longitude,
+        "geohash": place.geohash,
+        "is_remote": place.remote,
+    }
+
+
+def user_location_fields(city: Optional[str], state: Optional[str]) -> Dict[str, Any]:
+    """Column values for a user living in `city`, `state`. Unknown cities are kept as given, without coordinates."""
+    place = normalize_location(", ".join(part for part in (city, state) if part)) if city else None
+    if place is None or place.city is None:
+        return {"city": city, "state": state, "latitude": None, "longitude": None, "geohash": None}
+    return {
+        "city": place.city,
+        "state": place.state,
+        "latitude": place.latitude,
+        "longitude": place.longitude,
+        "geohash": place.geohash,
+    }
+
+
+def matches_place(model: Any, place: Place) -> ColumnElement:
+    """Rows of `model` (Job) in the same city, the same state, or remote, as specific as `place` is."""
+    if place.city:
+        return and_(model.state == place.state, model.city == place.city)
+    if place.state:
+        return model.state == place.state
+    return model.is_remote == True
+
+
+def within_radius(model: Any, place: Place, miles: float) -> ColumnElement:
+    """
+    Rows of `model` (Job or User) within `miles` of `place`, which must have coordinates.
+    The geohash ranges narrow the rows to the bounding box through the index; the
+    distance check (equirectangular, well under 1% off at these radii) drops its corners.
+    """
+    cells = or_(*(and_(model.geohash >= low, model.geohash < high) for low, high in geohash_ranges(place.latitude, place.longitude, miles)))
+    scale = math.cos(math.radians(place.latitude))
+    dy = model.latitude - place.latitude
+    dx = (model.longitude - place.longitude) * scale
+    return and_(cells, dy * dy + dx * dx <= (miles / MILES_PER_DEGREE) ** 2)
+
+
+async def _backfill_table(model: Any, text_columns: tuple, fields: Any, batch_size: int) -> int:
+    from app.db.session import AsyncSessionLocal
+
+    updated = 0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(model.id, *text_columns).where(model.id > last_id).order_by(model.id).limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                return updated
+            for row in rows:
+                values = fields(row)
+                if model is Job:
+                    # Responses include the place, so cached copies must not validate
+                    values["version"] = Job.version + 1
+                await db.execute(update(model).where(model.id == row.id).values(**values))
+            last_id = rows[-1].id
+            updated += len(rows)
+            await db.commit()
+        print(f"[LOCATIONS] Normalized {updated} {model.__tablename__} locations so far")
+
+
+async def backfill(batch_size: int = 1000) -> int:
+    """Recompute the location columns of every job and user from their location text."""
+    jobs = await _backfill_table(Job, (Job.location,), lambda row: job_location_fields(row.location), batch_size)
+    users = await _backfill_table(
+        User, (User.city, User.state), lambda row: user_location_fields(row.city, row.state), batch_size
+    )
+    return jobs + users
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    print(f"[LOCATIONS] Normalized {asyncio.run(backfill())} job and user locations")
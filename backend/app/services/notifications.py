@@ -0,0 +1,190 @@
+"""
+Application notification emails.
+
+Candidate-facing emails (application received, status changes) are queued straight
+into the outbox. Job owners are not emailed per applicant: each new application adds
+a PendingNotification row, and the DigestFlusher rolls a recipient's rows into one
+email once their oldest row is NOTIFICATION_DIGEST_WINDOW_SECONDS old. A job that
+receives 500 applications in an hour produces one email, not 500.
+"""
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.email import queue_email, smtp_configured
+from app.core.email_templates import (
+    APPLICATION_RECEIVED,
+    DIGEST_JOB_ROW,
+    DIGEST_JOB_TEXT_ROW,
+    NEW_APPLICANTS_DIGEST,
+    STATUS_CHANGED,
+    STATUS_MESSAGES,
+)
+from app.models.application import Application
+from app.models.job import Job
+from app.models.pending_notification import PendingNotification
+from app.models.user import User
+from app.services.email_outbox import wake_outbox_sender
+
+NEW_APPLICANT = "new_applicant"
+
+
+def notifications_enabled() -> bool:
+    return settings.NOTIFICATIONS_ENABLED and smtp_configured()
+
+
+def display_name(user: User) -> str:
+    name = " ".join(part for part in (user.first_name, user.last_name) if part)
+    return name or user.email
+
+
+def notify_application_received(db: AsyncSession, candidate: User, job: Job) -> bool:
+    """Queue the candidate's confirmation email in the caller's transaction."""
+    if not notifications_enabled():
+        return False
+    rendered = APPLICATION_RECEIVED.render(first_name=candidate.first_name or "there", job_title=job.title)
+    queue_email(db, candidate.email, **rendered)
+    return True
+
+
+def notify_status_changed(db: AsyncSession, candidate: User, job: Job, new_status: str) -> bool:
+    """Queue a status email for statuses the candidate should hear about (see STATUS_MESSAGES)."""
+    message = STATUS_MESSAGES.get(new_status)
+    if message is None or not notifications_enabled():
+        return False
+    rendered = STATUS_CHANGED.render(
+        first_name=candidate.first_name or "there",
+        job_title=job.title,
+        message=message.format(job_title=job.title),
+    )
+    queue_email(db, candidate.email, **rendered)
+    return True
+
+
+def record_new_applicant(db: AsyncSession, application: Application, candidate: User, job: Job) -> bool:
+    """Add a new-applicant event for the job owner's next digest."""
+    if job.owner_id is None or not notifications_enabled():
+        return False
+    db.add(PendingNotification(
+        recipient_id=job.owner_id,
+        kind=NEW_APPLICANT,
+        job_id=job.id,
+        payload={
+            "application_id": application.id,
+            "job_title": job.title,
+            "candidate_name": display_name(candidate),
+        },
+    ))
+    return True
+
+
+def render_digest(recipient: User, events: List[PendingNotification]) -> Dict[str, str]:
+    by_job: Dict[Optional[int], List[PendingNotification]] = defaultdict(list)
+    for event in events:
+        by_job[event.job_id].append(event)
+
+    max_names = settings.NOTIFICATION_DIGEST_MAX_NAMES
+    text_rows: List[str] = []
+    html_rows: List[str] = []
+    # Busiest jobs first; the rest are summarised in a single line
+    jobs = sorted(by_job.values(), key=len, reverse=True)
+    for job_events in jobs[:settings.NOTIFICATION_DIGEST_MAX_JOBS]:
+        names = ", ".join(event.payload["candidate_name"] for event in job_events[:max_names])
+        if len(job_events) > max_names:
+            names += f" and {len(job_events) - max_names} more"
+        row = {"job_title": job_events[-1].payload["job_title"], "count": len(job_events), "names": names}
+        text_rows.append(DIGEST_JOB_TEXT_ROW.render(row))
+        html_rows.append(DIGEST_JOB_ROW.render(row))
+    remaining = len(jobs) - settings.NOTIFICATION_DIGEST_MAX_JOBS
+    if remaining > 0:
+        text_rows.append(f"- ...and {remaining} more job(s)")
+        html_rows.append(f"<li>...and {remaining} more job(s)</li>")
+
+    return NEW_APPLICANTS_DIGEST.render(
+        first_name=recipient.first_name or "there",
+        total=len(events),
+        text_rows="\n".join(text_rows),
+        html_rows="".join(html_rows),
+        _raw=("html_rows",),
+    )
+
+
+class DigestFlusher:
+    def __init__(self, session_factory, window_seconds: float, interval: float = 60, batch_size: int = 100):
+        self.session_factory = session_factory
+        self.window = timedelta(seconds=window_seconds)
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def flush_due(self, now: Optional[datetime] = None) -> int:
+        """Queue one digest per recipient whose oldest pending event is past the window. Returns digests queued."""
+        cutoff = (now or datetime.now(timezone.utc)) - self.window
+        async with self.session_factory() as db:
+            due = (
+                select(PendingNotification.recipient_id)
+                .group_by(PendingNotification.recipient_id)
+                .having(func.min(PendingNotification.created_at) <= cutoff)
+                .limit(self.batch_size)
+            )
+            recipient_ids = list((await db.execute(due)).scalars().all())
+            if not recipient_ids:
+                return 0
+
+            result = await db.execute(
+                select(PendingNotification)
+                .where(PendingNotification.recipient_id.in_(recipient_ids))
+                .order_by(PendingNotification.id)
+                .with_for_update(skip_locked=True)
+            )
+            events_by_recipient: Dict[int, List[PendingNotification]] = defaultdict(list)
+            for event in result.scalars().all():
+                events_by_recipient[event.recipient_id].append(event)
+
+            result = await db.execute(select(User).where(User.id.in_(list(events_by_recipient))))
+            for recipient in result.scalars().all():
+                queue_email(db, recipient.email, **render_digest(recipient, events_by_recipient[recipient.id]))
+
+            event_ids = [event.id for events in events_by_recipient.values() for event in events]
+            await db.execute(delete(PendingNotification).where(PendingNotification.id.in_(event_ids)))
+            await db.commit()
+
+        wake_outbox_sender()
+        return len(events_by_recipient)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.flush_due()
+            except Exception as e:
+                print(f"[NOTIFICATIONS ERROR] Digest flush failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+digest_flusher: Optional[DigestFlusher] = None
+
+
+def create_digest_flusher(session_factory) -> DigestFlusher:
+    return DigestFlusher(
+        session_factory,
+        window_seconds=settings.NOTIFICATION_DIGEST_WINDOW_SECONDS,
+        interval=settings.NOTIFICATION_FLUSH_SECONDS,
+    )
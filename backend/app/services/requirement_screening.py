@@ -0,0 +1,427 @@
+"""
+Screening against atomic requirements, with a verdict cache per (resume, requirement).
+
+A job's requirement text used to be sent whole on every screening, and any edit meant a
+full re-screen. The must-have and nice-to-have texts are now split into atomic
+requirements (one bullet, line or short comma-separated item each) when the job is
+created, imported or edited, and stored in jobrequirement; screening only reads them. Every verdict the LLM gives
+(Match / Weak / Missing plus a note) is cached in requirementverdict under the hash of
+the normalized resume text and the hash of the normalized requirement, so:
+
+    - the first screening of a resume is the usual full evaluate_candidate call, with
+      the requirements numbered (M1, N1, ...) so each gap_analysis entry maps back to one
+    - screening that resume again against requirements it has verdicts for makes no
+      LLM call; against a mix, only the unknown requirements are sent
+      (evaluate_requirements), a fraction of a full call
+    - when a job's requirements are edited, rescreen_job evaluates only the new or
+      changed requirements for existing applicants
+
+Whenever every requirement has a verdict, the score is recomposed from them: must-haves
+weigh 70 and nice-to-haves 30 (the weighting the screening prompt asks for), a Match
+counts fully and a Weak half. A job with only one kind gives that kind the full 100.
+"""
+import asyncio
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.application import Application
+from app.models.job import Job
+from app.models.job_requirement import JobRequirement, RequirementVerdict
+from app.services.resume_dedup import screening_failed
+
+MUST, NICE = "must", "nice"
+MAX_REQUIREMENTS = 40
+MAX_LIST_ITEM_WORDS = 3
+CREDIT = {"Match": 1.0, "Weak": 0.5, "Missing": 0.0}
+MUST_WEIGHT, NICE_WEIGHT = 70, 30
+
+_LINES = re.compile(r"[\n;]+")
+_BULLET = re.compile(r"^\s*(?:[-*•·▪◦‣>]+|\(?\d{1,2}[.)]|\(?[a-z][.)])\s+", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+_REQUIREMENT_ID = re.compile(r"^\s*\[?([MN]\d{1,3})\]?[.):]?\s", re.IGNORECASE)
+
+Verdict = Tuple[str, Optional[str]]
+
+
+@dataclass
+class Requirement:
+    kind: str
+    text: str
+    hash: str
+    id: str = ""
+
+
+def normalize_requirement(text: str) -> str:
+    return _SPACES.sub(" ", text.strip().lower()).strip(" .,;:")
+
+
+def requirement_hash(text: str) -> str:
+    return hashlib.sha256(normalize_requirement(text).encode()).hexdigest()
+
+
+def atomize(text: Optional[str]) -> List[str]:
+    """
+    Split requirement text into atomic requirements: one per line, bullet or `;`. A
+    line that is a comma-separated list of short items ("Python, PostgreSQL, AWS")
+    gives one requirement per item; a sentence with commas stays whole.
+    """
+    requirements: List[str] = []
+    seen: Set[str] = set()
+    for line in _LINES.split(text or ""):
+        line = _BULLET.sub("", line).strip().rstrip(".").strip()
+        if not line:
+            continue
+        parts = [part.strip() for part in line.split(",")]
+        if len(parts) > 1 and all(part and len(part.split()) <= MAX_LIST_ITEM_WORDS for part in parts):
+            items = parts
+        else:
+            items = [line]
+        for item in items:
+            key = normalize_requirement(item)
+            if key and key not in seen:
+                seen.add(key)
+                requirements.append(item)
+    return requirements[:MAX_REQUIREMENTS]
+
+
+def _requirement(kind: str, position: int, text: str, hash: Optional[str] = None) -> Requirement:
+    return Requirement(kind, text, hash or requirement_hash(text), f"{'M' if kind == MUST else 'N'}{position}")
+
+
+def parse_requirements(requirements: Optional[str], nice_to_have_requirements: Optional[str]) -> List[Requirement]:
+    return [
+        _requirement(kind, position, item)
+        for kind, text in ((MUST, requirements), (NICE, nice_to_have_requirements))
+        for position, item in enumerate(atomize(text), 1)
+    ]
+
+
+def requirement_rows(job_id: int, requirements: Iterable[Requirement]) -> List[Dict[str, Any]]:
+    """jobrequirement column values for parsed requirements."""
+    return [
+        {"job_id": job_id, "kind": r.kind, "position": int(r.id[1:]), "text": r.text, "requirement_hash": r.hash}
+        for r in requirements
+    ]
+
+
+async def job_requirements(db: AsyncSession, job_id: int) -> List[Requirement]:
+    """The job's stored atomic requirements, must-haves first."""
+    result = await db.execute(
+        select(JobRequirement.kind, JobRequirement.position, JobRequirement.text, JobRequirement.requirement_hash)
+        .where(JobRequirement.job_id == job_id)
+        .order_by(JobRequirement.kind, JobRequirement.position)
+    )
+    return [_requirement(*row) for row in result.all()]
+
+
+async def sync_job_requirements(db: AsyncSession, job: Job) -> bool:
+    """
+    Re-parse the job's requirement text into jobrequirement rows, after it was created
+    or edited. Returns whether they changed. Does not commit.
+    """
+    parsed = parse_requirements(job.requirements, job.nice_to_have_requirements)
+    stored = await job_requirements(db, job.id)
+    if [(r.kind, r.hash) for r in stored] == [(r.kind, r.hash) for r in parsed]:
+        return False
+    await db.execute(delete(JobRequirement).where(JobRequirement.job_id == job.id))
+    await add_job_requirements(db, [(job.id, parsed)])
+    return True
+
+
+async def add_job_requirements(db: AsyncSession, parsed: Iterable[Tuple[int, List[Requirement]]]) -> None:
+    """Insert (job id, parsed requirements) for jobs that have no rows yet. Does not commit."""
+    rows = [row for job_id, requirements in parsed for row in requirement_rows(job_id, requirements)]
+    if rows:
+        await db.execute(insert(JobRequirement), rows)
+
+
+async def cached_verdicts(
+    db: AsyncSession, resume_hashes: Iterable[str], requirement_hashes: Iterable[str]
+) -> Dict[Tuple[str, str], Verdict]:
+    resume_hashes, requirement_hashes = set(resume_hashes), set(requirement_hashes)
+    if not resume_hashes or not requirement_hashes:
+        return {}
+    result = await db.execute(
+        select(RequirementVerdict.resume_hash, RequirementVerdict.requirement_hash, RequirementVerdict.status, RequirementVerdict.note)
+        .where(
+            RequirementVerdict.resume_hash.in_(resume_hashes),
+            RequirementVerdict.requirement_hash.in_(requirement_hashes),
+        )
+    )
+    return {(row.resume_hash, row.requirement_hash): (row.status, row.note) for row in result.all()}
+
+
+async def store_verdicts(db: AsyncSession, resume_hash: str, verdicts: Dict[str, Verdict]) -> None:
+    """Cache verdicts keyed by requirement hash; a verdict cached concurrently wins. Does not commit."""
+    if not verdicts:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    await db.execute(
+        dialect.insert(RequirementVerdict).on_conflict_do_nothing(),
+        [
+            {"resume_hash": resume_hash, "requirement_hash": requirement, "status": status, "note": note}
+            for requirement, (status, note) in verdicts.items()
+        ],
+    )
+
+
+def _verdict(status: Any, note: Any) -> Optional[Verdict]:
+    status = str(status or "").strip().capitalize()
+    if status not in CREDIT:
+        return None
+    return status, str(note)[:1000] if note else None
+
+
+def verdicts_from_gap_analysis(result: Dict[str, Any], requirements: List[Requirement]) -> Dict[str, Verdict]:
+    """Map a full screening's gap_analysis entries back to requirements, by id or by text."""
+    by_id = {r.id: r for r in requirements}
+    by_hash = {r.hash: r for r in requirements}
+    found: Dict[str, Verdict] = {}
+    for entry in result.get("gap_analysis") or []:
+        if not isinstance(entry, dict):
+            continue
+        text = str(entry.get("requirement") or "")
+        match = _REQUIREMENT_ID.match(text)
+        if match:
+            # Shown and filtered on (missing_requirement) without the id
+            text = entry["requirement"] = text[match.end():].strip()
+        requirement = by_id.get(match.group(1).upper()) if match else None
+        if requirement is None:
+            requirement = by_hash.get(requirement_hash(text))
+        verdict = _verdict(entry.get("status"), entry.get("note"))
+        if requirement is not None and verdict is not None:
+            # Show the requirement as the job states it
+            entry["requirement"] = requirement.text
+            found.setdefault(requirement.hash, verdict)
+    return found
+
+
+def compose(requirements: List[Requirement], verdicts: Dict[str, Verdict], justification: Optional[str] = None) -> Dict[str, Any]:
+    """Screening result from one verdict per requirement, scored 70/30 must-have/nice-to-have."""
+    credit = {MUST: [], NICE: []}
+    gap_analysis = []
+    for requirement in requirements:
+        status, note = verdicts[requirement.hash]
+        credit[requirement.kind].append(CREDIT[status])
+        gap_analysis.append({"requirement": requirement.text, "status": status, "note": note or ""})
+    must, nice = credit[MUST], credit[NICE]
+    if must and nice:
+        score = MUST_WEIGHT * sum(must) / len(must) + NICE_WEIGHT * sum(nice) / len(nice)
+    else:
+        score = 100 * sum(must or nice) / len(must or nice)
+    match_count = sum(1 for value in must if value == CREDIT["Match"])
+    if justification is None:
+        missing = [r.text for r in requirements if r.kind == MUST and verdicts[r.hash][0] == "Missing"]
+        justification = f"Meets {match_count} of {len(must)} must-have requirements."
+        if missing:
+            justification += f" Missing: {', '.join(missing)}."
+    return {
+        "match_count": match_count,
+        "total_must_haves": len(must),
+        "score": round(score),
+        "justification": justification,
+        "gap_analysis": gap_analysis,
+    }
+
+
+def _numbered(requirements: List[Requirement]) -> str:
+    return "\n".join(f"{r.id}. {r.text}" for r in requirements)
+
+
+def _numbered_must_haves(requirements: List[Requirement]) -> str:
+    # The id instruction goes with the numbering, not in evaluate_candidate's shared system prompt
+    return (
+        "(Requirements are numbered. Start each gap_analysis \"requirement\" with its id, e.g. \"M2. ...\".)\n"
+        + _numbered([r for r in requirements if r.kind == MUST])
+    )
+
+
+async def evaluate_missing(resume_text: str, job_title: str, missing: List[Requirement]) -> Optional[Dict[str, Verdict]]:
+    """Verdicts for the requirements without one, or None if the LLM call failed."""
+    from app.services.ai_screening import ai_screening_service
+
+    answers = await ai_screening_service.evaluate_requirements(resume_text, job_title, [(r.id, r.text) for r in missing])
+    if answers is None:
+        return None
+    by_id = {r.id: r for r in missing}
+    verdicts: Dict[str, Verdict] = {}
+    for answer in answers:
+        if not isinstance(answer, dict):
+            continue
+        requirement = by_id.get(str(answer.get("id") or "").strip().upper())
+        verdict = _verdict(answer.get("status"), answer.get("note"))
+        if requirement is not None and verdict is not None:
+            verdicts[requirement.hash] = verdict
+    return verdicts if len(verdicts) == len(missing) else None
+
+
+async def screen(db: AsyncSession, job: Job, resume_text: str, resume_hash: str) -> Dict[str, Any]:
+    """Screening result for a resume against the job, using and filling the verdict cache. Does not commit."""
+    from app.services.ai_screening import ai_screening_service
+
+    requirements = await job_requirements(db, job.id)
+    if not requirements:
+        # Jobs without requirement text, or created before jobrequirement and not backfilled
+        result = await ai_screening_service.evaluate_candidate(
+            resume_text=resume_text,
+            job_title=job.title,
+            must_have_requirements=job.requirements or "",
+            nice_to_have_requirements=job.nice_to_have_requirements
+        )
+        return ai_screening_service.normalize_result(result)
+
+    cached = await cached_verdicts(db, [resume_hash], [r.hash for r in requirements])
+    verdicts = {requirement: verdict for (_, requirement), verdict in cached.items()}
+    missing = [r for r in requirements if r.hash not in verdicts]
+    if verdicts:
+        metrics.requirement_verdicts.inc("cached", amount=len(verdicts))
+    if missing and verdicts:
+        evaluated = await evaluate_missing(resume_text, job.title, missing)
+        if evaluated is not None:
+            metrics.requirement_verdicts.inc("evaluated", amount=len(evaluated))
+            await store_verdicts(db, resume_hash, evaluated)
+            verdicts.update(evaluated)
+            missing = []
+    if not missing:
+        return compose(requirements, verdicts)
+
+    result = await ai_screening_service.evaluate_candidate(
+        resume_text=resume_text,
+        job_title=job.title,
+        must_have_requirements=_numbered_must_haves(requirements),
+        nice_to_have_requirements=_numbered([r for r in requirements if r.kind == NICE]) or None
+    )
+    result = ai_screening_service.normalize_result(result)
+    if screening_failed(result):
+        return result
+    found = verdicts_from_gap_analysis(result, requirements)
+    metrics.requirement_verdicts.inc("screened", amount=len(found))
+    await store_verdicts(db, resume_hash, {h: v for h, v in found.items() if h not in verdicts})
+    verdicts.update(found)
+    if len(verdicts) == len(requirements):
+        return compose(requirements, verdicts, result.get("justification"))
+    return result
+
+
+async def rescreen_job(db: AsyncSession, job_id: int, batch_size: int = 50) -> int:
+    """
+    Re-score the job's applicants after its requirements changed, evaluating only the
+    requirements they have no cached verdict for. Applicants screened before verdicts
+    were cached (or whose resume file is gone) keep their score. Returns how many
+    applications were re-scored; commits per batch.
+    """
+    from app.services.ai_screening import AIScreeningService
+
+    job = await db.get(Job, job_id)
+    if job is None:
+        return 0
+    job_title = job.title
+    requirements = await job_requirements(db, job_id)
+    if not requirements:
+        return 0
+    hashes = [r.hash for r in requirements]
+    semaphore = asyncio.Semaphore(max(1, settings.RESCREEN_CONCURRENCY))
+
+    async def evaluate(resume_path: str, missing: List[Requirement]) -> Optional[Dict[str, Verdict]]:
+        async with semaphore:
+            try:
+                with open(resume_path, "rb") as f:
+                    content = f.read()
+            except OSError:
+                return None
+            text = await asyncio.to_thread(AIScreeningService.extract_text, content, resume_path)
+            return await evaluate_missing(text, job_title, missing) if text.strip() else None
+
+    rescored = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(Application.id, Application.resume_hash, Application.resume_path)
+            .where(Application.job_id == job_id, Application.id > last_id, Application.resume_hash.isnot(None))
+            .order_by(Application.id)
+            .limit(batch_size)
+        )
+        applications = result.all()
+        if not applications:
+            return rescored
+        last_id = applications[-1].id
+        cached = await cached_verdicts(db, [a.resume_hash for a in applications], hashes)
+
+        pending = []
+        for application in applications:
+            verdicts = {h: cached[(application.resume_hash, h)] for h in hashes if (application.resume_hash, h) in cached}
+            if verdicts:
+                pending.append((application, verdicts, [r for r in requirements if r.hash not in verdicts]))
+        evaluated = await asyncio.gather(*(
+            evaluate(application.resume_path, missing) if missing else asyncio.sleep(0, {})
+            for application, _, missing in pending
+        ))
+        stored: Set[str] = set()
+        for (application, verdicts, _), new in zip(pending, evaluated):
+            if new is None:
+                continue
+            if new and application.resume_hash not in stored:
+                metrics.requirement_verdicts.inc("evaluated", amount=len(new))
+                await store_verdicts(db, application.resume_hash, new)
+                stored.add(application.resume_hash)
+            verdicts.update(new)
+            analysis = compose(requirements, verdicts)
+            # No version check: a status change made meanwhile is kept, the screening is replaced
+            await db.execute(
+                update(Application)
+                .where(Application.id == application.id)
+                .values(ai_analysis=analysis, ai_score=analysis["score"], version=Application.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            rescored += 1
+        await db.commit()
+        print(f"[SCREENING] Re-scored {rescored} applicants of job {job_id} so far")
+
+
+async def rescreen_job_in_background(job_id: int) -> None:
+    from app.db import session
+
+    try:
+        async with session.AsyncSessionLocal() as db:
+            rescored = await rescreen_job(db, job_id)
+        print(f"[SCREENING] Re-scored {rescored} applicants of job {job_id} after a requirements edit")
+    except Exception as e:
+        print(f"[SCREENING] Re-screening job {job_id} failed: {e}")
+
+
+async def backfill(batch_size: int = 500) -> int:
+    """Parse the requirements of jobs that have no jobrequirement rows (created before the table existed)."""
+    from sqlalchemy import exists
+
+    from app.db.session import AsyncSessionLocal
+
+    parsed_jobs = 0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Job.id, Job.requirements, Job.nice_to_have_requirements)
+                .where(Job.id > last_id, ~exists().where(JobRequirement.job_id == Job.id))
+                .order_by(Job.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                return parsed_jobs
+            last_id = rows[-1].id
+            await add_job_requirements(db, [(row.id, parse_requirements(row.requirements, row.nice_to_have_requirements)) for row in rows])
+            await db.commit()
+            parsed_jobs += len(rows)
+        print(f"[SCREENING] Parsed requirements of {parsed_jobs} jobs so far")
+
+
+if __name__ == "__main__":
+    print(f"[SCREENING] Parsed requirements of {asyncio.run(backfill())} jobs")
@@ -0,0 +1,312 @@
+"""
+Near-duplicate resume detection with MinHash signatures and an LSH index.
+
+Candidates re-upload lightly edited resumes (a new date, phone number or PDF export)
+and every upload used to cost a full evaluate_candidate call. Each screened resume is
+fingerprinted instead:
+
+    - the extracted text is normalized: lowercased, with emails, links, phone numbers
+      and dates removed, since they change between versions without changing the fit
+    - a MinHash of 128 independent 32-bit hashes over 5-word shingles estimates the
+      Jaccard similarity of two resumes (the fraction of equal values); about 10ms
+      for a two-page resume
+    - the signature is cut into 16 bands of 8 values; each band hashes to a bucket row
+      in resumelshbucket, so resumes above ~0.7 similarity share a bucket with high
+      probability and the lookup is an indexed `bucket IN (...)` query
+
+Before screening, create_application looks for a fingerprint of the same candidate,
+screened against the same job title and requirements (requirements_hash), with an
+estimated similarity of at least RESUME_DEDUP_THRESHOLD. As a cheap delta check,
+the words that differ between the two versions are compared with the requirement
+words: a resume that gained or lost e.g. "kubernetes" is screened again. Otherwise
+the earlier result is reused. Results are only reused within one candidate's own
+applications, because the justification text describes that person.
+
+The same index lets admins find different accounts that uploaded near-identical
+resumes (find_duplicate_accounts). `python -m app.services.resume_dedup` fingerprints
+existing applications from their stored resume files.
+"""
+import hashlib
+import re
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.models.application import Application
+from app.models.resume_fingerprint import ResumeFingerprint, ResumeLSHBucket
+from app.models.user import User
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+MAX_CANDIDATE_PAIRS = 10000
+
+# One SHAKE-128 output per shingle gives all NUM_PERM 32-bit hash values at once
+_SIGNATURE = struct.Struct(f"<{NUM_PERM}I")
+
+_MONTHS = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_VOLATILE = re.compile(
+    r"\S+@\S+|https?://\S+|www\.\S+"            # emails, links
+    r"|\+?\d[\d\s().-]{7,}\d"                    # phone numbers, date ranges
+    r"|\b\d{1,4}[/.-]\d{1,2}(?:[/.-]\d{1,4})?\b"  # numeric dates
+    rf"|\b{_MONTHS}\s+(?:\d{{1,2}},?\s+)?\d{{4}}\b",  # "March 2024", "Mar 5, 2024"
+    re.IGNORECASE,
+)
+_WORD = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = {
+    "and", "the", "for", "with", "from", "years", "year", "experience", "knowledge", "strong",
+    "ability", "working", "work", "skills", "plus", "good", "using", "least", "must", "have",
+}
+# Justifications of the fallback results returned when no model could screen the resume
+_FAILED_JUSTIFICATIONS = ("AI Evaluation Failed", "Both OpenAI and Gemini failed", "OpenAI token limit reached")
+
+
+def normalize_words(text: str) -> List[str]:
+    return _WORD.findall(_VOLATILE.sub(" ", text.lower()))
+
+
+def word_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode(), digest_size=4).digest(), "little")
+
+
+@dataclass
+class Fingerprint:
+    content_hash: str
+    minhash: List[int]
+    words: Set[int]
+    buckets: List[int] = field(init=False)
+
+    def __post_init__(self):
+        self.buckets = lsh_buckets(self.minhash)
+
+
+def minhash(shingles: Iterable[bytes]) -> List[int]:
+    """Per hash function, the minimum over the shingles."""
+    # All shingles' hash values in one array, row-major; column j is a strided slice
+    values = array("I", b"".join([hashlib.shake_128(shingle).digest(_SIGNATURE.size) for shingle in shingles]))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return [min(values[j::NUM_PERM]) for j in range(NUM_PERM)]
+
+
+def lsh_buckets(signature: List[int]) -> List[int]:
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<H{ROWS}I", band, *rows), digest_size=8).digest()
+        # Signed, to fit a BIGINT
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def _words_hash(words: List[str]) -> str:
+    return hashlib.sha256(" ".join(words).encode()).hexdigest()
+
+
+def content_hash(text: str) -> str:
+    """Hash of the normalized text: a new phone number or date gives the same hash."""
+    return _words_hash(normalize_words(text))
+
+
+def fingerprint(text: str) -> Optional[Fingerprint]:
+    words = normalize_words(text)
+    if not words:
+        return None
+    if len(words) < SHINGLE_WORDS:
+        shingles = [" ".join(words)]
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return Fingerprint(
+        content_hash=_words_hash(words),
+        minhash=minhash(shingle.encode() for shingle in shingles),
+        words={word_hash(word) for word in set(words)},
+    )
+
+
+def similarity(left: List[int], right: List[int]) -> float:
+    """Estimated Jaccard similarity of the two resumes' shingle sets."""
+    return sum(a == b for a, b in zip(left, right)) / NUM_PERM
+
+
+def pack_minhash(signature: List[int]) -> bytes:
+    return _SIGNATURE.pack(*signature)
+
+
+def unpack_minhash(data: bytes) -> List[int]:
+    return list(_SIGNATURE.unpack(data))
+
+
+def pack_words(words: Set[int]) -> bytes:
+    return struct.pack(f"<{len(words)}I", *sorted(words))
+
+
+def unpack_words(data: bytes) -> Set[int]:
+    return set(struct.unpack(f"<{len(data) // 4}I", data))
+
+
+def requirements_hash(job_title: str, must_have: Optional[str], nice_to_have: Optional[str]) -> str:
+    """Identifies the screening inputs other than the resume."""
+    return hashlib.sha256("\0".join((job_title or "", must_have or "", nice_to_have or "")).encode()).hexdigest()
+
+
+def requirement_words(*texts: Optional[str]) -> Set[int]:
+    return {
+        word_hash(word)
+        for text in texts if text
+        for word in normalize_words(text)
+        if len(word) > 1 and word not in _STOPWORDS
+    }
+
+
+def screening_failed(result: Dict[str, Any]) -> bool:
+    return str(result.get("justification", "")).startswith(_FAILED_JUSTIFICATIONS)
+
+
+async def find_reusable_screening(
+    db: AsyncSession, user_id: int, fp: Fingerprint, req_hash: str, req_words: Set[int]
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    The screening result of a near-identical resume of this candidate for the same
+    requirements, and the outcome: "reused", "changed" (near-identical, but the
+    differing words touch the requirements) or "miss".
+    """
+    candidates = select(ResumeLSHBucket.fingerprint_id).where(ResumeLSHBucket.bucket.in_(fp.buckets))
+    result = await db.execute(
+        select(
+            ResumeFingerprint.content_hash, ResumeFingerprint.minhash, ResumeFingerprint.words,
+            Application.id, Application.ai_analysis,
+        )
+        .join(Application, Application.id == ResumeFingerprint.application_id)
+        .where(
+            ResumeFingerprint.user_id == user_id,
+            ResumeFingerprint.requirements_hash == req_hash,
+            ResumeFingerprint.id.in_(candidates),
+            Application.ai_analysis.isnot(None),
+        )
+    )
+    best: Optional[Tuple[float, int, Dict[str, Any]]] = None
+    outcome = "miss"
+    for content_hash, packed, words, application_id, analysis in result.all():
+        if screening_failed(analysis):
+            continue
+        score = 1.0 if content_hash == fp.content_hash else similarity(fp.minhash, unpack_minhash(packed))
+        if score < settings.RESUME_DEDUP_THRESHOLD:
+            continue
+        if content_hash != fp.content_hash and (unpack_words(words) ^ fp.words) & req_words:
+            outcome = "changed"
+            continue
+        if best is None or score > best[0]:
+            best = (score, application_id, analysis)
+    if best is None:
+        return None, outcome
+    score, application_id, analysis = best
+    reused = dict(analysis)
+    reused["reused_from_application"] = reused.get("reused_from_application", application_id)
+    reused["resume_similarity"] = round(score, 3)
+    return reused, "reused"
+
+
+async def remove_fingerprints(db: AsyncSession, application_id: int) -> None:
+    ids = select(ResumeFingerprint.id).where(ResumeFingerprint.application_id == application_id)
+    await db.execute(delete(ResumeLSHBucket).where(ResumeLSHBucket.fingerprint_id.in_(ids)))
+    await db.execute(delete(ResumeFingerprint).where(ResumeFingerprint.application_id == application_id))
+
+
+def add_fingerprint(
+    db: AsyncSession, fp: Fingerprint, user_id: int, application_id: Optional[int], req_hash: Optional[str]
+) -> ResumeFingerprint:
+    """Stage the fingerprint and its bucket rows. Does not commit."""
+    row = ResumeFingerprint(
+        user_id=user_id,
+        application_id=application_id,
+        content_hash=fp.content_hash,
+        minhash=pack_minhash(fp.minhash),
+        words=pack_words(fp.words),
+        requirements_hash=req_hash,
+    )
+    row.buckets = [ResumeLSHBucket(bucket=bucket) for bucket in set(fp.buckets)]
+    db.add(row)
+    return row
+
+
+async def find_duplicate_accounts(db: AsyncSession, threshold: float, limit: int) -> List[Dict[str, Any]]:
+    """Pairs of different users whose resumes are near-identical, most similar first."""
+    left, right = aliased(ResumeLSHBucket), aliased(ResumeLSHBucket)
+    pairs = (
+        select(left.fingerprint_id.label("left_id"), right.fingerprint_id.label("right_id"))
+        .join(right, and_(left.bucket == right.bucket, left.fingerprint_id < right.fingerprint_id))
+        .distinct()
+        .limit(MAX_CANDIDATE_PAIRS)
+        .subquery()
+    )
+    left_fp, right_fp = aliased(ResumeFingerprint), aliased(ResumeFingerprint)
+    result = await db.execute(
+        select(left_fp.user_id, right_fp.user_id, left_fp.minhash, right_fp.minhash)
+        .select_from(pairs)
+        .join(left_fp, left_fp.id == pairs.c.left_id)
+        .join(right_fp, right_fp.id == pairs.c.right_id)
+        .where(left_fp.user_id != right_fp.user_id)
+    )
+    best: Dict[Tuple[int, int], float] = {}
+    for left_user, right_user, left_hash, right_hash in result.all():
+        score = similarity(unpack_minhash(left_hash), unpack_minhash(right_hash))
+        key = (min(left_user, right_user), max(left_user, right_user))
+        if score >= threshold and score > best.get(key, 0):
+            best[key] = score
+    ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+    user_ids = {user_id for key, _ in ranked for user_id in key}
+    users = {}
+    if user_ids:
+        result = await db.execute(select(User).where(User.id.in_(user_ids)))
+        users = {user.id: user for user in result.scalars().all()}
+    return [{"similarity": round(score, 3), "users": [users[a], users[b]]} for (a, b), score in ranked]
+
+
+async def backfill(batch_size: int = 100) -> int:
+    """Fingerprint applications that have none yet, from their stored resume files."""
+    import os
+
+    from app.db.session import AsyncSessionLocal
+    from app.services.ai_screening import AIScreeningService
+
+    added = 0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            fingerprinted = select(ResumeFingerprint.application_id).where(ResumeFingerprint.application_id.isnot(None))
+            result = await db.execute(
+                select(Application.id, Application.user_id, Application.resume_path)
+                .where(Application.id > last_id, Application.id.not_in(fingerprinted))
+                .order_by(Application.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                return added
+            for application_id, user_id, resume_path in rows:
+                last_id = application_id
+                if not resume_path or not os.path.exists(resume_path):
+                    continue
+                with open(resume_path, "rb") as f:
+                    text = AIScreeningService.extract_text(f.read(), resume_path)
+                fp = fingerprint(text)
+                if fp is not None:
+                    # The requirements it was screened against are unknown, so it is never reused
+                    add_fingerprint(db, fp, user_id, application_id, None)
+                    added += 1
+            await db.commit()
+        print(f"[DEDUP] Fingerprinted {added} resumes so far")
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    print(f"[DEDUP] Fingerprinted {asyncio.run(backfill())} resumes")
@@ -0,0 +1,73 @@
+"""
+Admin user search.
+
+Every user has a search document: email, first and last name, company, city and
+state, lowercased and joined (SEARCH_DOCUMENT in app/models/user.py). Each word of the
+query must occur in it as a substring, so "jan acme" finds Jane Doe at Acme Corp. On
+Postgres a misspelled query ("jonh smiht") also matches through pg_trgm word
+similarity, and results are ranked by it. Both conditions are served by the GIN
+trigram index on the document, so neither needs to read the whole user table.
+
+SQLite has no pg_trgm: it falls back to the substring match, ranked by exact and
+prefix email matches.
+
+The total number of matches comes back in the same query as the page, as
+count(*) OVER (), so the admin list shows "1,234 users" without a second count query.
+"""
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import SEARCH_DOCUMENT, User, UserRole
+
+MAX_QUERY_LENGTH = 100
+MAX_QUERY_WORDS = 8
+
+
+async def search_users(
+    db: AsyncSession,
+    columns: List[Any],
+    q: Optional[str] = None,
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[List[Any], int]:
+    """The page of users matching the query and filters, as rows of `columns`, and the total match count."""
+    conditions = []
+    if role is not None:
+        conditions.append(User.role == role)
+    if is_active is not None:
+        conditions.append(User.is_active == is_active)
+
+    order_by: List[Any] = []
+    term = " ".join((q or "").lower().split()[:MAX_QUERY_WORDS])[:MAX_QUERY_LENGTH]
+    if term:
+        document = literal_column(SEARCH_DOCUMENT)
+        substring = [document.contains(word, autoescape=True) for word in term.split()]
+        if db.get_bind().dialect.name == "postgresql":
+            # word_similarity(term, document) above pg_trgm.word_similarity_threshold
+            conditions.append(or_(and_(*substring), document.op("%>")(term)))
+            order_by.append(func.word_similarity(term, document).desc())
+        else:
+            conditions.extend(substring)
+            email = func.lower(User.email)
+            order_by.append(case((email == term, 0), (email.startswith(term, autoescape=True), 1), else_=2))
+    order_by.append(User.id)
+
+    result = await db.execute(
+        select(*columns, func.count().over().label("total"))
+        .where(*conditions)
+        .order_by(*order_by)
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = result.all()
+    if rows:
+        return rows, rows[0].total
+    if not skip:
+        return rows, 0
+    # Paged past the end: the window had no rows to report the total on
+    total = await db.scalar(select(func.count()).select_from(User).where(*conditions))
+    return rows, total
@@ -0,0 +1,150 @@
+"""Micro-benchmark: ORM + response_model serialization vs the row-tuple/TypeAdapter path.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization [--items 100] [--rounds 200]
+
+Seeds an in-memory SQLite database and times, per endpoint, fetching one page of
+results and turning it into JSON bytes the old way (ORM entities with selectinload,
+validated from attributes and dumped with stdlib json) and the new way (flat column
+select, RowLayout, cached TypeAdapter.dump_json).
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Callable, List
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, aliased, selectinload
+
+from app.core.serialization import RowLayout, list_adapter
+from app.db.base import Base
+from app.models.application import Application, ApplicationStatus
+from app.models.job import Job
+from app.models.user import User, UserRole
+from app.schemas.application import ApplicationResponse
+from app.schemas.job import JobResponse
+from app.schemas.user import User as UserSchema, UserInDBBase
+
+
+def seed(session: Session, items: int) -> int:
+    client = User(email="bench_client@test.com", hashed_password="x", role=UserRole.CLIENT,
+                  first_name="Bench", last_name="Client", company_name="Bench Corp")
+    session.add(client)
+    session.flush()
+    jobs = [
+        Job(title=f"Job {i}", description="Description " * 20, requirements="Python, SQL, AWS",
+            location="Remote", job_type="Full-time", experience_level="Senior", owner_id=client.id)
+        for i in range(items)
+    ]
+    session.add_all(jobs)
+    session.flush()
+    target_job = jobs[0].id
+    candidates = [
+        User(email=f"bench_candidate{i}@test.com", hashed_password="x", role=UserRole.CANDIDATE,
+             first_name="Cand", last_name=str(i), years_of_experience=5)
+        for i in range(items)
+    ]
+    session.add_all(candidates)
+    session.flush()
+    analysis = {
+        "match_count": 2, "total_must_haves": 3, "score": 72, "justification": "Solid match " * 10,
+        "gap_analysis": [{"requirement": r, "status": "Match", "note": "Seen on resume"} for r in ("Python", "SQL", "AWS")],
+    }
+    session.add_all(
+        Application(user_id=c.id, job_id=target_job, status=ApplicationStatus.APPLIED,
+                    resume_path="uploads/x.pdf", ai_score=72, ai_analysis=analysis)
+        for c in candidates
+    )
+    session.commit()
+    return target_job
+
+
+def old_read_jobs(session: Session) -> bytes:
+    jobs = session.execute(select(Job).options(selectinload(Job.owner)).limit(100)).scalars().all()
+    adapter = TypeAdapter(List[JobResponse])
+    return json.dumps(adapter.dump_python(adapter.validate_python(jobs, from_attributes=True), mode="json")).encode()
+
+
+def new_read_jobs(session: Session) -> bytes:
+    owner = aliased(User)
+    layout = RowLayout(Job, JobResponse, owner=RowLayout(owner, UserSchema))
+    stmt = select(*layout.columns).select_from(Job).outerjoin(owner, Job.owner_id == owner.id).limit(100)
+    adapter = list_adapter(JobResponse)
+    return adapter.dump_json(adapter.validate_python(layout.build_all(session.execute(stmt).all())))
+
+
+def old_read_job_applications(session: Session, job_id: int) -> bytes:
+    stmt = select(Application).where(Application.job_id == job_id).options(
+        selectinload(Application.user), selectinload(Application.job).selectinload(Job.owner)
+    )
+    applications = session.execute(stmt).scalars().all()
+    adapter = TypeAdapter(List[ApplicationResponse])
+    return json.dumps(adapter.dump_python(adapter.validate_python(applications, from_attributes=True), mode="json")).encode()
+
+
+def new_read_job_applications(session: Session, job_id: int) -> bytes:
+    owner, candidate = aliased(User), aliased(User)
+    layout = RowLayout(
+        Application, ApplicationResponse,
+        job=RowLayout(Job, JobResponse, owner=RowLayout(owner, UserSchema)),
+        user=RowLayout(candidate, UserInDBBase),
+    )
+    stmt = (
+        select(*layout.columns).select_from(Application)
+        .join(Job, Application.job_id == Job.id)
+        .outerjoin(owner, Job.owner_id == owner.id)
+        .join(candidate, Application.user_id == candidate.id)
+        .where(Application.job_id == job_id)
+    )
+    adapter = list_adapter(ApplicationResponse)
+    return adapter.dump_json(adapter.validate_python(layout.build_all(session.execute(stmt).all())))
+
+
+def timed(fn: Callable[[], bytes], rounds: int) -> List[float]:
+    fn()  # warm up caches and compiled statements
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="jobs and applications to seed")
+    parser.add_argument("--rounds", type=int, default=200, help="timed iterations per case")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        job_id = seed(session, args.items)
+
+    cases = [
+        ("read_jobs", lambda s: old_read_jobs(s), lambda s: new_read_jobs(s)),
+        ("read_job_applications", lambda s: old_read_job_applications(s, job_id),
+         lambda s: new_read_job_applications(s, job_id)),
+    ]
+    print(f"{'endpoint':<24}{'old ms (p50)':>14}{'new ms (p50)':>14}{'speedup':>10}")
+    for name, old, new in cases:
+        # Fresh session per call, as each request gets its own session
+        def run(fn):
+            def call():
+                with Session(engine) as session:
+                    return fn(session)
+            return call
+        assert json.loads(run(old)()) == json.loads(run(new)()), f"{name}: payloads differ"
+        old_p50 = statistics.median(timed(run(old), args.rounds))
+        new_p50 = statistics.median(timed(run(new), args.rounds))
+        print(f"{name:<24}{old_p50:>14.3f}{new_p50:>14.3f}{old_p50 / new_p50:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
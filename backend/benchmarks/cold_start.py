@@ -0,0 +1,145 @@
+"""Cold-start benchmark: time from process spawn to the first healthy /health response.
+
+Usage (from backend/):
+    python -m benchmarks.cold_start --runs 5
+    python -m benchmarks.cold_start --budget-ms 4000 --import-budget-ms 2000
+    python -m benchmarks.cold_start --workers 0   # as the Dockerfile runs it
+
+Each run starts a fresh `python -m app.server` (the production launcher) in a temporary
+working directory with a SQLite database, polls /health until it returns 200 and then
+stops the server, so every run pays interpreter start, imports, table creation and the
+first request like a new Cloud Run instance does. --workers defaults to 1; 0 sizes
+the pool from the machine as in production.
+
+Before the runs, `python -X importtime -c "import app.main"` shows which top-level
+packages dominate the import of the app (by self time). Either budget flag makes the
+script exit non-zero when the median exceeds it, so it can gate CI.
+"""
+import argparse
+import os
+import re
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| \s*(\S+)")
+
+
+def _env(workdir: str) -> Dict[str, str]:
+    return {
+        **os.environ,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{os.path.join(workdir, 'cold_start.db')}",
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "cold-start"),
+        "SMTP_USER": "",
+        "SMTP_PASSWORD": "",
+        "PYTHONPATH": BACKEND_DIR,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def import_times(workdir: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """Cumulative import time of app.main, and the self time of each top-level package (ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=workdir, env=_env(workdir), capture_output=True, text=True, check=True,
+    )
+    packages: Dict[str, float] = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(3)
+        if name == "app.main":
+            total = int(match.group(2)) / 1000
+        # Self times, so a package is charged for its own modules wherever it was imported from
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + int(match.group(1)) / 1000
+    return total, sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+
+def time_to_healthy(workdir: str, timeout: float, worker_count: int) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    log = open(os.path.join(workdir, "server.log"), "w+")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--host", "127.0.0.1", "--port", str(port), "--workers", str(worker_count)],
+        cwd=workdir, env=_env(workdir), stdout=log, stderr=subprocess.STDOUT,
+    )
+    try:
+        with httpx.Client(timeout=1) as client:
+            while time.perf_counter() - started < timeout:
+                if server.poll() is not None:
+                    log.seek(0)
+                    raise RuntimeError(f"Server exited with {server.returncode}: {log.read()[-2000:]}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return (time.perf_counter() - started) * 1000
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError(f"/health did not return 200 within {timeout}s")
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        log.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0: sized from CPUs and memory)")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait for /health per run")
+    parser.add_argument("--top", type=int, default=15, help="Top-level packages to list by import time")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the median time to first healthy response exceeds this")
+    parser.add_argument("--import-budget-ms", type=float, help="Fail if the median import time of app.main exceeds this")
+    args = parser.parse_args()
+
+    failures = []
+    samples, import_totals = [], []
+    for run in range(args.runs):
+        # A fresh directory per run: new database, new uploads/, no state carried over
+        workdir = tempfile.mkdtemp(prefix="cold-start-")
+        try:
+            total, packages = import_times(workdir)
+            if run == 0:
+                print(f"import app.main: {total:.0f}ms cumulative")
+                for name, ms in packages[:args.top]:
+                    print(f"  {name:<30} {ms:8.1f}ms")
+            import_totals.append(total)
+            samples.append(time_to_healthy(workdir, args.timeout, args.workers))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        print(f"run {run + 1}: first healthy response after {samples[-1]:.0f}ms (import {import_totals[-1]:.0f}ms)")
+
+    median = statistics.median(samples)
+    import_median = statistics.median(import_totals)
+    print(f"time to first healthy response: median {median:.0f}ms, min {min(samples):.0f}ms, max {max(samples):.0f}ms")
+    if args.budget_ms is not None and median > args.budget_ms:
+        failures.append(f"time to first healthy response {median:.0f}ms > budget {args.budget_ms:.0f}ms")
+    if args.import_budget_ms is not None and import_median > args.import_budget_ms:
+        failures.append(f"import app.main {import_median:.0f}ms > budget {args.import_budget_ms:.0f}ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
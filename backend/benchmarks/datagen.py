@@ -0,0 +1,348 @@
+"""Synthetic data generator: bulk-loads production-sized volumes of users, jobs, applications and candidate skills.
+
+Usage (from backend/):
+    python -m benchmarks.datagen --users 1000000 --jobs 200000 --applications 5000000
+    python -m benchmarks.datagen --database-url sqlite+aiosqlite:///./load.db --users 5000 --jobs 500 --applications 20000
+
+Rows are generated in batches and never held in memory all at once. On Postgres each
+batch goes through COPY (asyncpg copy_records_to_table); elsewhere through a
+multi-row INSERT (executemany). Ids are assigned here so applications can reference
+users and jobs without reading them back; Postgres sequences are moved past them.
+
+Every generated account uses DEFAULT_PASSWORD and an @loadtest.example email, so the
+load-test harness (benchmarks/load_test.py) can log in as any of them. Runs append, so
+a second run against the same database adds more rows rather than colliding.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import orjson
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from app.core.skills import normalize_skill
+
+os.environ.setdefault("SECRET_KEY", "datagen")
+
+DEFAULT_PASSWORD = "password123"
+EMAIL_DOMAIN = "loadtest.example"
+
+FIRST_NAMES = ["Ava", "Liam", "Noah", "Emma", "Olivia", "Mia", "Lucas", "Ethan", "Sofia", "Maya", "Arjun", "Priya",
+               "Chen", "Wei", "Fatima", "Omar", "Diego", "Lucia", "Hana", "Kenji", "Grace", "Samuel", "Zara", "Leo"]
+LAST_NAMES = ["Smith", "Johnson", "Lee", "Garcia", "Patel", "Nguyen", "Kim", "Brown", "Singh", "Lopez", "Chen",
+              "Khan", "Williams", "Martinez", "Davis", "Shah", "Rossi", "Muller", "Okafor", "Tanaka"]
+CITIES = [("Austin", "TX"), ("Seattle", "WA"), ("New York", "NY"), ("Chicago", "IL"), ("Denver", "CO"),
+          ("Boston", "MA"), ("Atlanta", "GA"), ("San Jose", "CA"), ("Raleigh", "NC"), ("Phoenix", "AZ")]
+WORK_PERMITS = ["US Citizen", "Green Card", "H1B", "OPT", "TN"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne", "Wonka", "Tyrell"]
+TITLES = ["Backend Engineer", "Data Engineer", "Frontend Developer", "DevOps Engineer", "QA Analyst",
+          "Product Manager", "Data Scientist", "Mobile Developer", "Security Engineer", "Solutions Architect"]
+SKILLS = ["Python", "SQL", "AWS", "Kubernetes", "React", "TypeScript", "Java", "Go", "Terraform", "Docker",
+          "PostgreSQL", "Kafka", "Spark", "GCP", "Azure", "Linux", "CI/CD", "GraphQL", "Redis", "Airflow"]
+JOB_TYPES = ["Full-time", "Contract", "Part-time", "Contract-to-hire"]
+LEVELS = ["Junior", "Mid", "Senior", "Lead"]
+LOCATIONS = [f"{city}, {state}" for city, state in CITIES] + ["Remote"] * 4
+STATUS_WEIGHTS = {"APPLIED": 60, "REVIEWING": 20, "INTERVIEW": 10, "OFFER": 2, "REJECTED": 8}
+
+
+def account_email(role: str, user_id: int) -> str:
+    return f"{role}{user_id}@{EMAIL_DOMAIN}"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def job_requirements(job_id: int) -> List[str]:
+    """Deterministic must-haves per job, shared by jobs and their applications' gap analysis."""
+    rng = random.Random(job_id)
+    return rng.sample(SKILLS, rng.randint(3, 6))
+
+
+def user_rows(rng: random.Random, start_id: int, count: int, role: str, hashed_password: str) -> Iterator[Dict[str, Any]]:
+    from app.services.locations import user_location_fields
+
+    places = {(city, state): user_location_fields(city, state) for city, state in CITIES}
+    for offset in range(count):
+        user_id = start_id + offset
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        city, state = rng.choice(CITIES)
+        row = {
+            "id": user_id,
+            "email": account_email(role.lower(), user_id),
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "role": role,
+            "first_name": first,
+            "middle_initial": None,
+            "last_name": last,
+            "phone_number": f"555{rng.randint(1000000, 9999999)}",
+            **places[(city, state)],
+            "years_of_experience": None,
+            "work_permit_type": None,
+            "linkedin_url": None,
+            "company_name": None,
+            "designation": None,
+        }
+        if role == "CANDIDATE":
+            row["years_of_experience"] = min(40, int(rng.expovariate(1 / 6)))
+            row["work_permit_type"] = rng.choice(WORK_PERMITS)
+            row["linkedin_url"] = f"https://linkedin.com/in/{first.lower()}-{last.lower()}-{user_id}"
+        else:
+            row["company_name"] = f"{rng.choice(COMPANIES)} {rng.choice(['Labs', 'Inc', 'Systems', 'Group'])}"
+            row["designation"] = "Hiring Manager"
+        yield row
+
+
+def job_rows(rng: random.Random, start_id: int, count: int, owner_ids: range, now: datetime) -> Iterator[Dict[str, Any]]:
+    from app.services.locations import job_location_fields
+
+    places = {location: job_location_fields(location) for location in LOCATIONS}
+    for offset in range(count):
+        job_id = start_id + offset
+        requirements = job_requirements(job_id)
+        nice = [skill for skill in rng.sample(SKILLS, 3) if skill not in requirements]
+        title = f"{rng.choice(LEVELS)} {rng.choice(TITLES)}"
+        location = rng.choice(LOCATIONS)
+        yield {
+            "id": job_id,
+            "title": title,
+            "description": f"{title} to build and run {', '.join(requirements[:2])} systems. " * 4,
+            "requirements": ", ".join(requirements),
+            "nice_to_have_requirements": ", ".join(nice) or None,
+            "location": location,
+            **places[location],
+            "salary_range": f"${rng.randint(6, 20) * 10}k - ${rng.randint(21, 30) * 10}k",
+            "job_type": rng.choice(JOB_TYPES),
+            "experience_level": rng.choice(LEVELS),
+            "is_active": rng.random() < 0.85,
+            "created_at": now - timedelta(days=rng.uniform(0, 365)),
+            "updated_at": None,
+            "version": 1,
+            "owner_id": owner_ids[rng.randrange(len(owner_ids))],
+        }
+
+
+def requirement_rows(jobs: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """The jobs' atomic requirements, as job create and import store them."""
+    from app.services.requirement_screening import parse_requirements, requirement_rows as rows_for
+
+    for job in jobs:
+        yield from rows_for(job["id"], parse_requirements(job["requirements"], job["nice_to_have_requirements"]))
+
+
+def screening_result(rng: random.Random, requirements: List[str]) -> Dict[str, Any]:
+    """An analysis shaped like the LLM's, with a skewed-normal score and consistent gaps."""
+    score = max(0, min(100, int(rng.gauss(58, 20))))
+    statuses = []
+    for _ in requirements:
+        roll = rng.random() * 100
+        statuses.append("Match" if roll < score else "Weak" if roll < score + 15 else "Missing")
+    return {
+        "match_count": statuses.count("Match"),
+        "total_must_haves": len(requirements),
+        "score": score,
+        "justification": f"Meets {statuses.count('Match')} of {len(requirements)} must-haves.",
+        "gap_analysis": [
+            {"requirement": requirement, "status": status, "note": "" if status == "Match" else f"No evidence of {requirement}"}
+            for requirement, status in zip(requirements, statuses)
+        ],
+    }
+
+
+def application_rows(
+    rng: random.Random, start_id: int, count: int, candidate_ids: range, job_ids: range, now: datetime,
+) -> Iterator[Dict[str, Any]]:
+    """(candidate, job) pairs are unique: candidate k % C gets jobs k // C, k // C + 1, ... offset per candidate."""
+    candidates, jobs = len(candidate_ids), len(job_ids)
+    statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    requirements_cache: Dict[int, List[str]] = {}
+    for k in range(count):
+        candidate = k % candidates
+        job_id = job_ids[(k // candidates + candidate * 7919) % jobs]
+        requirements = requirements_cache.get(job_id)
+        if requirements is None:
+            if len(requirements_cache) > 10000:
+                requirements_cache.clear()
+            requirements = requirements_cache[job_id] = job_requirements(job_id)
+        analysis = screening_result(rng, requirements)
+        status = rng.choices(statuses, weights)[0]
+        yield {
+            "id": start_id + k,
+            "user_id": candidate_ids[candidate],
+            "job_id": job_id,
+            "status": status,
+            "resume_path": f"uploads/{candidate_ids[candidate]}_{job_id}_resume.pdf",
+            "resume_hash": f"{candidate_ids[candidate]:064x}",
+            "ai_score": analysis["score"],
+            "ai_analysis": analysis,
+            "is_reviewed": status != "APPLIED" or rng.random() < 0.1,
+            "created_at": now - timedelta(days=rng.uniform(0, 180)),
+            "version": 1,
+        }
+
+
+def profile_rows(rng: random.Random, candidate_ids: range, now: datetime) -> Iterator[Dict[str, Any]]:
+    for user_id in candidate_ids:
+        yield {
+            "user_id": user_id,
+            "content_hash": f"{user_id:064x}",
+            "titles": rng.sample(TITLES, rng.randint(1, 3)),
+            "employers": rng.sample(COMPANIES, rng.randint(1, 3)),
+            "extracted_at": now,
+        }
+
+
+def skill_rows(rng: random.Random, candidate_ids: range) -> Iterator[Dict[str, Any]]:
+    """A few canonical skills per candidate, most with years of experience."""
+    skills = [normalize_skill(skill) for skill in SKILLS]
+    for user_id in candidate_ids:
+        for skill in rng.sample(skills, rng.randint(3, 8)):
+            years = None if rng.random() < 0.2 else round(min(30.0, rng.expovariate(1 / 4)), 1)
+            yield {"user_id": user_id, "skill": skill, "years": years}
+
+
+def batched(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Loader:
+    """Writes batches of column dicts with COPY on Postgres, executemany elsewhere."""
+
+    def __init__(self, conn: AsyncConnection):
+        self.conn = conn
+        self.use_copy = conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg"
+
+    async def load(self, table: Any, batch: List[Dict[str, Any]], json_columns: tuple = ()) -> None:
+        if not self.use_copy:
+            await self.conn.execute(insert(table), batch)
+            return
+        columns = list(batch[0])
+        records = [
+            tuple(orjson.dumps(row[c]).decode() if c in json_columns else row[c] for c in columns)
+            for row in batch
+        ]
+        raw = await self.conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(table.name, records=records, columns=columns)
+
+    async def next_id(self, table: Any) -> int:
+        return (await self.conn.scalar(select(func.coalesce(func.max(table.c.id), 0)))) + 1
+
+    async def sync_sequence(self, table: Any) -> None:
+        if self.conn.dialect.name == "postgresql" and "id" in table.c:
+            await self.conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), (SELECT MAX(id) FROM \"{table.name}\"))"
+            ))
+
+
+async def generate(
+    engine: AsyncEngine,
+    users: int,
+    jobs: int,
+    applications: int,
+    client_ratio: float = 0.02,
+    batch_size: int = 5000,
+    seed: int = 42,
+    report: Optional[Callable[[str], None]] = print,
+) -> Dict[str, int]:
+    """Append synthetic rows to the database behind `engine`. Returns rows written per table."""
+    from app.core.security import get_password_hash
+    from app.db.base import Base
+    from app.models import Application, CandidateProfile, CandidateSkill, Job, JobRequirement, User  # noqa: F401  (registers every table)
+
+    rng = random.Random(seed)
+    now = _now()
+    # bcrypt is deliberately slow; hash once and share it
+    hashed_password = get_password_hash(DEFAULT_PASSWORD)
+    user_table, job_table, application_table = User.__table__, Job.__table__, Application.__table__
+    # Generated columns are computed by the database
+    application_columns = [c.name for c in application_table.columns if c.computed is None]
+
+    clients = max(1, int(users * client_ratio))
+    candidates = max(1, users - clients)
+    applications = min(applications, candidates * jobs)
+    counts: Dict[str, int] = {}
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def load_table(name: str, table: Any, rows: Iterator[Dict[str, Any]], json_columns: tuple = ()) -> None:
+        started = time.perf_counter()
+        written = 0
+        async with engine.begin() as conn:
+            loader = Loader(conn)
+            for batch in batched(rows, batch_size):
+                await loader.load(table, batch, json_columns)
+                written += len(batch)
+            await loader.sync_sequence(table)
+        elapsed = time.perf_counter() - started
+        counts[name] = counts.get(name, 0) + written
+        if report:
+            report(f"{name:<14} {written:>10,} rows  {elapsed:8.1f}s  {written / max(elapsed, 1e-9):>10,.0f} rows/s")
+
+    async with engine.connect() as conn:
+        loader = Loader(conn)
+        first_user, first_job, first_application = (
+            await loader.next_id(user_table), await loader.next_id(job_table), await loader.next_id(application_table)
+        )
+
+    client_ids = range(first_user, first_user + clients)
+    candidate_ids = range(client_ids.stop, client_ids.stop + candidates)
+    job_ids = range(first_job, first_job + jobs)
+
+    await load_table("users:client", user_table, user_rows(rng, client_ids.start, clients, "CLIENT", hashed_password))
+    await load_table("users:candidate", user_table, user_rows(rng, candidate_ids.start, candidates, "CANDIDATE", hashed_password))
+    # Replaying the jobs' random stream gives their requirements without holding the jobs in memory
+    jobs_state = rng.getstate()
+    await load_table("jobs", job_table, job_rows(rng, first_job, jobs, client_ids, now))
+    replay = random.Random()
+    replay.setstate(jobs_state)
+    await load_table("requirements", JobRequirement.__table__, requirement_rows(job_rows(replay, first_job, jobs, client_ids, now)))
+    rows = (
+        {name: row[name] for name in application_columns}
+        for row in application_rows(rng, first_application, applications, candidate_ids, job_ids, now)
+    )
+    await load_table("applications", application_table, rows, json_columns=("ai_analysis",))
+    await load_table("profiles", CandidateProfile.__table__, profile_rows(rng, candidate_ids, now), json_columns=("titles", "employers"))
+    await load_table("skills", CandidateSkill.__table__, skill_rows(rng, candidate_ids))
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--applications", type=int, default=50000)
+    parser.add_argument("--client-ratio", type=float, default=0.02, help="Share of users that are clients")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    os.environ.setdefault("DATABASE_URL", args.database_url)
+
+    async def run() -> None:
+        engine = create_async_engine(args.database_url)
+        try:
+            await generate(engine, args.users, args.jobs, args.applications, args.client_ratio, args.batch_size, args.seed)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
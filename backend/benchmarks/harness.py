@@ -0,0 +1,142 @@
+"""
+Timing, query counting and baseline gating for the endpoint benchmarks (bench_endpoints.py).
+
+Each measurement runs a request `rounds` times after a warm-up and records the median
+and p95 latency and the number of SQL statements one call issues. Results are compared
+with the stored baseline for the database dialect (benchmarks/baselines/<dialect>.json):
+
+    - more queries than the baseline fails (query counts are deterministic)
+    - a median slower than baseline * (1 + BENCH_TOLERANCE) + BENCH_SLACK_MS fails
+
+BENCH_UPDATE_BASELINE=1 skips gating and rewrites the baseline from this run instead.
+Every run also writes its results to benchmarks/.results/<dialect>.json.
+"""
+import os
+import platform
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(HERE, "baselines")
+RESULTS_DIR = os.path.join(HERE, ".results")
+
+TOLERANCE = float(os.environ.get("BENCH_TOLERANCE", "1.0"))
+SLACK_MS = float(os.environ.get("BENCH_SLACK_MS", "2.0"))
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", "30"))
+WARMUP = int(os.environ.get("BENCH_WARMUP", "3"))
+UPDATE_BASELINE = os.environ.get("BENCH_UPDATE_BASELINE") == "1"
+
+
+class QueryCounter:
+    """Counts statements executed on a (sync) engine while attached."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+class BenchmarkRegressionError(AssertionError):
+    pass
+
+
+class Bench:
+    def __init__(self, engine: Engine, dialect: str, meta: Optional[Dict[str, Any]] = None):
+        self.engine = engine
+        self.dialect = dialect
+        self.meta = meta or {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.baseline = self._load(os.path.join(BASELINE_DIR, f"{dialect}.json")).get("results", {})
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, Any]:
+        if not os.path.exists(path):
+            return {}
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    async def __call__(
+        self,
+        name: str,
+        request: Callable[[], Awaitable[Any]],
+        rounds: int = ROUNDS,
+        warmup: int = WARMUP,
+        expect_status: int = 200,
+    ) -> Dict[str, Any]:
+        for _ in range(warmup):
+            await request()
+
+        timings = []
+        queries = None
+        for _ in range(rounds):
+            with QueryCounter(self.engine) as counter:
+                started = time.perf_counter()
+                response = await request()
+                elapsed = time.perf_counter() - started
+            if response.status_code != expect_status:
+                raise AssertionError(f"{name}: expected {expect_status}, got {response.status_code}: {response.text[:200]}")
+            timings.append(elapsed * 1000)
+            queries = counter.count if queries is None else max(queries, counter.count)
+
+        timings.sort()
+        result = {
+            "median_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            "min_ms": round(timings[0], 3),
+            "queries": queries,
+            "rounds": rounds,
+        }
+        self.results[name] = result
+        if not UPDATE_BASELINE:
+            self.check(name, result)
+        return result
+
+    def check(self, name: str, result: Dict[str, Any]) -> None:
+        baseline = self.baseline.get(name)
+        if baseline is None:
+            return
+        problems = []
+        if result["queries"] > baseline["queries"]:
+            problems.append(f"queries {baseline['queries']} -> {result['queries']}")
+        limit = baseline["median_ms"] * (1 + TOLERANCE) + SLACK_MS
+        if result["median_ms"] > limit:
+            problems.append(f"median {baseline['median_ms']:.2f}ms -> {result['median_ms']:.2f}ms (limit {limit:.2f}ms)")
+        if problems:
+            raise BenchmarkRegressionError(f"{name} regressed: " + "; ".join(problems))
+
+    def _document(self) -> Dict[str, Any]:
+        meta = {"dialect": self.dialect, "python": platform.python_version(), "machine": platform.machine(), **self.meta}
+        return {"meta": meta, "results": dict(sorted(self.results.items()))}
+
+    def save(self) -> None:
+        if not self.results:
+            return
+        targets = [os.path.join(RESULTS_DIR, f"{self.dialect}.json")]
+        if UPDATE_BASELINE:
+            targets.append(os.path.join(BASELINE_DIR, f"{self.dialect}.json"))
+        for path in targets:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(self._document(), option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+
+    def report(self) -> str:
+        lines = [f"{'benchmark':<48} {'median':>9} {'p95':>9} {'queries':>8} {'baseline':>9}"]
+        for name, result in sorted(self.results.items()):
+            baseline = self.baseline.get(name)
+            reference = f"{baseline['median_ms']:>9.2f}" if baseline else f"{'-':>9}"
+            lines.append(f"{name:<48} {result['median_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['queries']:>8} {reference}")
+        return "\n".join(lines)
@@ -0,0 +1,305 @@
+"""Load-test harness: drives the ASGI app in-process through role-based scenarios.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --duration 30 --concurrency 20
+    python -m benchmarks.load_test --database-url postgresql+asyncpg://... --no-generate --json results.json
+
+Virtual users log in as generated accounts (see benchmarks/datagen.py) and loop over
+a scenario for their role until --duration runs out:
+
+    candidate  browse/search jobs, open one, apply with a small real PDF, list own applications
+    recruiter  list own jobs, open a job's applicants, mark reviewed, move a status,
+               occasionally bulk-reject low scorers or export applicants as CSV
+
+The LLM is stubbed (ai_screening_service.evaluate_candidate) with a configurable
+latency, so runs measure the API and database rather than a remote model. Requests go
+through httpx's ASGITransport, i.e. the full middleware stack without a socket.
+
+By default everything runs in a fresh temporary directory (SQLite database and
+uploads/) that is seeded with --users/--jobs/--applications first. Throughput and
+latency percentiles are reported per endpoint.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from benchmarks.datagen import DEFAULT_PASSWORD, EMAIL_DOMAIN, generate, screening_result
+
+
+def fake_pdf(text: str) -> bytes:
+    """A minimal one-page PDF whose text pypdf can extract."""
+    content = f"BT /F1 12 Tf 72 720 Td ({text.replace('(', '').replace(')', '')}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, name: str, seconds: float, ok: bool) -> None:
+        self.latencies[name].append(seconds * 1000)
+        if not ok:
+            self.errors[name] += 1
+
+    def summary(self) -> List[Dict[str, Any]]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        rows = []
+        for name in sorted(self.latencies):
+            samples = sorted(self.latencies[name])
+            cuts = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+            rows.append({
+                "endpoint": name,
+                "requests": len(samples),
+                "errors": self.errors[name],
+                "rps": len(samples) / elapsed,
+                "p50_ms": cuts[49],
+                "p90_ms": cuts[89],
+                "p95_ms": cuts[94],
+                "p99_ms": cuts[98],
+                "max_ms": samples[-1],
+            })
+        return rows
+
+    def report(self) -> str:
+        lines = [f"{'endpoint':<44} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}"]
+        total = 0
+        for row in self.summary():
+            total += row["requests"]
+            lines.append(
+                f"{row['endpoint']:<44} {row['requests']:>7} {row['errors']:>5} {row['rps']:>8.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p90_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+            )
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        lines.append(f"{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s); latencies in ms")
+        return "\n".join(lines)
+
+
+class VirtualUser:
+    def __init__(self, client: Any, stats: Stats, rng: random.Random, email: str, role: str, think: float):
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.email = email
+        self.role = role
+        self.think = think
+        self.headers: Dict[str, str] = {}
+
+    async def call(self, name: str, method: str, url: str, expect: tuple = (200,), **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+            ok = response.status_code in expect
+        except Exception as e:
+            print(f"[LOADTEST] {name}: {e}", file=sys.stderr)
+            response, ok = None, False
+        self.stats.record(name, time.perf_counter() - started, ok)
+        if self.think:
+            await asyncio.sleep(self.rng.uniform(0, 2 * self.think))
+        return response if ok else None
+
+    async def login(self) -> bool:
+        response = await self.call(
+            "POST /auth/login/access-token", "POST", "/api/v1/auth/login/access-token",
+            params={"role": self.role}, data={"username": self.email, "password": DEFAULT_PASSWORD},
+        )
+        if response is None:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    async def candidate_iteration(self) -> None:
+        params = {"limit": 20}
+        if self.rng.random() < 0.5:
+            params["search"] = self.rng.choice(["Engineer", "Data", "Python", "Developer", "Security"])
+        if self.rng.random() < 0.3:
+            params["location"] = self.rng.choice(["Remote", "Austin", "Seattle", "New York"])
+        response = await self.call("GET /jobs/", "GET", "/api/v1/jobs/", params=params)
+        jobs = response.json() if response is not None else []
+        if not jobs:
+            return
+        job = self.rng.choice(jobs)
+        await self.call("GET /jobs/{id}", "GET", f"/api/v1/jobs/{job['id']}")
+        if self.rng.random() < 0.3:
+            await self.call(
+                "POST /applications/", "POST", "/api/v1/applications/",
+                data={"job_id": str(job["id"]), "force_update": "true"},
+                files={"resume": ("resume.pdf", fake_pdf(f"{self.email} resume: {job['requirements']}"), "application/pdf")},
+            )
+        await self.call("GET /applications/me", "GET", "/api/v1/applications/me")
+
+    async def recruiter_iteration(self) -> None:
+        response = await self.call("GET /jobs/", "GET", "/api/v1/jobs/", params={"limit": 50})
+        jobs = response.json() if response is not None else []
+        if not jobs:
+            return
+        job_id = self.rng.choice(jobs)["id"]
+        response = await self.call("GET /jobs/{id}/applications", "GET", f"/api/v1/jobs/{job_id}/applications")
+        applications = response.json() if response is not None else []
+        if applications:
+            application = self.rng.choice(applications)
+            await self.call("PATCH /applications/{id}/reviewed", "PATCH", f"/api/v1/applications/{application['id']}/reviewed")
+            await self.call(
+                "PATCH /applications/{id}/status", "PATCH", f"/api/v1/applications/{application['id']}/status",
+                params={"status": self.rng.choice(["REVIEWING", "INTERVIEW", "REJECTED"])},
+            )
+        roll = self.rng.random()
+        if roll < 0.1:
+            await self.call(
+                "PATCH /applications/bulk/status", "PATCH", "/api/v1/applications/bulk/status",
+                json={"status": "REJECTED", "filter": {"job_id": job_id, "ai_score_lt": 30, "status": ["APPLIED"]}},
+            )
+        elif roll < 0.15:
+            await self.call("GET /jobs/{id}/applications/export", "GET", f"/api/v1/jobs/{job_id}/applications/export")
+
+    async def run(self, deadline: float) -> None:
+        if not await self.login():
+            return
+        iteration = self.candidate_iteration if self.role == "candidate" else self.recruiter_iteration
+        while time.perf_counter() < deadline:
+            await iteration()
+
+
+async def stub_evaluate_candidate(
+    resume_text: str, job_title: str, must_have_requirements: str, nice_to_have_requirements: str = None,
+    latency: float = 0.0, rng: random.Random = random.Random(7),
+) -> Dict[str, Any]:
+    if latency:
+        await asyncio.sleep(latency)
+    requirements = [r.strip() for r in (must_have_requirements or "").split(",") if r.strip()] or ["General"]
+    return screening_result(rng, requirements)
+
+
+async def stub_extract_profile(resume_text: str, latency: float = 0.0) -> Dict[str, Any]:
+    from app.services.ai_screening import AIScreeningService
+
+    if latency:
+        await asyncio.sleep(latency)
+    return AIScreeningService.keyword_profile(resume_text)
+
+
+async def run(args: argparse.Namespace) -> Stats:
+    from unittest.mock import patch
+
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import select
+
+    from app.db.init_db import init_db
+    from app.db.session import AsyncSessionLocal, engine
+    from app.main import app
+    from app.models.job import Job
+    from app.models.user import User, UserRole
+    from app.services.ai_screening import ai_screening_service
+
+    # The app engine echoes every statement; logging would dominate the measurements
+    engine.echo = args.echo
+    await init_db(engine)
+    if not args.no_generate:
+        await generate(engine, args.users, args.jobs, args.applications, batch_size=args.batch_size)
+
+    async with AsyncSessionLocal() as db:
+        candidates = (await db.execute(
+            select(User.email).where(User.role == UserRole.CANDIDATE, User.email.like(f"%@{EMAIL_DOMAIN}")).limit(1000)
+        )).scalars().all()
+        recruiters = (await db.execute(
+            select(User.email).where(User.role == UserRole.CLIENT, User.email.like(f"%@{EMAIL_DOMAIN}"))
+            .where(User.id.in_(select(Job.owner_id))).limit(1000)
+        )).scalars().all()
+    if not candidates or not recruiters:
+        raise SystemExit("No generated accounts found; run without --no-generate or run benchmarks.datagen first")
+
+    rng = random.Random(args.seed)
+    stats = Stats()
+
+    async def evaluate(**kwargs: Any) -> Dict[str, Any]:
+        return await stub_evaluate_candidate(**kwargs, latency=args.llm_latency_ms / 1000, rng=rng)
+
+    async def extract(resume_text: str) -> Dict[str, Any]:
+        return await stub_extract_profile(resume_text, latency=args.llm_latency_ms / 1000)
+
+    transport = ASGITransport(app=app)
+    with patch.object(ai_screening_service, "evaluate_candidate", evaluate), \
+            patch.object(ai_screening_service, "extract_profile", extract):
+        async with AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+            users = []
+            for i in range(args.concurrency):
+                if rng.random() < args.recruiter_share:
+                    email, role = rng.choice(recruiters), "client"
+                else:
+                    email, role = rng.choice(candidates), "candidate"
+                users.append(VirtualUser(client, stats, random.Random(args.seed + i), email, role, args.think_ms / 1000))
+            stats.started = time.perf_counter()
+            deadline = stats.started + args.duration
+            await asyncio.gather(*(user.run(deadline) for user in users))
+            stats.finished = time.perf_counter()
+    await engine.dispose()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--database-url", help="Defaults to a SQLite file in the working directory")
+    parser.add_argument("--workdir", help="Where the database and uploads/ go (default: a new temp dir)")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--recruiter-share", type=float, default=0.2)
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean pause between a user's requests")
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="Simulated screening latency")
+    parser.add_argument("--no-generate", action="store_true", help="Use existing data instead of seeding")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--applications", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--echo", action="store_true", help="Keep SQL statement logging on")
+    parser.add_argument("--json", help="Also write the per-endpoint summary to this file")
+    args = parser.parse_args()
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="loadtest-"))
+    os.makedirs(workdir, exist_ok=True)
+    json_path = os.path.abspath(args.json) if args.json else None
+    # The app resolves uploads/ (and a relative SQLite path) against the working directory
+    os.chdir(workdir)
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite+aiosqlite:///{os.path.join(workdir, 'loadtest.db')}"
+    os.environ.setdefault("SECRET_KEY", "loadtest")
+    # Keep runs self-contained: no outgoing email
+    os.environ["SMTP_USER"] = ""
+    os.environ["SMTP_PASSWORD"] = ""
+    print(f"Working directory: {workdir}")
+
+    stats = asyncio.run(run(args))
+    print(stats.report())
+    if json_path:
+        with open(json_path, "wb") as f:
+            f.write(orjson.dumps(stats.summary(), option=orjson.OPT_INDENT_2))
+
+
+if __name__ == "__main__":
+    main()
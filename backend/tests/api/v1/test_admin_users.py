@@ -0,0 +1,53 @@
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import assert_max_queries, get_auth_headers, make_candidate_payload, make_client_payload
+
+
+@pytest.mark.asyncio
+async def test_admin_user_search(client: AsyncClient):
+    for payload in (
+        make_candidate_payload("quillon.first@test.com", first_name="Quillon", last_name="Marsh", city="Austin", state="TX"),
+        make_candidate_payload("second_quillon@test.com", first_name="Quillon", last_name="Brook", city="Denver", state="CO"),
+        make_client_payload("hiring@quillonworks.com", company_name="Quillonworks"),
+    ):
+        assert (await client.post("/api/v1/auth/signup", json=payload)).status_code == 200
+
+    url = "/api/v1/admin/users"
+    candidate = await get_auth_headers(client, "quillon.first@test.com", "candidate")
+    assert (await client.get(url, params={"q": "quillon"}, headers=candidate)).status_code == 403
+
+    admin = await get_auth_headers(client, "users_admin@test.com", "admin")
+    # Page and total in one query, after the auth lookup
+    with assert_max_queries(2):
+        response = await client.get(url, params={"q": "Quillon"}, headers=admin)
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == "3"
+    assert {user["email"] for user in response.json()} == {
+        "quillon.first@test.com", "second_quillon@test.com", "hiring@quillonworks.com",
+    }
+
+    # Every word must match, in any field
+    response = await client.get(url, params={"q": "quillon austin"}, headers=admin)
+    assert [user["email"] for user in response.json()] == ["quillon.first@test.com"]
+
+    # Filters apply to the total too; a page past the end still reports it
+    params = {"q": "quillon", "role": "candidate", "limit": 1}
+    response = await client.get(url, params=params, headers=admin)
+    assert len(response.json()) == 1 and response.headers["X-Total-Count"] == "2"
+    response = await client.get(url, params={**params, "skip": 5}, headers=admin)
+    assert response.json() == [] and response.headers["X-Total-Count"] == "2"
+
+    # Exact email match ranks first
+    response = await client.get(url, params={"q": "second_quillon@test.com"}, headers=admin)
+    second = response.json()[0]
+    assert second["email"] == "second_quillon@test.com"
+    await client.put(f"/api/v1/admin/users/{second['id']}/status", params={"is_active": False}, headers=admin)
+    response = await client.get(url, params={"q": "quillon", "is_active": False}, headers=admin)
+    assert [user["email"] for user in response.json()] == ["second_quillon@test.com"]
+    response = await client.get(url, params={"q": "quillon", "is_active": True}, headers=admin)
+    assert response.headers["X-Total-Count"] == "2"
+
+    # LIKE wildcards in the query are literal
+    response = await client.get(url, params={"q": "quill%n"}, headers=admin)
+    assert response.json() == [] and response.headers["X-Total-Count"] == "0"
@@ -0,0 +1,130 @@
+import csv
+import io
+import re
+import zipfile
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from tests.conftest import get_auth_headers
+
+
+async def create_job_with_applicants(client: AsyncClient, prefix: str) -> tuple:
+    recruiter_headers = await get_auth_headers(client, f"{prefix}_recruiter@test.com", "client")
+    response = await client.post(
+        "/api/v1/jobs/", json={"title": f"{prefix} job", "description": "Export"}, headers=recruiter_headers
+    )
+    job_id = response.json()["id"]
+
+    results = {
+        f"{prefix}_low@test.com": {
+            "match_count": 1, "total_must_haves": 2, "score": 40, "justification": "Lacks k8s",
+            "gap_analysis": [
+                {"requirement": "Kubernetes", "status": "Missing", "note": ""},
+                {"requirement": "Python", "status": "Match", "note": ""},
+            ],
+        },
+        f"{prefix}_high@test.com": {
+            "match_count": 2, "total_must_haves": 2, "score": 95, "justification": "Strong",
+            "gap_analysis": [
+                {"requirement": "Kubernetes", "status": "Weak", "note": ""},
+                {"requirement": "Python", "status": "Match", "note": ""},
+            ],
+        },
+    }
+    for email, ai_result in results.items():
+        candidate_headers = await get_auth_headers(client, email, "candidate")
+        with patch("app.services.ai_screening.ai_screening_service.evaluate_candidate") as mock_eval:
+            mock_eval.return_value = ai_result
+            await client.post(
+                "/api/v1/applications/",
+                data={"job_id": str(job_id)},
+                files={"resume": ("export.pdf", io.BytesIO(b"fake pdf"), "application/pdf")},
+                headers=candidate_headers,
+            )
+    return job_id, recruiter_headers
+
+
+@pytest.mark.asyncio
+async def test_csv_export_with_selected_and_gap_columns(client: AsyncClient):
+    job_id, headers = await create_job_with_applicants(client, "csvexp")
+
+    with patch.object(settings, "APPLICANT_EXPORT_BATCH_SIZE", 1):
+        response = await client.get(
+            f"/api/v1/jobs/{job_id}/applications/export",
+            params={"columns": "email,ai_score,match_count,justification,gap_missing,gap_weak,gap_matched"},
+            headers=headers,
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert f"job-{job_id}-applicants.csv" in response.headers["content-disposition"]
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows == [
+        ["email", "ai_score", "match_count", "justification", "gap_missing", "gap_weak", "gap_matched"],
+        ["csvexp_high@test.com", "95", "2", "Strong", "", "Kubernetes", "Python"],
+        ["csvexp_low@test.com", "40", "1", "Lacks k8s", "Kubernetes", "", "Python"],
+    ]
+
+    response = await client.get(
+        f"/api/v1/jobs/{job_id}/applications/export",
+        params={"columns": "email", "missing_requirement": "Kubernetes"},
+        headers=headers,
+    )
+    assert response.text.split() == ["email", "csvexp_low@test.com"]
+
+
+@pytest.mark.asyncio
+async def test_xlsx_export_is_a_valid_workbook(client: AsyncClient):
+    job_id, headers = await create_job_with_applicants(client, "xlsxexp")
+
+    response = await client.get(
+        f"/api/v1/jobs/{job_id}/applications/export",
+        params={"format": "xlsx", "columns": "name,email,ai_score,is_reviewed"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+    workbook = zipfile.ZipFile(io.BytesIO(response.content))
+    assert workbook.testzip() is None
+    sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+    rows = re.findall(r"<row>(.*?)</row>", sheet)
+    assert len(rows) == 3
+    assert "xlsxexp_high@test.com" in rows[1]
+    assert "<c><v>95</v></c>" in rows[1]
+    assert '<c t="b"><v>0</v></c>' in rows[1]
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_columns_and_other_owners(client: AsyncClient):
+    job_id, headers = await create_job_with_applicants(client, "authexp")
+
+    response = await client.get(
+        f"/api/v1/jobs/{job_id}/applications/export", params={"columns": "email,password"}, headers=headers
+    )
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+    other_headers = await get_auth_headers(client, "authexp_other@test.com", "client")
+    response = await client.get(f"/api/v1/jobs/{job_id}/applications/export", headers=other_headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_export_escapes_formula_text(client: AsyncClient):
+    job_id, headers = await create_job_with_applicants(client, "formulaexp")
+    candidate = await get_auth_headers(client, "formulaexp_low@test.com", "candidate")
+    response = await client.put("/api/v1/users/me", json={"first_name": "=HYPERLINK(\"http://x\")", "last_name": ""}, headers=candidate)
+    assert response.status_code == 200
+
+    params = {"columns": "name,ai_score", "missing_requirement": "Kubernetes"}
+    response = await client.get(f"/api/v1/jobs/{job_id}/applications/export", params=params, headers=headers)
+    assert list(csv.reader(io.StringIO(response.text)))[1] == ["'=HYPERLINK(\"http://x\")", "40"]
+
+    response = await client.get(f"/api/v1/jobs/{job_id}/applications/export", params={**params, "format": "xlsx"}, headers=headers)
+    sheet = zipfile.ZipFile(io.BytesIO(response.content)).read("xl/worksheets/sheet1.xml").decode()
+    assert "<t xml:space=\"preserve\">'=HYPERLINK(\"http://x\")</t>" in sheet
+    assert "<c><v>40</v></c>" in sheet
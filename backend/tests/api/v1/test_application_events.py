@@ -0,0 +1,225 @@
+import asyncio
+import io
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.events import EventBroker, PostgresNotifyBackend, RESYNC_EVENT, event_broker, job_topic, candidate_topic, sse_stream
+from app.core.query_cache import QueryCache
+from tests.conftest import get_auth_headers
+
+
+async def create_job(client: AsyncClient, headers: dict, title: str) -> int:
+    response = await client.post("/api/v1/jobs/", json={"title": title, "description": "Events"}, headers=headers)
+    return response.json()["id"]
+
+
+def drain(subscription) -> list:
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+# ───────────────────────────────────────────────────
+# Broker
+# ───────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_broker_fan_out_and_bounded_buffer():
+    broker = EventBroker()
+    fast = broker.subscribe("job:1", maxsize=10)
+    slow = broker.subscribe("job:1", "candidate:2", maxsize=2)
+
+    for i in range(3):
+        await broker.publish(["job:1"], {"type": "application.created", "application_id": i})
+
+    assert [e["application_id"] for e in drain(fast)] == [0, 1, 2]
+    # The slow subscriber is told to resync, then gets the newest events
+    assert await slow.get(timeout=0.1) == RESYNC_EVENT
+    assert [e["application_id"] for e in drain(slow)] == [1, 2]
+
+    slow.close()
+    assert broker.subscriber_count("candidate:2") == 0
+    assert broker.subscriber_count("job:1") == 1
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_formats_events_and_heartbeats():
+    broker = EventBroker()
+    subscription = broker.subscribe("job:5")
+
+    class FakeRequest:
+        checks = 0
+
+        async def is_disconnected(self):
+            self.checks += 1
+            return self.checks > 2
+
+    await broker.publish(["job:5"], {"type": "application.reviewed", "is_reviewed": True})
+    frames = [frame async for frame in sse_stream(FakeRequest(), subscription, heartbeat=0.01)]
+
+    assert frames[0].startswith(b"retry:")
+    assert frames[1] == b'event: application.reviewed\ndata: {"type":"application.reviewed","is_reviewed":true}\n\n'
+    assert frames[2] == b": keep-alive\n\n"
+    # Closing the stream unsubscribes
+    assert broker.subscriber_count("job:5") == 0
+
+
+class FakeConnection:
+    """Stands in for an asyncpg connection to a Postgres that can go away."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.termination_listeners = []
+        self.notified = []
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    async def execute(self, query, channel, payload):
+        self.notified.append(payload)
+        self.listeners[channel](self, 0, channel, payload)
+
+    async def close(self):
+        self.drop()
+
+    def drop(self):
+        for callback in self.termination_listeners:
+            callback(self)
+
+
+@pytest.mark.asyncio
+async def test_postgres_backend_reconnects_and_resyncs(monkeypatch):
+    import asyncpg
+
+    connections, failures = [], [ConnectionRefusedError("restarting")]
+
+    async def connect(dsn):
+        if len(connections) == 1 and failures:
+            raise failures.pop()
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    monkeypatch.setattr(settings, "EVENT_RECONNECT_BASE_SECONDS", 0.01)
+    broker = EventBroker(PostgresNotifyBackend("postgresql+asyncpg://db/app"))
+    invalidations = []
+    broker.add_listener("cache:jobs", invalidations.append)
+    cache = QueryCache("resync", size=4, ttl=60, local_ttl=60, broker=broker)
+    subscription = broker.subscribe("job:1", "candidate:2")
+    await broker.start()
+
+    async def load():
+        return "cached"
+
+    await cache.get_or_load("k", ["t"], load)
+    connections[0].drop()
+    # Publishing while disconnected is logged and dropped
+    await broker.publish(["job:1"], {"type": "application.created"})
+    for _ in range(100):
+        if broker.backend._conn is not None:
+            break
+        await asyncio.sleep(0.01)
+
+    # The second attempt succeeded and listens again
+    assert len(connections) == 2 and "application_events" in connections[1].listeners
+    assert invalidations == [RESYNC_EVENT]
+    assert drain(subscription) == [RESYNC_EVENT]
+    # Invalidations may have been missed, so cached entries are dropped
+    assert not cache._local
+
+    await broker.publish(["job:1"], {"type": "application.reviewed"})
+    assert [event["type"] for event in drain(subscription)] == ["application.reviewed"]
+
+    # Closing on shutdown does not reconnect
+    await broker.stop()
+    await asyncio.sleep(0.05)
+    assert len(connections) == 2
+
+
+# ───────────────────────────────────────────────────
+# Endpoints publish deltas
+# ───────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_application_lifecycle_publishes_events(client: AsyncClient):
+    recruiter_headers = await get_auth_headers(client, "events_recruiter@test.com", "client")
+    job_id = await create_job(client, recruiter_headers, "Events Job")
+    candidate_headers = await get_auth_headers(client, "events_candidate@test.com", "candidate")
+
+    job_events = event_broker.subscribe(job_topic(job_id))
+    try:
+        apply_res = await client.post(
+            "/api/v1/applications/",
+            data={"job_id": str(job_id)},
+            files={"resume": ("events.pdf", io.BytesIO(b"fake pdf"), "application/pdf")},
+            headers=candidate_headers,
+        )
+        assert apply_res.status_code == 200
+        app_id = apply_res.json()["id"]
+        user_id = apply_res.json()["user_id"]
+        candidate_events = event_broker.subscribe(candidate_topic(user_id))
+
+        reviewed = await client.patch(f"/api/v1/applications/{app_id}/reviewed", headers=recruiter_headers)
+        assert reviewed.status_code == 200
+        status_res = await client.patch(
+            f"/api/v1/applications/{app_id}/status", params={"status": "INTERVIEW"}, headers=recruiter_headers
+        )
+        assert status_res.status_code == 200
+        assert status_res.json()["status"] == "INTERVIEW"
+
+        events = drain(job_events)
+        assert [e["type"] for e in events] == [
+            "application.created",
+            "application.screened",
+            "application.reviewed",
+            "application.status_changed",
+        ]
+        assert events[1]["ai_score"] == 100
+        assert events[3]["previous_status"] == "APPLIED"
+        assert all(e["application_id"] == app_id for e in events)
+
+        assert [e["type"] for e in drain(candidate_events)] == ["application.reviewed", "application.status_changed"]
+        candidate_events.close()
+    finally:
+        job_events.close()
+
+
+@pytest.mark.asyncio
+async def test_status_update_authorization(client: AsyncClient):
+    owner_headers = await get_auth_headers(client, "events_owner2@test.com", "client")
+    other_headers = await get_auth_headers(client, "events_other@test.com", "client")
+    candidate_headers = await get_auth_headers(client, "events_candidate2@test.com", "candidate")
+    job_id = await create_job(client, owner_headers, "Status Auth Job")
+    apply_res = await client.post(
+        "/api/v1/applications/",
+        data={"job_id": str(job_id)},
+        files={"resume": ("status.pdf", io.BytesIO(b"fake pdf"), "application/pdf")},
+        headers=candidate_headers,
+    )
+    app_id = apply_res.json()["id"]
+
+    for headers in (other_headers, candidate_headers):
+        response = await client.patch(
+            f"/api/v1/applications/{app_id}/status", params={"status": "REJECTED"}, headers=headers
+        )
+        assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_job_event_stream_authorization(client: AsyncClient):
+    owner_headers = await get_auth_headers(client, "events_owner3@test.com", "client")
+    other_headers = await get_auth_headers(client, "events_other3@test.com", "client")
+    job_id = await create_job(client, owner_headers, "Stream Auth Job")
+
+    unauthenticated = await client.get(f"/api/v1/jobs/{job_id}/applications/events")
+    assert unauthenticated.status_code == 401
+
+    token = other_headers["Authorization"].split()[1]
+    forbidden = await client.get(f"/api/v1/jobs/{job_id}/applications/events", params={"access_token": token})
+    assert forbidden.status_code == 403
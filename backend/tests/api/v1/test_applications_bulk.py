@@ -0,0 +1,207 @@
+import io
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from sqlalchemy import select
+
+from app.api.v1.endpoints.applications import _bulk_update
+from app.core.config import settings
+from app.core.events import event_broker, job_topic
+from app.models.application import Application
+from app.models.email_outbox import EmailOutbox
+from app.models.user import User
+from app.schemas.application import ApplicationBulkTarget
+from tests.conftest import TestingSessionLocal, get_auth_headers
+
+
+async def create_job_with_scored_applicants(client: AsyncClient, prefix: str, scores: list) -> tuple:
+    recruiter_headers = await get_auth_headers(client, f"{prefix}_recruiter@test.com", "client")
+    response = await client.post(
+        "/api/v1/jobs/", json={"title": f"{prefix} job", "description": "Bulk"}, headers=recruiter_headers
+    )
+    job_id = response.json()["id"]
+
+    app_ids = []
+    for i, score in enumerate(scores):
+        candidate_headers = await get_auth_headers(client, f"{prefix}_candidate{i}@test.com", "candidate")
+        with patch("app.services.ai_screening.ai_screening_service.evaluate_candidate") as mock_eval:
+            mock_eval.return_value = {"score": score, "match_count": 0, "total_must_haves": 1, "gap_analysis": []}
+            response = await client.post(
+                "/api/v1/applications/",
+                data={"job_id": str(job_id)},
+                files={"resume": ("bulk.pdf", io.BytesIO(b"fake pdf"), "application/pdf")},
+                headers=candidate_headers,
+            )
+        app_ids.append(response.json()["id"])
+    return job_id, recruiter_headers, app_ids
+
+
+async def statuses(client: AsyncClient, job_id: int, headers: dict) -> dict:
+    response = await client.get(f"/api/v1/jobs/{job_id}/applications", headers=headers)
+    return {a["id"]: (a["status"], a["is_reviewed"], a["version"]) for a in response.json()}
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_by_filter(client: AsyncClient):
+    job_id, headers, app_ids = await create_job_with_scored_applicants(client, "bulkfilter", [20, 35, 80])
+
+    job_events = event_broker.subscribe(job_topic(job_id))
+    try:
+        response = await client.patch(
+            "/api/v1/applications/bulk/status",
+            json={"status": "REJECTED", "filter": {"job_id": job_id, "ai_score_lt": 40}},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "updated": 2, "ids": app_ids[:2], "unchanged": [], "conflicts": [], "not_found": [],
+        }
+        events = [job_events.queue.get_nowait() for _ in range(job_events.queue.qsize())]
+        assert sorted(e["application_id"] for e in events) == app_ids[:2]
+        assert {e["status"] for e in events} == {"REJECTED"}
+    finally:
+        job_events.close()
+
+    current = await statuses(client, job_id, headers)
+    assert current[app_ids[0]] == ("REJECTED", False, 2)
+    assert current[app_ids[2]] == ("APPLIED", False, 1)
+
+    # Running it again changes nothing
+    response = await client.patch(
+        "/api/v1/applications/bulk/status",
+        json={"status": "REJECTED", "filter": {"job_id": job_id, "ai_score_lt": 40}},
+        headers=headers,
+    )
+    assert response.json()["updated"] == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_reviewed_by_ids_reports_unchanged_and_not_found(client: AsyncClient):
+    job_id, headers, app_ids = await create_job_with_scored_applicants(client, "bulkids", [50, 60])
+    _, other_headers, other_ids = await create_job_with_scored_applicants(client, "bulkother", [70])
+
+    await client.patch(f"/api/v1/applications/{app_ids[1]}/reviewed", headers=headers)
+    response = await client.patch(
+        "/api/v1/applications/bulk/reviewed",
+        json={"is_reviewed": True, "ids": [*app_ids, other_ids[0], 999999]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["ids"] == [app_ids[0]]
+    assert result["unchanged"] == [app_ids[1]]
+    # Applications on another recruiter's job are indistinguishable from missing ones
+    assert result["not_found"] == sorted([other_ids[0], 999999])
+
+    current = await statuses(client, job_id, headers)
+    assert all(is_reviewed for _, is_reviewed, _ in current.values())
+    other = await statuses(client, (await client.get("/api/v1/jobs/", headers=other_headers)).json()[0]["id"], other_headers)
+    assert other[other_ids[0]][1] is False
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_with_stale_version_is_a_conflict(client: AsyncClient):
+    job_id, headers, app_ids = await create_job_with_scored_applicants(client, "bulkversion", [10, 90])
+    versions = {app_id: version for app_id, (_, _, version) in (await statuses(client, job_id, headers)).items()}
+
+    # Someone else edits the first application in the meantime
+    await client.patch(f"/api/v1/applications/{app_ids[0]}/status", params={"status": "INTERVIEW"}, headers=headers)
+
+    response = await client.patch(
+        "/api/v1/applications/bulk/status",
+        json={"status": "OFFER", "items": [{"id": i, "version": versions[i]} for i in app_ids]},
+        headers=headers,
+    )
+    result = response.json()
+    assert result["ids"] == [app_ids[1]]
+    assert result["conflicts"] == [{"id": app_ids[0], "version": versions[app_ids[0]] + 1}]
+
+    current = await statuses(client, job_id, headers)
+    assert current[app_ids[0]][0] == "INTERVIEW"
+    assert current[app_ids[1]][0] == "OFFER"
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_validation_and_authorization(client: AsyncClient):
+    job_id, headers, app_ids = await create_job_with_scored_applicants(client, "bulkauth", [30])
+
+    response = await client.patch(
+        "/api/v1/applications/bulk/status",
+        json={"status": "REJECTED", "ids": app_ids, "filter": {"job_id": job_id}},
+        headers=headers,
+    )
+    assert response.status_code == 422
+
+    candidate_headers = await get_auth_headers(client, "bulkauth_candidate0@test.com", "candidate")
+    response = await client.patch(
+        "/api/v1/applications/bulk/reviewed", json={"is_reviewed": True, "ids": app_ids}, headers=candidate_headers
+    )
+    assert response.status_code == 403
+
+    # A filter on someone else's job matches nothing
+    intruder_headers = await get_auth_headers(client, "bulkauth_intruder@test.com", "client")
+    response = await client.patch(
+        "/api/v1/applications/bulk/status",
+        json={"status": "REJECTED", "filter": {"job_id": job_id}},
+        headers=intruder_headers,
+    )
+    assert response.json()["updated"] == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_emails_match_single_updates(client: AsyncClient):
+    job_id, headers, app_ids = await create_job_with_scored_applicants(client, "bulknotify", [50, 60])
+    candidates = ["bulknotify_candidate0@test.com", "bulknotify_candidate1@test.com"]
+
+    async def outbox_subjects() -> list:
+        async with TestingSessionLocal() as db:
+            result = await db.execute(select(EmailOutbox.subject).where(EmailOutbox.to_email.in_(candidates)))
+            return list(result.scalars().all())
+
+    with patch.multiple(settings, SMTP_USER="sender@test.com", SMTP_PASSWORD="secret"):
+        # Only ApplicationStatus values are accepted, as on PATCH /{id}/status
+        response = await client.patch(
+            "/api/v1/applications/bulk/status", json={"status": "SCREENING", "ids": app_ids}, headers=headers
+        )
+        assert response.status_code == 422
+
+        # REVIEWING is not announced to candidates; INTERVIEW is, once per application
+        for new_status in ("REVIEWING", "INTERVIEW"):
+            response = await client.patch(
+                "/api/v1/applications/bulk/status", json={"status": new_status, "ids": app_ids}, headers=headers
+            )
+            assert response.json()["updated"] == 2
+            if new_status == "REVIEWING":
+                assert await outbox_subjects() == []
+
+    assert await outbox_subjects() == ["Update on your application – bulknotify job"] * 2
+
+
+@pytest.mark.asyncio
+async def test_single_update_racing_a_bulk_update_conflicts(client: AsyncClient, db_session):
+    job_id, headers, [app_id] = await create_job_with_scored_applicants(client, "bulkrace", [50])
+
+    async def bulk_update_elsewhere() -> None:
+        async with TestingSessionLocal() as other:
+            recruiter = (await other.execute(select(User).where(User.email == "bulkrace_recruiter@test.com"))).scalar_one()
+            await _bulk_update(other, recruiter, ApplicationBulkTarget(ids=[app_id]), Application.status, "REJECTED")
+            await other.commit()
+
+    # The bulk update lands after the single-row update read the row, before it writes
+    commit = db_session.commit
+    async def racing_commit():
+        await bulk_update_elsewhere()
+        await commit()
+
+    with patch.object(db_session, "commit", racing_commit):
+        response = await client.patch(f"/api/v1/applications/{app_id}/reviewed", headers=headers)
+    assert response.status_code == 409
+    await db_session.rollback()
+
+    # Nothing of the losing write is kept; a retry sees the new version and succeeds
+    assert (await statuses(client, job_id, headers))[app_id] == ("REJECTED", False, 2)
+    response = await client.patch(f"/api/v1/applications/{app_id}/reviewed", headers=headers)
+    assert response.status_code == 200
+    assert (await statuses(client, job_id, headers))[app_id] == ("REJECTED", True, 3)
@@ -180,3 +180,58 @@ async def test_static_file_serving(client: AsyncClient):
     response = await client.get(url)
     assert response.status_code == 200, f"Failed to fetch {url}"
     assert response.content == fake_content
+
+
+@pytest.mark.asyncio
+async def test_generated_match_columns_and_missing_requirement_filter(client: AsyncClient):
+    """
+    Verify match_count/total_must_haves are derived from the stored JSON and that
+    GET /jobs/{id}/applications?missing_requirement= filters on the gap analysis.
+    """
+    recruiter_headers = await get_auth_headers(client, "gap_recruiter@test.com", "client")
+    job_id = await create_job(client, recruiter_headers, "Gap Analysis Job")
+
+    results = {
+        "gap_missing@test.com": {
+            "match_count": 1,
+            "total_must_haves": 2,
+            "score": 40,
+            "gap_analysis": [{"requirement": "Kubernetes", "status": "Missing", "note": ""}],
+        },
+        "gap_match@test.com": {
+            "match_count": "2",
+            "total_must_haves": 2,
+            "score": 95,
+            "gap_analysis": [{"requirement": "Kubernetes", "status": "Match", "note": ""}],
+        },
+    }
+
+    for email, ai_result in results.items():
+        candidate_headers = await get_auth_headers(client, email, "candidate")
+        with patch("app.services.ai_screening.ai_screening_service.evaluate_candidate") as mock_eval:
+            mock_eval.return_value = ai_result
+            apply_response = await client.post(
+                "/api/v1/applications/",
+                data={"job_id": str(job_id)},
+                files={"resume": ("resume_gap.pdf", io.BytesIO(b"fake pdf"), "application/pdf")},
+                headers=candidate_headers,
+            )
+            assert apply_response.status_code == 200
+
+    response = await client.get(f"/api/v1/jobs/{job_id}/applications", headers=recruiter_headers)
+    assert response.status_code == 200
+    by_email = {a["user"]["email"]: a for a in response.json()}
+    assert by_email["gap_missing@test.com"]["match_count"] == 1
+    assert by_email["gap_missing@test.com"]["total_must_haves"] == 2
+    # LLM strings are normalized to ints before storage
+    assert by_email["gap_match@test.com"]["match_count"] == 2
+    assert by_email["gap_match@test.com"]["ai_analysis_json"]["match_count"] == 2
+
+    response = await client.get(
+        f"/api/v1/jobs/{job_id}/applications",
+        params={"missing_requirement": "Kubernetes"},
+        headers=recruiter_headers,
+    )
+    assert response.status_code == 200
+    emails = [a["user"]["email"] for a in response.json()]
+    assert emails == ["gap_missing@test.com"]
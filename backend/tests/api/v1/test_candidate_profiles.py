@@ -0,0 +1,96 @@
+import io
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.skills import find_skills_with_years, normalize_skill
+from app.models.candidate_profile import CandidateProfile, CandidateSkill
+from app.models.user import User
+from tests.api.v1.test_resume_dedup import apply, create_job
+from tests.conftest import TestingSessionLocal, assert_max_queries, get_auth_headers
+
+RESUME = """
+Morgan Example
+morgan@example.com
+
+Site reliability engineer with 6 years running Kubernetes clusters on AWS.
+Wrote Python tooling for deployments for 4 years; some Go.
+"""
+
+
+def test_skill_normalization():
+    assert normalize_skill(" K8s ") == "kubernetes"
+    assert normalize_skill("PostgreSQL 14") == "postgresql"
+    assert normalize_skill("Spring Boot") == "spring"
+    assert normalize_skill("Snowpark") == "snowpark"
+    assert find_skills_with_years(RESUME) == [
+        {"name": "kubernetes", "years": 6.0},
+        {"name": "aws", "years": 6.0},
+        {"name": "python", "years": 4.0},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_profile_extracted_once_per_resume(client: AsyncClient, mock_profile_extraction):
+    job_id = await create_job(client, "profiles_owner@test.com")
+    candidate = await get_auth_headers(client, "profiles_candidate@test.com", "candidate")
+
+    calls = mock_profile_extraction.call_count
+    assert (await apply(client, candidate, job_id, RESUME, force_update=False)).status_code == 200
+    assert mock_profile_extraction.call_count == calls + 1
+    # Same text again: nothing to extract
+    assert (await apply(client, candidate, job_id, RESUME)).status_code == 200
+    assert mock_profile_extraction.call_count == calls + 1
+
+    async with TestingSessionLocal() as db:
+        user_id = (await db.execute(select(User.id).where(User.email == "profiles_candidate@test.com"))).scalar_one()
+        result = await db.execute(select(CandidateSkill.skill, CandidateSkill.years).where(CandidateSkill.user_id == user_id))
+        assert dict(result.all()) == {"kubernetes": 6.0, "aws": 6.0, "python": 4.0}
+
+    # LLM output is normalized and replaces the previous skills
+    previous = mock_profile_extraction.side_effect
+    mock_profile_extraction.side_effect = None
+    mock_profile_extraction.return_value = {
+        "skills": [{"name": "K8s", "years": 7}, {"name": "Kubernetes", "years": 2}, {"name": "Postgres", "years": None}],
+        "titles": ["Senior SRE"],
+        "employers": ["Globex"],
+    }
+    try:
+        assert (await apply(client, candidate, job_id, RESUME + "\nNow on PostgreSQL.")).status_code == 200
+    finally:
+        mock_profile_extraction.side_effect = previous
+    async with TestingSessionLocal() as db:
+        profile = await db.get(CandidateProfile, user_id)
+        assert profile.titles == ["Senior SRE"] and profile.employers == ["Globex"]
+        result = await db.execute(select(CandidateSkill.skill, CandidateSkill.years).where(CandidateSkill.user_id == user_id))
+        assert dict(result.all()) == {"kubernetes": 7.0, "postgresql": None}
+
+
+@pytest.mark.asyncio
+async def test_admin_searches_candidates_by_skill(client: AsyncClient):
+    job_id = await create_job(client, "skills_owner@test.com")
+    senior = await get_auth_headers(client, "skills_senior@test.com", "candidate")
+    junior = await get_auth_headers(client, "skills_junior@test.com", "candidate")
+    assert (await apply(client, senior, job_id, RESUME, force_update=False)).status_code == 200
+    assert (await apply(client, junior, job_id, RESUME.replace("6 years", "2 years"), force_update=False)).status_code == 200
+
+    url = "/api/v1/admin/candidates"
+    assert (await client.get(url, params={"skill": "python"}, headers=senior)).status_code == 403
+
+    admin = await get_auth_headers(client, "skills_admin@test.com", "admin")
+    with assert_max_queries(3):
+        response = await client.get(url, params={"skill": ["k8s:5", "Python"]}, headers=admin)
+    assert response.status_code == 200
+    emails = [match["user"]["email"] for match in response.json()]
+    assert "skills_senior@test.com" in emails and "skills_junior@test.com" not in emails
+    match = next(match for match in response.json() if match["user"]["email"] == "skills_senior@test.com")
+    assert {"skill": "kubernetes", "years": 6.0} in match["skills"]
+
+    response = await client.get(url, params={"skill": "kubernetes"}, headers=admin)
+    emails = [match["user"]["email"] for match in response.json()]
+    assert emails.index("skills_senior@test.com") < emails.index("skills_junior@test.com")
+
+    response = await client.get(url, params={"skill": ["python", "rust"]}, headers=admin)
+    assert "skills_senior@test.com" not in [match["user"]["email"] for match in response.json()]
+    assert (await client.get(url, params={"skill": "python:lots"}, headers=admin)).status_code == 400
@@ -0,0 +1,130 @@
+import gzip
+import io
+import os
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from unittest.mock import patch
+
+from app.core import compression
+from app.core.uploads import UploadFiles
+from tests.conftest import get_auth_headers
+
+
+async def create_jobs(client: AsyncClient, headers: dict, count: int) -> None:
+    for i in range(count):
+        response = await client.post("/api/v1/jobs/", json={
+            "title": f"Compressed Job {i}",
+            "description": "A long description that repeats. " * 20,
+        }, headers=headers)
+        assert response.status_code == 200
+
+
+# ───────────────────────────────────────────────────
+# Response compression
+# ───────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped(client: AsyncClient):
+    headers = await get_auth_headers(client, "compress_owner@test.com", "client")
+    await create_jobs(client, headers, 3)
+
+    with patch.object(compression, "brotli", None):
+        response = await client.get("/api/v1/jobs/", headers={**headers, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    # httpx decodes transparently
+    assert len(response.json()) >= 3
+
+
+@pytest.mark.asyncio
+async def test_brotli_preferred_when_available(client: AsyncClient):
+    if compression.brotli is None:
+        pytest.skip("brotli not installed")
+    headers = await get_auth_headers(client, "compress_owner@test.com", "client")
+    response = await client.get("/api/v1/jobs/", headers={**headers, "Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+
+
+@pytest.mark.asyncio
+async def test_small_and_identity_responses_pass_through(client: AsyncClient):
+    small = await client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    headers = await get_auth_headers(client, "compress_owner@test.com", "client")
+    identity = await client.get("/api/v1/jobs/", headers={**headers, "Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in identity.headers
+
+
+def test_negotiate_encoding():
+    with patch.object(compression, "brotli", None):
+        assert compression.negotiate_encoding("br, gzip") == "gzip"
+        assert compression.negotiate_encoding("br") is None
+    assert compression.negotiate_encoding("identity") is None
+    assert compression.negotiate_encoding("gzip;q=0.5") == "gzip"
+
+
+def test_stream_compressor_round_trip():
+    compressor = compression.StreamCompressor("gzip", 5)
+    chunks = [b"id,score\n", b"1,90\n" * 100, b"2,40\n"]
+    data = b"".join(compressor.compress(c) for c in chunks) + compressor.finish()
+    assert gzip.decompress(data) == b"".join(chunks)
+
+
+# ───────────────────────────────────────────────────
+# Uploaded resumes
+# ───────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_upload_range_and_etag(client: AsyncClient):
+    recruiter_headers = await get_auth_headers(client, "range_recruiter@test.com", "client")
+    job = await client.post("/api/v1/jobs/", json={"title": "Range Job", "description": "d"}, headers=recruiter_headers)
+    candidate_headers = await get_auth_headers(client, "range_candidate@test.com", "candidate")
+    content = b"0123456789" * 10
+    apply_res = await client.post(
+        "/api/v1/applications/",
+        data={"job_id": str(job.json()["id"])},
+        files={"resume": ("range.pdf", io.BytesIO(content), "application/pdf")},
+        headers=candidate_headers,
+    )
+    url = "/" + apply_res.json()["resume_path"]
+
+    partial = await client.get(url, headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == content[10:20]
+
+    full = await client.get(url)
+    revalidated = await client.get(url, headers={"If-None-Match": full.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_precompressed_upload_variant(tmp_path):
+    uploads = tmp_path / "uploads"
+    uploads.mkdir()
+    (uploads / "resume.txt").write_bytes(b"experience " * 500)
+    (uploads / "random.bin").write_bytes(os.urandom(4096))
+    cache_dir = tmp_path / "cache"
+    app = Starlette(routes=[Mount("/uploads", UploadFiles(directory=str(uploads), precompress=True, cache_dir=str(cache_dir)))])
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        response = await c.get("/uploads/resume.txt", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == b"experience " * 500
+        assert response.headers["etag"].endswith('-gz"')
+
+        again = await c.get("/uploads/resume.txt", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+        assert again.status_code == 304
+
+        ranged = await c.get("/uploads/resume.txt", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-9"})
+        assert ranged.status_code == 206
+        assert "content-encoding" not in ranged.headers
+
+        # Variants that don't save space are skipped
+        incompressible = await c.get("/uploads/random.bin", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in incompressible.headers
+
+    assert len(list(cache_dir.glob("*.gz"))) == 1
@@ -0,0 +1,102 @@
+import re
+import socket
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.smtp_sink import SMTPSink
+from app.models.email_outbox import EmailOutbox, EmailStatus
+from app.services.email_outbox import OutboxSender, SMTPPool
+from tests.conftest import TestingSessionLocal, make_candidate_payload
+
+
+def unused_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def queue_reset_email(client: AsyncClient, email: str) -> dict:
+    await client.post("/api/v1/auth/signup", json=make_candidate_payload(email))
+    with patch.object(settings, "SMTP_USER", "sender@test.com"), patch.object(settings, "SMTP_PASSWORD", "secret"):
+        response = await client.post("/api/v1/auth/reset-password", json={"email": email, "role": "candidate"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def plain_text(message) -> str:
+    part = next(part for part in message.walk() if part.get_content_type() == "text/plain")
+    return part.get_payload(decode=True).decode()
+
+
+async def outbox_rows(to_email: str) -> list:
+    async with TestingSessionLocal() as db:
+        result = await db.execute(select(EmailOutbox).where(EmailOutbox.to_email == to_email))
+        return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_reset_password_queues_email_in_outbox(client: AsyncClient):
+    body = await queue_reset_email(client, "outbox_queue@test.com")
+    # The temporary password is never returned once email is configured
+    assert "temporary_password" not in body
+
+    rows = await outbox_rows("outbox_queue@test.com")
+    assert len(rows) == 1
+    assert rows[0].status == EmailStatus.PENDING
+    assert "Password Reset" in rows[0].subject
+
+
+@pytest.mark.asyncio
+async def test_sender_delivers_over_pooled_connection(client: AsyncClient):
+    await queue_reset_email(client, "outbox_send1@test.com")
+    await queue_reset_email(client, "outbox_send2@test.com")
+
+    sink = SMTPSink()
+    await sink.start()
+    pool = SMTPPool("127.0.0.1", sink.port, username="sender@test.com", password="secret", start_tls=False, size=1)
+    sender = OutboxSender(TestingSessionLocal, pool, from_email="sender@test.com")
+    try:
+        assert await sender.drain_once() >= 2
+        assert await sender.drain_once() == 0
+    finally:
+        await pool.close()
+        await sink.stop()
+
+    recipients = {m["To"] for m in sink.messages}
+    assert {"outbox_send1@test.com", "outbox_send2@test.com"} <= recipients
+    for email in ("outbox_send1@test.com", "outbox_send2@test.com"):
+        rows = await outbox_rows(email)
+        assert rows[0].status == EmailStatus.SENT
+        assert rows[0].sent_at is not None
+
+    # The temporary password went out, and is not kept in the outbox afterwards
+    [message] = [m for m in sink.messages if m["To"] == "outbox_send1@test.com"]
+    password = re.search(r"temporary password is: (\S+)", plain_text(message)).group(1)
+    [row] = await outbox_rows("outbox_send1@test.com")
+    assert password not in row.text_body and row.html_body is None
+
+
+@pytest.mark.asyncio
+async def test_sender_retries_then_dead_letters(client: AsyncClient):
+    await queue_reset_email(client, "outbox_dead@test.com")
+
+    # Nothing listens on this port, so every attempt fails
+    pool = SMTPPool("127.0.0.1", unused_port(), start_tls=False, size=1, timeout=1)
+    sender = OutboxSender(TestingSessionLocal, pool, from_email="sender@test.com")
+    with patch.object(settings, "EMAIL_MAX_ATTEMPTS", 2), patch.object(settings, "EMAIL_RETRY_BASE_SECONDS", 0):
+        await sender.drain_once()
+        rows = await outbox_rows("outbox_dead@test.com")
+        assert rows[0].status == EmailStatus.PENDING
+        assert rows[0].attempts == 1
+        assert rows[0].last_error
+
+        await sender.drain_once()
+        rows = await outbox_rows("outbox_dead@test.com")
+        assert rows[0].status == EmailStatus.DEAD
+        assert rows[0].attempts == 2
+        assert rows[0].text_body == "" and rows[0].html_body is None
+    await pool.close()
@@ -0,0 +1,188 @@
+import asyncio
+import io
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.core.events import EventBroker
+from app.core.query_cache import Entry, MemoryBackend, QueryCache
+from app.models.job import Job
+from tests.conftest import TestingSessionLocal, assert_max_queries, get_auth_headers
+
+
+def make_cache(**kwargs) -> QueryCache:
+    return QueryCache("test", **{"size": 16, "ttl": 60, "local_ttl": 60, **kwargs})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = make_cache()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"n": calls}
+
+    values = await asyncio.gather(*(cache.get_or_load("k", ["t"], load) for _ in range(10)))
+    assert calls == 1 and values == [{"n": 1}] * 10
+
+    # A failed load reaches every waiter and caches nothing
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(cache.get_or_load("f", ["t"], fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+    assert await cache.get_or_load("f", ["t"], load) == {"n": 2}
+
+
+def test_early_refresh_probability_rises_towards_expiry():
+    def refreshes(remaining: float) -> int:
+        entry = Entry(None, (), delta=1.0, expires_at=1000.0, local_until=1000.0)
+        return sum(entry.should_refresh(1000.0 - remaining, beta=1.0) for _ in range(2000))
+
+    assert refreshes(0) == 2000
+    assert refreshes(30) == 0
+    assert refreshes(5) < refreshes(0.5) < 2000
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_and_invalidation_across_workers():
+    shared, broker = MemoryBackend(), EventBroker()
+    first, second = (make_cache(shared=shared, broker=broker) for _ in range(2))
+    loads = []
+
+    def loader(worker, value):
+        async def load():
+            loads.append(worker)
+            return value
+        return load
+
+    assert await first.get_or_load("k", ["list:a"], loader("first", 1)) == 1
+    # The other worker is served from the shared tier
+    assert await second.get_or_load("k", ["list:a"], loader("second", 2)) == 1
+    assert loads == ["first"]
+
+    # Unrelated tags leave it alone; its own tag drops it everywhere
+    await first.invalidate(["list:b"])
+    assert await second.get_or_load("k", ["list:a"], loader("second", 2)) == 1
+    await first.invalidate(["list:a"])
+    assert await second.get_or_load("k", ["list:a"], loader("second", 3)) == 3
+    assert await first.get_or_load("k", ["list:a"], loader("first", 4)) == 3
+    assert loads == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_load_overlapping_invalidation_is_not_stored():
+    cache = make_cache()
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.05)
+        return "old"
+
+    task = asyncio.create_task(cache.get_or_load("k", ["t"], slow))
+    await started.wait()
+    await cache.invalidate(["t"])
+
+    async def fresh():
+        return "new"
+
+    # Requests after the write don't join the read that started before it
+    assert await cache.get_or_load("k", ["t"], fresh) == "new"
+    assert await task == "old"
+    assert await cache.get_or_load("k", ["t"], slow) == "new"
+
+
+@pytest.mark.asyncio
+async def test_job_reads_are_cached_until_a_write(client: AsyncClient):
+    owner = await get_auth_headers(client, "job_cache_owner@test.com", "client")
+    candidate = await get_auth_headers(client, "job_cache_candidate@test.com", "candidate")
+    other = await get_auth_headers(client, "job_cache_other@test.com", "candidate")
+    job = {"title": "Cached Board Job", "description": "D", "location": "Remote"}
+    job_id = (await client.post("/api/v1/jobs/", json=job, headers=owner)).json()["id"]
+
+    def titles(response):
+        return {job["title"] for job in response.json()}
+
+    assert "Cached Board Job" in titles(await client.get("/api/v1/jobs/", headers=candidate))
+    # Every candidate shares the page: only authentication hits the database
+    with assert_max_queries(1):
+        cached = await client.get("/api/v1/jobs/", headers=other)
+    assert "Cached Board Job" in titles(cached)
+    etag = cached.headers["etag"]
+    with assert_max_queries(1):
+        assert (await client.get("/api/v1/jobs/", headers={**other, "If-None-Match": etag})).status_code == 304
+
+    # Deactivating the job removes it from the candidate board and from the cached job
+    await client.put(f"/api/v1/jobs/{job_id}", json={"is_active": False}, headers=owner)
+    assert "Cached Board Job" not in titles(await client.get("/api/v1/jobs/", headers=candidate))
+    assert (await client.get(f"/api/v1/jobs/{job_id}", headers=candidate)).json()["is_active"] is False
+    response = await client.post(
+        "/api/v1/applications/",
+        data={"job_id": str(job_id)},
+        files={"resume": ("resume.txt", io.BytesIO(b"resume"), "text/plain")},
+        headers=candidate,
+    )
+    assert response.status_code == 400
+
+    await client.put(f"/api/v1/jobs/{job_id}", json={"is_active": True, "title": "Cached Board Job v2"}, headers=owner)
+    assert (await client.get(f"/api/v1/jobs/{job_id}", headers=candidate)).json()["title"] == "Cached Board Job v2"
+    with assert_max_queries(1):
+        assert (await client.get(f"/api/v1/jobs/{job_id}", headers=other)).status_code == 200
+
+    # Applying reads the job from the database, not a cached copy that may predate a write
+    async with TestingSessionLocal() as db:
+        await db.execute(update(Job).where(Job.id == job_id).values(is_active=False))
+        await db.commit()
+    assert (await client.get(f"/api/v1/jobs/{job_id}", headers=candidate)).json()["is_active"] is True
+    response = await client.post(
+        "/api/v1/applications/",
+        data={"job_id": str(job_id)},
+        files={"resume": ("resume.txt", io.BytesIO(b"resume"), "text/plain")},
+        headers=candidate,
+    )
+    assert response.status_code == 400
+    async with TestingSessionLocal() as db:
+        await db.execute(update(Job).where(Job.id == job_id).values(is_active=True))
+        await db.commit()
+
+    response = await client.post(
+        "/api/v1/applications/",
+        data={"job_id": str(job_id)},
+        files={"resume": ("resume.txt", io.BytesIO(b"resume"), "text/plain")},
+        headers=candidate,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["job"]["title"] == "Cached Board Job v2"
+    assert body["job"]["owner"]["email"] == "job_cache_owner@test.com"
+    assert body["user"]["email"] == "job_cache_candidate@test.com"
+
+    # The owner's profile is part of every cached copy of their jobs
+    await client.put("/api/v1/users/me", json={"company_name": "Cache Co"}, headers=owner)
+    assert (await client.get(f"/api/v1/jobs/{job_id}", headers=candidate)).json()["owner"]["company_name"] == "Cache Co"
+
+    gone = {"title": "Cached Gone Job", "description": "D"}
+    gone_id = (await client.post("/api/v1/jobs/", json=gone, headers=owner)).json()["id"]
+    assert (await client.get(f"/api/v1/jobs/{gone_id}", headers=candidate)).status_code == 200
+    assert "Cached Gone Job" in titles(await client.get("/api/v1/jobs/", headers=other))
+    await client.delete(f"/api/v1/jobs/{gone_id}", headers=owner)
+    assert (await client.get(f"/api/v1/jobs/{gone_id}", headers=candidate)).status_code == 404
+    assert "Cached Gone Job" not in titles(await client.get("/api/v1/jobs/", headers=other))
+
+
+@pytest.mark.asyncio
+async def test_import_invalidates_ids_looked_up_before_they_existed(client: AsyncClient):
+    owner = await get_auth_headers(client, "job_cache_importer@test.com", "client")
+    job_id = (await client.post("/api/v1/jobs/", json={"title": "Before Import", "description": "D"}, headers=owner)).json()["id"]
+    assert (await client.get(f"/api/v1/jobs/{job_id + 1}", headers=owner)).status_code == 404
+
+    body = b'{"title": "Imported Later", "description": "D"}'
+    response = await client.post("/api/v1/jobs/import", content=body, headers={**owner, "Content-Type": "application/x-ndjson"})
+    assert response.json()["ids"] == [job_id + 1]
+    assert (await client.get(f"/api/v1/jobs/{job_id + 1}", headers=owner)).json()["title"] == "Imported Later"
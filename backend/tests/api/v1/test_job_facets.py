@@ -0,0 +1,55 @@
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import assert_max_queries, get_auth_headers
+
+
+def counts(facet):
+    return {entry["value"]: entry["count"] for entry in facet}
+
+
+@pytest.mark.asyncio
+async def test_read_jobs_with_facets(client: AsyncClient):
+    headers = await get_auth_headers(client, "facets_owner@test.com", "client")
+    for title, job_type, level, location, active in (
+        ("Facet A", "Full-time", "Senior", "Austin, TX", True),
+        ("Facet B", "Full-time", "Junior", "ATX", True),
+        ("Facet C", "Contract", "Senior", "Remote", True),
+        ("Facet D", "Contract", None, "Moon Base", False),
+    ):
+        job = {"title": title, "description": "D", "job_type": job_type, "experience_level": level, "location": location, "is_active": active}
+        assert (await client.post("/api/v1/jobs/", json=job, headers=headers)).status_code == 200
+
+    url = "/api/v1/jobs/"
+    # Plain list unless asked for
+    assert isinstance((await client.get(url, headers=headers)).json(), list)
+
+    # Auth, set version, facets, page
+    with assert_max_queries(4):
+        response = await client.get(url, params={"include_facets": "true", "limit": 2}, headers=headers)
+    body = response.json()
+    assert len(body["items"]) == 2
+    facets = body["facets"]
+    assert counts(facets["job_type"]) == {"Full-time": 2, "Contract": 2}
+    assert counts(facets["experience_level"]) == {"Senior": 2, "Junior": 1, None: 1}
+    assert counts(facets["location"]) == {"Austin, TX": 2, "Remote": 1, None: 1}
+    assert counts(facets["is_active"]) == {True: 3, False: 1}
+    assert facets["job_type"][0]["value"] == "Contract" # ties in value order
+
+    # The unfiltered view is cached until the job set changes
+    with assert_max_queries(3):
+        cached = await client.get(url, params={"include_facets": "true"}, headers=headers)
+    assert cached.json()["facets"] == facets
+    response = await client.post(url, json={"title": "Facet E", "description": "D", "job_type": "Part-time", "location": "Austin"}, headers=headers)
+    job_id = response.json()["id"]
+    facets = (await client.get(url, params={"include_facets": "true"}, headers=headers)).json()["facets"]
+    assert counts(facets["location"])["Austin, TX"] == 3
+    await client.put(f"{url}{job_id}", json={"location": "Remote"}, headers=headers)
+    facets = (await client.get(url, params={"include_facets": "true"}, headers=headers)).json()["facets"]
+    assert counts(facets["location"]) == {"Austin, TX": 2, "Remote": 2, None: 1}
+
+    # Facets describe the filtered set, and their values work as filters
+    response = await client.get(url, params={"include_facets": "true", "location": "Austin, TX"}, headers=headers)
+    body = response.json()
+    assert {job["title"] for job in body["items"]} == {"Facet A", "Facet B"}
+    assert counts(body["facets"]["experience_level"]) == {"Senior": 1, "Junior": 1}
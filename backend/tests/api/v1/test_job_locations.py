@@ -0,0 +1,84 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.locations import distance_miles, geohash, geohash_ranges, normalize_location
+from app.models.user import User
+from tests.conftest import TestingSessionLocal, get_auth_headers, make_candidate_payload
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def test_normalize_location():
+    assert normalize_location("NYC") == normalize_location("New York, NY") == normalize_location("new york ny")
+    austin = normalize_location("Hybrid - Austin, Texas")
+    assert (austin.city, austin.state, austin.remote) == ("Austin", "TX", False)
+    remote = normalize_location("Remote (US)")
+    assert remote.remote and remote.city is None
+    assert normalize_location("Remote - Seattle").remote
+    assert normalize_location("Portland, Maine").state == "ME"
+    assert normalize_location("Smalltown, TX").city is None
+    assert normalize_location("In office") is None
+    assert normalize_location("Mars") is None
+
+
+def test_geohash_matches_base32_geohash():
+    value = geohash(30.2672, -97.7431)
+    assert "".join(BASE32[(value >> (52 - 5 * (i + 1))) & 31] for i in range(5)) == "9v6kp"
+    # The cover of a circle contains its centre and every point within the radius
+    ranges = geohash_ranges(30.2672, -97.7431, 25)
+    for lat, lon in ((30.2672, -97.7431), (30.5083, -97.6789), (30.0, -97.5)):
+        assert distance_miles(30.2672, -97.7431, lat, lon) <= 25
+        assert any(low <= geohash(lat, lon) < high for low, high in ranges)
+
+
+@pytest.mark.asyncio
+async def test_read_jobs_by_normalized_location_and_radius(client: AsyncClient):
+    headers = await get_auth_headers(client, "locations_owner@test.com", "client")
+    for title, location in (
+        ("Loc Manhattan", "New York, NY"),
+        ("Loc NYC", "NYC"),
+        ("Loc Remote", "Remote - US"),
+        ("Loc Austin", "Austin, TX"),
+        ("Loc Round Rock", "Round Rock, TX"),
+        ("Loc Dallas", "Dallas, TX"),
+        ("Loc Moon", "Moon Base"),
+    ):
+        response = await client.post("/api/v1/jobs/", json={"title": title, "description": "D", "location": location}, headers=headers)
+        assert response.status_code == 200
+    owner_id = response.json()["owner_id"]
+    assert response.json()["city"] is None and not response.json()["is_remote"]
+
+    async def titles(**params):
+        response = await client.get("/api/v1/jobs/", params={"owner_id": owner_id, **params}, headers=headers)
+        assert response.status_code == 200
+        return {job["title"] for job in response.json()}
+
+    assert await titles(location="new york city") == {"Loc Manhattan", "Loc NYC"}
+    assert await titles(location="remote") == {"Loc Remote"}
+    assert await titles(location="Texas") == {"Loc Austin", "Loc Round Rock", "Loc Dallas"}
+    # Unknown places still match as text
+    assert await titles(location="moon") == {"Loc Moon"}
+    assert await titles(location="Austin", radius_miles=30) == {"Loc Austin", "Loc Round Rock"}
+    assert await titles(location="Austin", radius_miles=250) == {"Loc Austin", "Loc Round Rock", "Loc Dallas"}
+
+    bad = await client.get("/api/v1/jobs/", params={"location": "Remote", "radius_miles": 10}, headers=headers)
+    assert bad.status_code == 400
+    bad = await client.get("/api/v1/jobs/", params={"location": "Austin", "radius_miles": 5000}, headers=headers)
+    assert bad.status_code == 400
+
+    # Moving a job re-resolves it
+    job = (await client.get("/api/v1/jobs/", params={"owner_id": owner_id, "location": "Dallas"}, headers=headers)).json()[0]
+    response = await client.put(f"/api/v1/jobs/{job['id']}", json={"location": "ATX"}, headers=headers)
+    assert (response.json()["city"], response.json()["state"]) == ("Austin", "TX")
+    assert await titles(location="Austin", radius_miles=30) == {"Loc Austin", "Loc Round Rock", "Loc Dallas"}
+
+
+@pytest.mark.asyncio
+async def test_candidate_location_is_normalized(client: AsyncClient):
+    payload = make_candidate_payload("locations_candidate@test.com", city="saint louis", state="MO")
+    assert (await client.post("/api/v1/auth/signup", json=payload)).status_code == 200
+    async with TestingSessionLocal() as db:
+        user = (await db.execute(select(User).where(User.email == "locations_candidate@test.com"))).scalar_one()
+        assert (user.city, user.state) == ("St. Louis", "MO")
+        assert user.geohash == geohash(user.latitude, user.longitude)
@@ -0,0 +1,110 @@
+import csv
+import io
+from unittest.mock import patch
+
+import orjson
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.services.job_transfer import iter_csv_records
+from tests.conftest import get_auth_headers
+
+
+async def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+@pytest.mark.asyncio
+async def test_csv_parser_handles_quoted_newlines_across_chunks():
+    data = 'title,description,is_active\r\n"Multi\r\nline",Desc,false\r\nPlain,"Has ""quotes""",\r\n'.encode()
+    records = [r async for r in iter_csv_records(chunked(data, 3))]
+    assert records == [
+        (1, {"title": "Multi\r\nline", "description": "Desc", "is_active": "false"}, None),
+        (2, {"title": "Plain", "description": 'Has "quotes"'}, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_reports_row_errors(client: AsyncClient):
+    headers = await get_auth_headers(client, "bulk_ndjson@test.com", "client")
+    body = b"\n".join([
+        orjson.dumps({"title": "Bulk 1", "description": "D", "location": "Austin"}),
+        b"{not json",
+        orjson.dumps({"title": "Bulk 2"}),
+        orjson.dumps({"title": "Bulk 3", "description": "D", "is_active": False}),
+    ])
+    with patch.object(settings, "JOB_IMPORT_BATCH_SIZE", 1):
+        response = await client.post(
+            "/api/v1/jobs/import", content=body, headers={**headers, "Content-Type": "application/x-ndjson"}
+        )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["created"] == 2
+    assert result["failed"] == 2
+    assert [e["row"] for e in result["errors"]] == [2, 3]
+    assert result["errors"][1]["errors"][0]["field"] == "description"
+
+    job = (await client.get(f"/api/v1/jobs/{result['ids'][1]}", headers=headers)).json()
+    assert job["title"] == "Bulk 3"
+    assert job["is_active"] is False
+
+
+@pytest.mark.asyncio
+async def test_import_failing_part_way_creates_nothing(client: AsyncClient, db_session):
+    headers = await get_auth_headers(client, "bulk_atomic@test.com", "client")
+
+    async def records(fmt, chunks):
+        for row in (1, 2):
+            yield row, {"title": f"Atomic {row}", "description": "D"}, None
+        raise ConnectionError("client went away")
+
+    with patch.object(settings, "JOB_IMPORT_BATCH_SIZE", 1), patch("app.services.job_transfer.iter_records", records):
+        with pytest.raises(ConnectionError):
+            await client.post("/api/v1/jobs/import", content=b"", headers={**headers, "Content-Type": "application/x-ndjson"})
+    # What get_db's session close does after a failed request
+    await db_session.rollback()
+
+    jobs = (await client.get("/api/v1/jobs/", params={"search": "Atomic"}, headers=headers)).json()
+    assert jobs == []
+
+
+@pytest.mark.asyncio
+async def test_import_authorization_and_content_type(client: AsyncClient):
+    candidate_headers = await get_auth_headers(client, "bulk_candidate@test.com", "candidate")
+    response = await client.post(
+        "/api/v1/jobs/import", content=b"", headers={**candidate_headers, "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 403
+
+    headers = await get_auth_headers(client, "bulk_type@test.com", "client")
+    response = await client.post("/api/v1/jobs/import", content=b"{}", headers={**headers, "Content-Type": "application/json"})
+    assert response.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_csv_export_round_trips_through_import(client: AsyncClient):
+    headers = await get_auth_headers(client, "bulk_export@test.com", "client")
+    body = "title,description,requirements\nExport A,First,\"Python, SQL\"\nExport B,Second,\n".encode()
+    response = await client.post("/api/v1/jobs/import", content=body, headers={**headers, "Content-Type": "text/csv"})
+    assert response.json()["created"] == 2
+
+    with patch.object(settings, "JOB_EXPORT_BATCH_SIZE", 1):
+        exported = await client.get("/api/v1/jobs/export", params={"format": "csv"}, headers=headers)
+    assert exported.status_code == 200
+    assert exported.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(exported.text)))
+    assert [(r["title"], r["requirements"]) for r in rows] == [("Export A", "Python, SQL"), ("Export B", "")]
+
+    # The export can be imported again as-is; id/owner_id/timestamps are ignored
+    other_headers = await get_auth_headers(client, "bulk_reimport@test.com", "client")
+    response = await client.post(
+        "/api/v1/jobs/import", content=exported.content, headers={**other_headers, "Content-Type": "text/csv"}
+    )
+    assert response.json()["created"] == 2
+
+    ndjson = await client.get("/api/v1/jobs/export", headers=other_headers)
+    lines = [orjson.loads(line) for line in ndjson.content.splitlines()]
+    assert [line["title"] for line in lines] == ["Export A", "Export B"]
+    assert lines[0]["requirements"] == "Python, SQL"
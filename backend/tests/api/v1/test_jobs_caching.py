@@ -0,0 +1,142 @@
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.core.events import event_broker
+from app.core.http_cache import job_versions
+from app.models.job import Job
+from app.services.job_cache import job_cache
+from tests.conftest import TestingSessionLocal, get_auth_headers
+
+
+async def create_job(client: AsyncClient, headers: dict, title: str) -> int:
+    response = await client.post("/api/v1/jobs/", json={
+        "title": title,
+        "description": "Caching description",
+        "location": "Remote",
+    }, headers=headers)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+# ───────────────────────────────────────────────────
+# read_job
+# ───────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_read_job_conditional_get(client: AsyncClient):
+    headers = await get_auth_headers(client, "cache_owner@test.com", "client")
+    job_id = await create_job(client, headers, "Cached Job")
+
+    first = await client.get(f"/api/v1/jobs/{job_id}", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    again = await client.get(f"/api/v1/jobs/{job_id}", headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    # An update bumps the row version, so the old ETag no longer matches
+    update = await client.put(f"/api/v1/jobs/{job_id}", json={"title": "Cached Job v2"}, headers=headers)
+    assert update.status_code == 200
+    changed = await client.get(f"/api/v1/jobs/{job_id}", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["title"] == "Cached Job v2"
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_read_job_version_map_miss_still_revalidates(client: AsyncClient):
+    """Without a version map entry (e.g. another worker served the write) the DB is consulted."""
+    headers = await get_auth_headers(client, "cache_owner@test.com", "client")
+    job_id = await create_job(client, headers, "Map Miss Job")
+    etag = (await client.get(f"/api/v1/jobs/{job_id}", headers=headers)).headers["etag"]
+
+    job_versions.clear()
+    response = await client.get(f"/api/v1/jobs/{job_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_owner_profile_edit_changes_job_etags(client: AsyncClient):
+    headers = await get_auth_headers(client, "cache_profile_owner@test.com", "client")
+    candidate = await get_auth_headers(client, "cache_profile_candidate@test.com", "candidate")
+    job_id = await create_job(client, headers, "Owner Profile Job")
+    job_etag = (await client.get(f"/api/v1/jobs/{job_id}", headers=candidate)).headers["etag"]
+    list_etag = (await client.get("/api/v1/jobs/", headers=headers)).headers["etag"]
+
+    await client.put("/api/v1/users/me", json={"company_name": "Renamed Co"}, headers=headers)
+    changed = await client.get(f"/api/v1/jobs/{job_id}", headers={**candidate, "If-None-Match": job_etag})
+    assert changed.status_code == 200
+    assert changed.json()["owner"]["company_name"] == "Renamed Co"
+    assert (await client.get("/api/v1/jobs/", headers={**headers, "If-None-Match": list_etag})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_relayed_invalidation_drops_version_map_entry(client: AsyncClient):
+    """A write in another worker reaches this one's version map through the event broker."""
+    headers = await get_auth_headers(client, "cache_owner@test.com", "client")
+    job_id = await create_job(client, headers, "Relayed Job")
+    await client.get(f"/api/v1/jobs/{job_id}", headers=headers)
+    assert job_versions.get(job_id) is not None
+
+    event = {"type": "cache.invalidate", "origin": "another-worker", "tags": [f"job:{job_id}"]}
+    await event_broker.publish([job_cache.topic], event)
+    assert job_versions.get(job_id) is None
+
+
+# ───────────────────────────────────────────────────
+# read_jobs
+# ───────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_read_jobs_conditional_get(client: AsyncClient):
+    headers = await get_auth_headers(client, "cache_list_owner@test.com", "client")
+    await create_job(client, headers, "Listed Job")
+
+    first = await client.get("/api/v1/jobs/", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = await client.get("/api/v1/jobs/", headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+
+    # A new job in the result set invalidates the list ETag
+    await create_job(client, headers, "Another Listed Job")
+    changed = await client.get("/api/v1/jobs/", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_candidate_cache_control(client: AsyncClient):
+    headers = await get_auth_headers(client, "cache_candidate@test.com", "candidate")
+    response = await client.get("/api/v1/jobs/", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("private, max-age=")
+    assert "Authorization" in response.headers["vary"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_job_edit_conflicts(client: AsyncClient, db_session):
+    headers = await get_auth_headers(client, "cache_owner@test.com", "client")
+    job_id = await create_job(client, headers, "Raced Job")
+
+    # Another request updates the job after this one read it, before it writes
+    commit = db_session.commit
+    async def racing_commit():
+        async with TestingSessionLocal() as other:
+            await other.execute(update(Job).where(Job.id == job_id).values(title="Other Edit", version=Job.version + 1))
+            await other.commit()
+        await commit()
+
+    with patch.object(db_session, "commit", racing_commit):
+        response = await client.put(f"/api/v1/jobs/{job_id}", json={"title": "Lost Edit"}, headers=headers)
+    assert response.status_code == 409
+    await db_session.rollback()
+    assert (await client.get(f"/api/v1/jobs/{job_id}", headers=headers)).json()["title"] == "Other Edit"
@@ -0,0 +1,146 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+
+from app.api.deps import get_db
+from app.core import metrics
+from app.core.config import settings
+from app.main import app
+from app.models.email_outbox import EmailOutbox, EmailStatus
+from app.services.ai_screening import AIScreeningService
+from tests.conftest import TestingSessionLocal, get_auth_headers
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposition(client: AsyncClient):
+    headers = await get_auth_headers(client, "metrics_owner@test.com", "client")
+    response = await client.get("/api/v1/jobs/", headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_requests_total{method="GET",route="/api/v1/jobs/",status="200"}' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/jobs/",le="+Inf"}' in body
+    assert 'db_queries_total{method="GET",route="/api/v1/jobs/"}' in body
+    assert 'email_outbox_messages{status="PENDING"}' in body
+    assert "notification_digest_pending " in body
+
+
+@pytest.mark.asyncio
+async def test_queue_metrics_skip_sent_rows_and_are_cached(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(metrics, "_queue_cache", (0.0, []))
+    async with TestingSessionLocal() as db:
+        db.add_all([
+            EmailOutbox(to_email="a@test.com", subject="s", text_body="b", status=EmailStatus.SENT),
+            EmailOutbox(to_email="b@test.com", subject="s", text_body="b", status=EmailStatus.DEAD),
+        ])
+        await db.commit()
+        body = metrics.registry.render(await metrics.queue_metrics(db))
+        assert 'email_outbox_messages{status="SENT"}' not in body
+        dead = next(line for line in body.splitlines() if line.startswith('email_outbox_messages{status="DEAD"}'))
+        assert float(dead.split()[-1]) >= 1
+
+        db.add(EmailOutbox(to_email="c@test.com", subject="s", text_body="b", status=EmailStatus.DEAD))
+        await db.commit()
+        # A second scrape within METRICS_QUEUE_CACHE_SECONDS reuses the counts
+        assert metrics.registry.render(await metrics.queue_metrics(db)) == body
+
+
+@pytest.mark.asyncio
+async def test_upload_and_extraction_metrics(client: AsyncClient):
+    owner = await get_auth_headers(client, "metrics_job_owner@test.com", "client")
+    job = await client.post("/api/v1/jobs/", json={
+        "title": "Metrics Job", "description": "Metrics", "location": "Remote",
+    }, headers=owner)
+    candidate = await get_auth_headers(client, "metrics_candidate@test.com", "candidate")
+
+    uploaded = metrics.upload_bytes.value()
+    extractions = metrics.text_extraction_duration.count("pdf", "error")
+    content = b"%PDF-1.4 not really a pdf"
+    response = await client.post(
+        "/api/v1/applications/",
+        data={"job_id": str(job.json()["id"])},
+        files={"resume": ("resume.pdf", io.BytesIO(content), "application/pdf")},
+        headers=candidate,
+    )
+    assert response.status_code == 200
+    assert metrics.upload_bytes.value() == uploaded + len(content)
+    assert metrics.text_extraction_duration.count("pdf", "error") == extractions + 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_bearer_token(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_BEARER_TOKEN", "scrape-secret")
+    assert (await client.get("/metrics")).status_code == 401
+    response = await client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_health_failure_does_not_leak_database_url(client: AsyncClient):
+    class BrokenSession:
+        async def execute(self, *args, **kwargs):
+            raise RuntimeError(f"could not connect to {settings.DATABASE_URL}")
+
+    async def broken_db():
+        yield BrokenSession()
+
+    previous = app.dependency_overrides[get_db]
+    app.dependency_overrides[get_db] = broken_db
+    try:
+        response = await client.get("/health")
+    finally:
+        app.dependency_overrides[get_db] = previous
+    assert response.status_code == 503
+    assert response.json() == {"status": "error", "db_connection": "failed"}
+    assert settings.DATABASE_URL not in response.text
+
+
+@pytest.mark.asyncio
+async def test_llm_call_outcomes(monkeypatch):
+    class Completions:
+        def __init__(self, error):
+            self.error = error
+
+        async def create(self, **kwargs):
+            raise RuntimeError(self.error)
+
+    def service(error):
+        instance = AIScreeningService()
+        instance._client = SimpleNamespace(chat=SimpleNamespace(completions=Completions(error)))
+        return instance
+
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test")
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", None)
+    errors, fallbacks = metrics.llm_requests.value("openai", "error"), metrics.llm_requests.value("openai", "fallback")
+
+    profile = await service("boom").extract_profile("Python developer")
+    assert profile == AIScreeningService.keyword_profile("Python developer")
+    assert metrics.llm_requests.value("openai", "error") == errors + 1
+
+    # Limit errors go to the Gemini fallback and are counted as such, not as errors
+    result = await service("context_length_exceeded").evaluate_candidate("resume", "Engineer", "Python")
+    assert "Gemini fallback failed" in result["justification"]
+    assert metrics.llm_requests.value("openai", "fallback") == fallbacks + 1
+    assert metrics.llm_requests.value("openai", "error") == errors + 1
+
+
+def test_histogram_rendering():
+    histogram = metrics.Histogram("demo_seconds", "Demo", ("route",), buckets=(0.1, 1))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(3, "/a")
+    assert histogram.render() == [
+        "# HELP demo_seconds Demo",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{route="/a",le="0.1"} 1',
+        'demo_seconds_bucket{route="/a",le="1"} 2',
+        'demo_seconds_bucket{route="/a",le="+Inf"} 3',
+        'demo_seconds_sum{route="/a"} 3.55',
+        'demo_seconds_count{route="/a"} 3',
+    ]
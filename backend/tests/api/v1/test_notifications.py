@@ -0,0 +1,131 @@
+import io
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.email_templates import APPLICATION_RECEIVED, CompiledTemplate, STATUS_CHANGED
+from app.models.email_outbox import EmailOutbox
+from app.models.pending_notification import PendingNotification
+from app.services.email_outbox import build_message
+from app.services.notifications import DigestFlusher
+from tests.conftest import TestingSessionLocal, get_auth_headers
+
+
+def smtp_enabled():
+    return patch.multiple(settings, SMTP_USER="sender@test.com", SMTP_PASSWORD="secret")
+
+
+async def create_job(client: AsyncClient, headers: dict, title: str) -> int:
+    response = await client.post("/api/v1/jobs/", json={"title": title, "description": "Notify"}, headers=headers)
+    return response.json()["id"]
+
+
+async def apply(client: AsyncClient, headers: dict, job_id: int) -> int:
+    response = await client.post(
+        "/api/v1/applications/",
+        data={"job_id": str(job_id)},
+        files={"resume": ("notify.pdf", io.BytesIO(b"fake pdf"), "application/pdf")},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+async def outbox_for(to_email: str) -> list:
+    async with TestingSessionLocal() as db:
+        result = await db.execute(select(EmailOutbox).where(EmailOutbox.to_email == to_email).order_by(EmailOutbox.id))
+        return list(result.scalars().all())
+
+
+# ───────────────────────────────────────────────────
+# Templates
+# ───────────────────────────────────────────────────
+
+def test_compiled_template_renders_and_escapes():
+    template = CompiledTemplate("<p>{{ name }} applied to {{job}}</p>{{ rows }}", escape=True)
+    assert template.names == ["name", "job", "rows"]
+    rendered = template.render({"name": "<Ann & Bo>", "job": "QA", "rows": "<li>x</li>", "_raw": ("rows",)})
+    assert rendered == "<p>&lt;Ann &amp; Bo&gt; applied to QA</p><li>x</li>"
+
+    email = STATUS_CHANGED.render(first_name="Ann", job_title="QA", message="Hi <there>")
+    assert email["subject"] == "Update on your application – QA"
+    assert "Hi <there>" in email["text_body"]
+    assert "Hi &lt;there&gt;" in email["html_body"]
+
+
+def test_subject_values_are_kept_on_one_line():
+    email = APPLICATION_RECEIVED.render(first_name="Ann", job_title="QA\r\nLead\t Engineer\n")
+    assert email["subject"] == "Application received – QA Lead Engineer"
+    # The body keeps the title as written
+    assert "QA\r\nLead" in email["text_body"]
+    row = EmailOutbox(to_email="ann@test.com", subject=email["subject"], text_body=email["text_body"], html_body=email["html_body"])
+    assert build_message(row, "sender@test.com")["Subject"] == email["subject"]
+
+
+# ───────────────────────────────────────────────────
+# Endpoints queue notifications
+# ───────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_apply_and_status_change_queue_candidate_emails(client: AsyncClient):
+    recruiter_headers = await get_auth_headers(client, "notify_recruiter@test.com", "client")
+    job_id = await create_job(client, recruiter_headers, "Notify Job")
+    candidate_headers = await get_auth_headers(client, "notify_candidate@test.com", "candidate")
+
+    with smtp_enabled():
+        app_id = await apply(client, candidate_headers, job_id)
+        for new_status in ("REVIEWING", "INTERVIEW"):
+            response = await client.patch(
+                f"/api/v1/applications/{app_id}/status", params={"status": new_status}, headers=recruiter_headers
+            )
+            assert response.status_code == 200
+
+    emails = await outbox_for("notify_candidate@test.com")
+    # REVIEWING is not announced to the candidate
+    assert [e.subject for e in emails] == [
+        "Application received – Notify Job",
+        "Update on your application – Notify Job",
+    ]
+    assert "interview" in emails[1].text_body
+
+    # The recruiter gets no immediate email, only a pending digest entry
+    assert await outbox_for("notify_recruiter@test.com") == []
+    async with TestingSessionLocal() as db:
+        result = await db.execute(select(PendingNotification).where(PendingNotification.job_id == job_id))
+        pending = result.scalars().all()
+    assert [p.payload["application_id"] for p in pending] == [app_id]
+
+
+@pytest.mark.asyncio
+async def test_digest_coalesces_applicants_into_one_email(client: AsyncClient):
+    recruiter_headers = await get_auth_headers(client, "digest_recruiter@test.com", "client")
+    job_a = await create_job(client, recruiter_headers, "Digest A")
+    job_b = await create_job(client, recruiter_headers, "Digest B")
+
+    with smtp_enabled():
+        for i in range(3):
+            candidate_headers = await get_auth_headers(client, f"digest_candidate{i}@test.com", "candidate")
+            await apply(client, candidate_headers, job_a)
+            if i == 0:
+                await apply(client, candidate_headers, job_b)
+
+        flusher = DigestFlusher(TestingSessionLocal, window_seconds=3600)
+        # Nothing is due until the oldest event is older than the window
+        assert await flusher.flush_due() == 0
+        later = datetime.now(timezone.utc) + timedelta(hours=2)
+        assert await flusher.flush_due(now=later) >= 1
+        assert await flusher.flush_due(now=later) == 0
+
+    emails = await outbox_for("digest_recruiter@test.com")
+    assert len(emails) == 1
+    assert emails[0].subject == "4 new applicant(s) for your jobs"
+    assert "- Digest A: 3 new" in emails[0].text_body
+    assert "<strong>Digest B</strong>: 1 new" in emails[0].html_body
+
+    async with TestingSessionLocal() as db:
+        result = await db.execute(select(PendingNotification).where(PendingNotification.job_id.in_([job_a, job_b])))
+        assert result.scalars().all() == []
@@ -0,0 +1,85 @@
+import asyncio
+import time
+import tracemalloc
+
+import pytest
+from httpx import AsyncClient
+
+from app.api.v1.endpoints import admin
+from app.core.profiling import parse_collapsed
+from tests.conftest import get_auth_headers
+
+
+@pytest.mark.asyncio
+async def test_profiling_admin_only(client: AsyncClient):
+    headers = await get_auth_headers(client, "profile_client@test.com", "client")
+    response = await client.post("/api/v1/admin/profile/cpu?seconds=0.1", headers=headers)
+    assert response.status_code == 403
+    response = await client.post("/api/v1/admin/profile/memory?seconds=0.1", headers=headers)
+    assert response.status_code == 403
+
+
+def burn_cpu(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_collapsed_stacks(client: AsyncClient):
+    headers = await get_auth_headers(client, "profile_admin@test.com", "admin")
+
+    async def busy_handler():
+        # Blocks the event loop like a CPU-bound request would
+        await asyncio.sleep(0.05)
+        burn_cpu(0.2)
+
+    response, _ = await asyncio.gather(
+        client.post("/api/v1/admin/profile/cpu?seconds=0.4&interval_ms=5", headers=headers),
+        busy_handler(),
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert int(response.headers["x-profile-samples"]) > 0
+
+    stacks = parse_collapsed(response.text)
+    assert stacks and all(count > 0 for _, count in stacks)
+    # Stacks are rooted at the thread name, outermost frame first
+    busy = sum(count for frames, count in stacks if frames[0] == "MainThread" and "burn_cpu" in frames[-1])
+    assert busy >= 10
+
+    response = await client.post("/api/v1/admin/profile/cpu?seconds=100000", headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_memory_profile_reports_growth(client: AsyncClient):
+    headers = await get_auth_headers(client, "profile_admin@test.com", "admin")
+    assert not tracemalloc.is_tracing()
+    retained = []
+
+    async def allocate():
+        await asyncio.sleep(0.05)
+        retained.extend(bytearray(1024) for _ in range(2000))
+
+    response, _ = await asyncio.gather(
+        client.post("/api/v1/admin/profile/memory?seconds=0.2&limit=20", headers=headers),
+        allocate(),
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["group_by"] == "lineno"
+    assert body["traced_peak_bytes"] >= 2000 * 1024
+    top = body["top"][0]
+    assert top["size_diff"] >= 2000 * 1024
+    assert "test_profiling.py" in top["location"][0]
+    # tracemalloc was started for the capture only
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.asyncio
+async def test_one_profile_at_a_time(client: AsyncClient):
+    headers = await get_auth_headers(client, "profile_admin@test.com", "admin")
+    async with admin._profile_lock:
+        response = await client.post("/api/v1/admin/profile/cpu?seconds=0.1", headers=headers)
+    assert response.status_code == 409
@@ -0,0 +1,78 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.query_stats import _START_KEY, QueryStatsMiddleware, record_request, route_totals, track_queries
+from app.main import app
+from app.models.job import Job
+from tests.conftest import assert_max_queries, get_auth_headers
+
+
+async def create_job(client: AsyncClient, headers: dict, title: str) -> int:
+    response = await client.post("/api/v1/jobs/", json={
+        "title": title,
+        "description": "Query stats description",
+        "location": "Remote",
+    }, headers=headers)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_read_jobs_query_budget(client: AsyncClient):
+    headers = await get_auth_headers(client, "qstats_owner@test.com", "client")
+    await create_job(client, headers, "Budget Job")
+
+    # current user, ETag aggregate, page
+    with assert_max_queries(3) as stats:
+        response = await client.get("/api/v1/jobs/", headers=headers)
+    assert response.status_code == 200
+    assert stats.count == 3
+    assert stats.rows >= 1
+    assert stats.db_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_server_timing_headers(client: AsyncClient):
+    headers = await get_auth_headers(client, "qstats_headers@test.com", "client")
+    job_id = await create_job(client, headers, "Timed Job")
+
+    # The app's own middleware has headers off (production default); wrap it with them on
+    transport = ASGITransport(app=QueryStatsMiddleware(app, headers=True))
+    async with AsyncClient(transport=transport, base_url="http://test") as dev_client:
+        response = await dev_client.get(f"/api/v1/jobs/{job_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert int(response.headers["x-db-queries"]) >= 2
+    assert "x-db-n-plus-one" not in response.headers
+
+    totals = route_totals[("GET", "/api/v1/jobs/{id}")]
+    assert totals.requests >= 1
+    assert totals.queries >= 2
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_flagged(db_session, capsys):
+    with track_queries() as stats:
+        for job_id in range(6):
+            await db_session.execute(select(Job.id).where(Job.id == job_id))
+        await db_session.execute(select(Job.title))
+    assert stats.count == 7
+    repeated = stats.repeated(5)
+    assert len(repeated) == 1 and repeated[0][1] == 6
+
+    record_request("GET", "/test/n-plus-one", stats, threshold=5)
+    assert route_totals[("GET", "/test/n-plus-one")].n_plus_one == 1
+    assert "[N+1] GET /test/n-plus-one: 6x SELECT" in capsys.readouterr().out
+
+
+async def test_failed_statement_releases_its_start_time(db_session):
+    connection = await db_session.connection()
+    with track_queries() as stats:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                await connection.execute(text("SELECT * FROM no_such_table"))
+        await connection.execute(select(Job.id))
+    assert connection.sync_connection.info[_START_KEY] == []
+    assert stats.count == 1
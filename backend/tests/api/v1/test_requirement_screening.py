@@ -0,0 +1,150 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.models.job_requirement import JobRequirement
+from app.services import requirement_screening
+from app.services.requirement_screening import MUST, NICE, Requirement, atomize, compose, requirement_hash, verdicts_from_gap_analysis
+from tests.api.v1.test_resume_dedup import RESUME as DEDUP_RESUME, apply
+from tests.conftest import TestingSessionLocal, get_auth_headers
+
+# Verdicts are cached by resume content; keep this test's resume to itself
+RESUME = DEDUP_RESUME + "\nSpeaks Portuguese and Spanish."
+
+FULL_SCREENING = {
+    "match_count": 1,
+    "total_must_haves": 2,
+    "score": 64,
+    "justification": "Strong Python, no PostgreSQL.",
+    "gap_analysis": [
+        {"requirement": "M1. Python", "status": "Match", "note": "Seven years"},
+        {"requirement": "M2. Redis", "status": "Missing", "note": "Not mentioned"},
+        {"requirement": "N1. Docker", "status": "Weak", "note": "Implied"},
+    ],
+}
+
+
+def test_atomize_and_compose():
+    text = "- Python\n- 5+ years of PostgreSQL, including tuning\nAWS, Docker, kubernetes;  python."
+    assert atomize(text) == ["Python", "5+ years of PostgreSQL, including tuning", "AWS", "Docker", "kubernetes"]
+    assert requirement_hash("  Python. ") == requirement_hash("python")
+
+    requirements = [Requirement(MUST, f"m{i}", f"m{i}") for i in range(4)] + [Requirement(NICE, "n", "n")]
+    verdicts = {"m0": ("Match", None), "m1": ("Match", None), "m2": ("Weak", None), "m3": ("Missing", None), "n": ("Match", None)}
+    result = compose(requirements, verdicts)
+    # 70 * 2.5/4 + 30 * 1/1
+    assert result["score"] == 74
+    assert (result["match_count"], result["total_must_haves"]) == (2, 4)
+    assert result["justification"] == "Meets 2 of 4 must-have requirements. Missing: m3."
+    assert compose(requirements[:1], verdicts)["score"] == 100
+
+
+def test_gap_analysis_ids_are_stripped():
+    python = Requirement(MUST, "Python", requirement_hash("Python"), "M1")
+    result = {"gap_analysis": [
+        {"requirement": "M1. Python", "status": "Match", "note": ""},
+        # Ids the model made up, or entries without a usable status, still lose the prefix
+        {"requirement": "M7. Go", "status": "Missing", "note": ""},
+        {"requirement": "[N3] Docker", "status": "Unclear", "note": ""},
+    ]}
+    assert verdicts_from_gap_analysis(result, [python]) == {python.hash: ("Match", None)}
+    assert [gap["requirement"] for gap in result["gap_analysis"]] == ["Python", "Go", "Docker"]
+
+
+async def create_job(client: AsyncClient, owner, requirements: str, nice: str = None) -> int:
+    response = await client.post("/api/v1/jobs/", json={
+        "title": "Backend Engineer", "description": "Services", "location": "Remote",
+        "requirements": requirements, "nice_to_have_requirements": nice,
+    }, headers=owner)
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_verdicts_are_cached_and_edits_rescreen_changes_only(
+    client: AsyncClient, mock_ai_screening, mock_requirement_screening, monkeypatch
+):
+    owner = await get_auth_headers(client, "requirements_owner@test.com", "client")
+    candidate = await get_auth_headers(client, "requirements_candidate@test.com", "candidate")
+    job_id = await create_job(client, owner, "Python\nRedis", "Docker")
+
+    screenings, partial = mock_ai_screening.call_count, mock_requirement_screening.call_count
+    previous = mock_ai_screening.return_value
+    mock_ai_screening.return_value = FULL_SCREENING
+    try:
+        response = await apply(client, candidate, job_id, RESUME, force_update=False)
+    finally:
+        mock_ai_screening.return_value = previous
+    assert response.status_code == 200
+    analysis = response.json()["ai_analysis_json"]
+    assert mock_ai_screening.call_count == screenings + 1
+    # Recomposed: 70 * 1/2 + 30 * 0.5/1
+    assert analysis["score"] == 50 and response.json()["ai_score"] == 50
+    must_haves = mock_ai_screening.call_args.kwargs["must_have_requirements"]
+    assert "with its id" in must_haves and must_haves.endswith("M1. Python\nM2. Redis")
+    assert analysis["justification"] == "Strong Python, no PostgreSQL."
+    assert [gap["requirement"] for gap in analysis["gap_analysis"]] == ["Python", "Redis", "Docker"]
+
+    # Another job asking for the same things: answered from the cache, no LLM call
+    other_job = await create_job(client, owner, "python, redis")
+    response = await apply(client, candidate, other_job, RESUME, force_update=False)
+    assert response.status_code == 200
+    assert response.json()["ai_score"] == 50
+    assert mock_ai_screening.call_count == screenings + 1
+    assert mock_requirement_screening.call_count == partial
+
+    # Replacing one requirement re-evaluates just that one for existing applicants
+    monkeypatch.setattr("app.db.session.AsyncSessionLocal", TestingSessionLocal)
+    response = await client.put(f"/api/v1/jobs/{job_id}", json={"requirements": "Python\nKubernetes"}, headers=owner)
+    assert response.status_code == 200
+    assert mock_ai_screening.call_count == screenings + 1
+    assert mock_requirement_screening.call_count == partial + 1
+    assert mock_requirement_screening.call_args.args[2] == [("M2", "Kubernetes")]
+
+    response = await client.get(f"/api/v1/jobs/{job_id}/applications", headers=owner)
+    (application,) = response.json()
+    # 70 * 2/2 + 30 * 0.5/1
+    assert application["ai_score"] == 85
+    assert application["match_count"] == 2
+    assert [gap["status"] for gap in application["ai_analysis_json"]["gap_analysis"]] == ["Match", "Match", "Weak"]
+
+    # Nothing changed in the requirements: no re-screen
+    response = await client.put(f"/api/v1/jobs/{job_id}", json={"requirements": "python\nkubernetes."}, headers=owner)
+    assert response.status_code == 200
+    async with TestingSessionLocal() as db:
+        assert await requirement_screening.rescreen_job(db, job_id) == 1
+    assert mock_requirement_screening.call_count == partial + 1
+
+
+async def stored_requirements(job_id: int) -> list:
+    async with TestingSessionLocal() as db:
+        return [(r.id, r.text) for r in await requirement_screening.job_requirements(db, job_id)]
+
+
+@pytest.mark.asyncio
+async def test_requirements_are_parsed_on_job_writes_only(client: AsyncClient, mock_ai_screening):
+    owner = await get_auth_headers(client, "requirements_writes_owner@test.com", "client")
+    candidate = await get_auth_headers(client, "requirements_writes_candidate@test.com", "candidate")
+    job_id = await create_job(client, owner, "- Go\n- gRPC", "Terraform")
+    assert await stored_requirements(job_id) == [("M1", "Go"), ("M2", "gRPC"), ("N1", "Terraform")]
+
+    body = b'{"title": "Imported", "description": "D", "requirements": "Rust, WebAssembly"}'
+    response = await client.post("/api/v1/jobs/import", content=body, headers={**owner, "Content-Type": "application/x-ndjson"})
+    (imported,) = response.json()["ids"]
+    assert await stored_requirements(imported) == [("M1", "Rust"), ("M2", "WebAssembly")]
+
+    # Applying reads the rows; it neither re-parses the text nor writes them
+    async with TestingSessionLocal() as db:
+        ids = (await db.execute(select(JobRequirement.id).where(JobRequirement.job_id == job_id))).scalars().all()
+    previous = mock_ai_screening.return_value
+    mock_ai_screening.return_value = FULL_SCREENING
+    try:
+        assert (await apply(client, candidate, job_id, RESUME + "\nGo and gRPC.", force_update=False)).status_code == 200
+    finally:
+        mock_ai_screening.return_value = previous
+    assert "M1. Go" in mock_ai_screening.call_args.kwargs["must_have_requirements"]
+    async with TestingSessionLocal() as db:
+        assert (await db.execute(select(JobRequirement.id).where(JobRequirement.job_id == job_id))).scalars().all() == ids
+        with pytest.raises(IntegrityError):
+            await db.execute(insert(JobRequirement).values(job_id=job_id, kind="must", position=1, text="Go", requirement_hash="x"))
+
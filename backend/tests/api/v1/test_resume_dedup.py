@@ -0,0 +1,107 @@
+import io
+
+import docx
+import pytest
+from httpx import AsyncClient
+
+from app.services import resume_dedup
+from tests.conftest import get_auth_headers
+
+RESUME = """
+Jordan Example
+Phone: (555) 201-3344 | jordan@example.com | Updated March 2025
+
+Senior backend engineer with seven years building Python services on PostgreSQL.
+Designed event-driven billing pipelines, led a migration from cron jobs to a task
+queue, and mentored four engineers. Comfortable owning services from design reviews
+through on-call, with a focus on observability, load testing and careful schema changes.
+Built internal tooling for data backfills and wrote the team's incident runbooks.
+"""
+
+
+def make_docx(text: str) -> bytes:
+    document = docx.Document()
+    for line in text.strip().splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+async def apply(client: AsyncClient, headers, job_id: int, text: str, force_update: bool = True):
+    return await client.post(
+        "/api/v1/applications/",
+        data={"job_id": str(job_id), "force_update": str(force_update).lower()},
+        files={"resume": ("resume.docx", io.BytesIO(make_docx(text)), "application/octet-stream")},
+        headers=headers,
+    )
+
+
+async def create_job(client: AsyncClient, email: str) -> int:
+    owner = await get_auth_headers(client, email, "client")
+    response = await client.post("/api/v1/jobs/", json={
+        "title": "Backend Engineer", "description": "Services", "location": "Remote",
+        "requirements": "Python, PostgreSQL, Kubernetes",
+    }, headers=owner)
+    return response.json()["id"]
+
+
+def test_fingerprint_ignores_volatile_details():
+    original = resume_dedup.fingerprint(RESUME)
+    tweaked = resume_dedup.fingerprint(
+        RESUME.replace("(555) 201-3344", "+1 555 999 0000").replace("March 2025", "Oct 2026")
+    )
+    assert tweaked.content_hash == original.content_hash
+    assert resume_dedup.similarity(original.minhash, tweaked.minhash) == 1.0
+
+    edited = resume_dedup.fingerprint(RESUME.replace("mentored four", "mentored five"))
+    assert 0.8 < resume_dedup.similarity(original.minhash, edited.minhash) < 1.0
+    assert set(original.buckets) & set(edited.buckets)
+
+    unrelated = resume_dedup.fingerprint("Pastry chef specializing in laminated doughs and sourdough bread programs.")
+    assert resume_dedup.similarity(original.minhash, unrelated.minhash) < 0.1
+
+
+@pytest.mark.asyncio
+async def test_reupload_reuses_screening(client: AsyncClient, mock_ai_screening):
+    job_id = await create_job(client, "dedup_owner@test.com")
+    candidate = await get_auth_headers(client, "dedup_candidate@test.com", "candidate")
+
+    calls = mock_ai_screening.call_count
+    response = await apply(client, candidate, job_id, RESUME, force_update=False)
+    assert response.status_code == 200
+    application_id = response.json()["id"]
+    assert mock_ai_screening.call_count == calls + 1
+
+    # New phone number and date, plus a line unrelated to the requirements: the stored screening is reused
+    tweaked = RESUME.replace("(555) 201-3344", "(555) 777-1212").replace("March 2025", "July 2026")
+    response = await apply(client, candidate, job_id, tweaked + "\nHobbies: chess.")
+    assert response.status_code == 200
+    assert mock_ai_screening.call_count == calls + 1
+    analysis = response.json()["ai_analysis_json"]
+    assert analysis["reused_from_application"] == application_id
+    assert analysis["resume_similarity"] >= 0.9
+
+    # Adding a skill the job asks for is screened again
+    response = await apply(client, candidate, job_id, RESUME + "\nRan workloads on Kubernetes.")
+    assert response.status_code == 200
+    assert mock_ai_screening.call_count == calls + 2
+    assert "reused_from_application" not in response.json()["ai_analysis_json"]
+
+
+@pytest.mark.asyncio
+async def test_admin_finds_duplicate_accounts(client: AsyncClient):
+    job_id = await create_job(client, "dedup_accounts_owner@test.com")
+    first = await get_auth_headers(client, "dedup_first@test.com", "candidate")
+    second = await get_auth_headers(client, "dedup_second@othermail.com", "candidate")
+    assert (await apply(client, first, job_id, RESUME, force_update=False)).status_code == 200
+    assert (await apply(client, second, job_id, RESUME.replace("Jordan", "Jordyn"), force_update=False)).status_code == 200
+
+    response = await client.get("/api/v1/admin/duplicate-resumes", headers=first)
+    assert response.status_code == 403
+
+    admin = await get_auth_headers(client, "dedup_admin@test.com", "admin")
+    response = await client.get("/api/v1/admin/duplicate-resumes?threshold=0.8", headers=admin)
+    assert response.status_code == 200
+    pairs = [{user["email"] for user in pair["users"]} for pair in response.json()]
+    assert {"dedup_first@test.com", "dedup_second@othermail.com"} in pairs
@@ -0,0 +1,31 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, EmailStr, Field
+
+from app.core.serialization import list_adapter, read_model
+
+
+class Owner(BaseModel):
+    email: EmailStr
+    display_name: str = Field(validation_alias="name", serialization_alias="displayName")
+
+
+class Listing(BaseModel):
+    id: int
+    tags: List[str] = Field(default_factory=list)
+    owner: Optional[Owner] = None
+
+
+def test_read_model_keeps_field_info():
+    fields = read_model(Listing).model_fields
+    assert fields["tags"].default_factory is list
+    assert read_model(Owner).model_fields["email"].annotation is str
+
+    adapter = list_adapter(Listing)
+    items = adapter.validate_python([
+        {"id": 1, "owner": {"email": "not-validated", "name": "Ann"}},
+        {"id": 2, "tags": ["a"]},
+    ])
+    assert items[0].tags == [] and items[0].tags is not items[1].tags
+    dumped = adapter.dump_python(items, by_alias=True)
+    assert dumped[0]["owner"] == {"email": "not-validated", "displayName": "Ann"}
@@ -0,0 +1,87 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+from httpx import AsyncClient
+
+from app.core import workers
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+GiB = 1024 ** 3
+
+
+def test_worker_count_sizing():
+    # Two per CPU, capped by memory and by the configured maximum
+    assert workers.worker_count(1, 4 * GiB, 2, 192, 8) == 2
+    assert workers.worker_count(4, 4 * GiB, 2, 192, 8) == 8
+    assert workers.worker_count(4, GiB // 2, 2, 192, 8) == 2
+    assert workers.worker_count(0.5, None, 2, 192, 8) == 1
+    assert workers.worker_count(1, 100 * 1024 * 1024, 2, 192, 8) == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_health_single_process(client: AsyncClient):
+    response = await client.get("/health/workers")
+    assert response.status_code == 200
+    assert response.json()["mode"] == "single"
+
+
+def _wait_for_workers(url: str, predicate, timeout: float = 60) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            body = httpx.get(url, timeout=2).json()
+            if predicate(body):
+                return body
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise AssertionError(f"{url} did not reach the expected state")
+
+
+def test_launcher_recycles_workers_and_drains(tmp_path):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    env = {
+        **os.environ,
+        "PYTHONPATH": BACKEND_DIR,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{tmp_path}/server.db",
+        "SECRET_KEY": "server",
+        "SERVER_MAX_REQUESTS": "3",
+        "SERVER_MAX_REQUESTS_JITTER": "0",
+        "PREWARM_IMPORTS": "false",
+    }
+    log = open(tmp_path / "server.log", "w+")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--host", "127.0.0.1", "--port", str(port), "--workers", "2"],
+        cwd=tmp_path, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        body = _wait_for_workers(f"{url}/health/workers", lambda b: all(w["healthy"] for w in b["workers"]))
+        assert body["mode"] == "multi" and len(body["workers"]) == 2
+
+        for _ in range(10):
+            assert httpx.get(f"{url}/").status_code == 200
+        body = _wait_for_workers(
+            f"{url}/health/workers",
+            lambda b: sum(w["restarts"] for w in b["workers"]) >= 2 and all(w["healthy"] for w in b["workers"]),
+        )
+        assert body["status"] == "ok"
+
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=15) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
+        log.seek(0)
+        output = log.read()
+        log.close()
+    assert "recycled after" in output
+    assert "[SERVER] All workers stopped" in output
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.core import prewarm
+
+# Loaded on first use (or by app/core/prewarm.py), never while a worker starts
+LAZY_MODULES = ("openai", "google.generativeai", "pypdf", "docx", "aiosmtplib", "app.services.ai_screening")
+
+
+def test_startup_does_not_import_sdks(tmp_path):
+    env = {**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{tmp_path}/startup.db", "SECRET_KEY": "startup"}
+    script = "import sys, app.main; print(' '.join(m for m in %r if m in sys.modules))" % (LAZY_MODULES,)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+        env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.asyncio
+async def test_prewarm_imports_modules(tmp_path, monkeypatch, capsys):
+    (tmp_path / "prewarm_target.py").write_text("LOADED = True\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    await prewarm.prewarm(["json", "prewarm_target", "not_a_real_module_xyz"])
+    out = capsys.readouterr().out
+    # Already imported modules are skipped
+    assert "json" not in out
+    assert sys.modules.pop("prewarm_target").LOADED
+    assert "[PREWARM] prewarm_target imported in" in out
+    assert "[PREWARM] Could not import not_a_real_module_xyz" in out
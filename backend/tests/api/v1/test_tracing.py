@@ -0,0 +1,153 @@
+import io
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from httpx import AsyncClient
+from opentelemetry import trace
+
+from app.core.config import settings
+from app.core.tracing import FileSpanExporter, LocalTracerProvider, configure_tracing
+from app.services.ai_screening import AIScreeningService
+from tests.conftest import get_auth_headers
+
+
+@pytest.fixture(scope="module")
+def spans():
+    # The global provider can only be set once per process; later tests keep it with sampling off
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, LocalTracerProvider):
+        provider = configure_tracing(1.0, exporter="none")
+    collected = []
+
+    def collect(finished):
+        collected.append(finished.to_dict())
+
+    provider.exporters.append(collect)
+    provider.sample_ratio = 1.0
+    yield collected
+    provider.exporters.remove(collect)
+    provider.sample_ratio = 0.0
+
+
+def by_name(spans, name):
+    return [span for span in spans if span["name"] == name]
+
+
+@pytest.mark.asyncio
+async def test_apply_request_trace(client: AsyncClient, spans):
+    owner = await get_auth_headers(client, "trace_owner@test.com", "client")
+    job = await client.post("/api/v1/jobs/", json={
+        "title": "Traced Job", "description": "Tracing", "location": "Remote",
+    }, headers=owner)
+    candidate = await get_auth_headers(client, "trace_candidate@test.com", "candidate")
+    spans.clear()
+
+    response = await client.post(
+        "/api/v1/applications/",
+        data={"job_id": str(job.json()["id"])},
+        files={"resume": ("resume.pdf", io.BytesIO(b"%PDF-1.4 traced"), "application/pdf")},
+        headers=candidate,
+    )
+    assert response.status_code == 200
+
+    [server] = by_name(spans, "POST /api/v1/applications/")
+    assert server["kind"] == "SERVER"
+    assert server["attributes"]["http.route"] == "/api/v1/applications/"
+    trace_spans = [span for span in spans if span["traceId"] == server["traceId"]]
+    names = {span["name"] for span in trace_spans}
+    assert {"resume.upload", "resume.extract_text", "db.commit", "db.refresh", "SELECT", "INSERT"} <= names
+
+    [extract] = by_name(trace_spans, "resume.extract_text")
+    assert extract["attributes"]["resume.format"] == "pdf"
+    assert extract["attributes"]["resume.extraction_outcome"] == "error"
+
+    # The post-commit refreshes are SELECTs under the db.refresh span
+    [refresh] = by_name(trace_spans, "db.refresh")
+    refresh_selects = [span for span in trace_spans if span["parentSpanId"] == refresh["spanId"]]
+    assert len(refresh_selects) >= 3
+    assert all(span["kind"] == "CLIENT" and span["attributes"]["db.system.name"] == "sqlite" for span in refresh_selects)
+
+
+@pytest.mark.asyncio
+async def test_llm_span_records_tokens(spans):
+    class Completions:
+        async def create(self, **kwargs):
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content='{"score": 80}'))],
+                usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30),
+            )
+
+    service = AIScreeningService()
+    service._client = SimpleNamespace(chat=SimpleNamespace(completions=Completions()))
+    spans.clear()
+    with trace.get_tracer("test").start_as_current_span("screening"):
+        result = await service.evaluate_candidate("resume", "Engineer", "Python")
+    assert result == {"score": 80}
+
+    [llm] = by_name(spans, "llm.openai.chat")
+    [root] = by_name(spans, "screening")
+    assert llm["parentSpanId"] == root["spanId"]
+    assert llm["attributes"]["gen_ai.system"] == "openai"
+    assert llm["attributes"]["gen_ai.usage.input_tokens"] == 120
+    assert llm["attributes"]["gen_ai.usage.output_tokens"] == 30
+
+
+@pytest.mark.asyncio
+async def test_requirement_evaluation_span(spans, monkeypatch):
+    class Completions:
+        async def create(self, **kwargs):
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content='{"verdicts": [{"id": "M1", "status": "Match"}]}'))],
+                usage=SimpleNamespace(prompt_tokens=40, completion_tokens=10),
+            )
+
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test")
+    service = AIScreeningService()
+    service._client = SimpleNamespace(chat=SimpleNamespace(completions=Completions()))
+    spans.clear()
+    assert await service.evaluate_requirements("resume", "Engineer", [("M1", "Python")]) == [{"id": "M1", "status": "Match"}]
+
+    [llm] = by_name(spans, "llm.openai.evaluate_requirements")
+    assert llm["attributes"]["screening.requirements"] == 1
+    assert llm["attributes"]["gen_ai.usage.input_tokens"] == 40
+
+
+@pytest.mark.asyncio
+async def test_head_sampling_follows_parent(client: AsyncClient, spans):
+    headers = await get_auth_headers(client, "trace_sampling@test.com", "client")
+    provider = trace.get_tracer_provider()
+    provider.sample_ratio = 0.0
+    try:
+        spans.clear()
+        assert (await client.get("/api/v1/jobs/", headers=headers)).status_code == 200
+        assert spans == []
+
+        # A sampled remote parent keeps the whole trace
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        traceparent = f"00-{trace_id}-00f067aa0ba902b7-01"
+        response = await client.get("/api/v1/jobs/", headers={**headers, "traceparent": traceparent})
+        assert response.status_code == 200
+        assert spans and all(span["traceId"] == trace_id for span in spans)
+        assert by_name(spans, "GET /api/v1/jobs/")[0]["parentSpanId"] == "00f067aa0ba902b7"
+    finally:
+        provider.sample_ratio = 1.0
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    provider = LocalTracerProvider(1.0, [FileSpanExporter(str(path))], resource={"service.name": "test"})
+    tracer = provider.get_tracer("test")
+    with tracer.start_as_current_span("outer"):
+        with pytest.raises(ValueError):
+            with tracer.start_as_current_span("inner", attributes={"k": 1}):
+                raise ValueError("boom")
+
+    inner, outer = [orjson.loads(line) for line in path.read_bytes().splitlines()]
+    assert inner["name"] == "inner" and outer["name"] == "outer"
+    assert inner["traceId"] == outer["traceId"] and len(inner["traceId"]) == 32
+    assert inner["parentSpanId"] == outer["spanId"]
+    assert inner["status"]["code"] == "ERROR"
+    assert inner["events"][0]["name"] == "exception"
+    assert inner["attributes"] == {"k": 1}
+    assert outer["resource"] == {"service.name": "test"}
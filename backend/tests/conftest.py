@@ -1,4 +1,5 @@
 from unittest.mock import patch
+from contextlib import contextmanager
 import asyncio
 import pytest
 from typing import AsyncGenerator
@@ -10,6 +11,7 @@ from app.main import app
 from app.db.base import Base
 from app.api.deps import get_db
 from app.core.config import settings
+from app.core.query_stats import track_queries
 
 # Use an in-memory SQLite database for testing or a separate test DB
 # For simplicity with async, we use the same DB but ideally should use a test DB.
@@ -64,6 +66,26 @@ def mock_ai_screening():
         }
         yield mock
 
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_requirement_screening():
+    # Every requirement sent for a partial re-screen is a Match
+    with patch("app.services.ai_screening.ai_screening_service.evaluate_requirements") as mock:
+        mock.side_effect = lambda resume_text, job_title, requirements: [
+            {"id": requirement_id, "status": "Match", "note": "Mocked"} for requirement_id, _ in requirements
+        ]
+        yield mock
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_profile_extraction():
+    from app.services.ai_screening import AIScreeningService
+
+    # Dictionary-based extraction instead of an LLM call; tests may replace side_effect
+    with patch("app.services.ai_screening.ai_screening_service.extract_profile") as mock:
+        mock.side_effect = AIScreeningService.keyword_profile
+        yield mock
+
 def make_candidate_payload(email: str, password: str = "password123", role: str = "candidate", **overrides):
     """Build a valid signup payload with all required fields."""
     base = {
@@ -136,3 +158,13 @@ async def get_auth_headers(client: AsyncClient, email: str, role: str):
         
     token = login_response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Fail if the block (e.g. one client request) executes more than `limit` SQL statements."""
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        statements = "\n".join(f"  {n}x {' '.join(sql.split())[:160]}" for sql, n in stats.statements.items())
+        pytest.fail(f"Expected at most {limit} queries, got {stats.count}:\n{statements}")
@@ -16,15 +16,24 @@ const ManageUsers = () => {
     const [users, setUsers] = useState<User[]>([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
+    const [search, setSearch] = useState('');
+    const [role, setRole] = useState('');
+    const [total, setTotal] = useState(0);
 
     useEffect(() => {
-        fetchUsers();
-    }, []);
+        // Debounced so typing doesn't send a search per keystroke
+        const timer = setTimeout(fetchUsers, 250);
+        return () => clearTimeout(timer);
+    }, [search, role]);
 
     const fetchUsers = async () => {
         try {
-            const response = await client.get('/admin/users');
+            const params: Record<string, string> = {};
+            if (search.trim()) params.q = search.trim();
+            if (role) params.role = role;
+            const response = await client.get('/admin/users', { params });
             setUsers(response.data);
+            setTotal(Number(response.headers['x-total-count'] ?? response.data.length));
         } catch (err) {
             console.error(err);
             setError('Failed to load users.');
@@ -63,10 +72,26 @@ const ManageUsers = () => {
                     <p className="subtitle">View and manage system access</p>
                 </div>
                 <div style={{ fontSize: '0.875rem', color: 'var(--text-light)' }}>
-                    {users.length} total user{users.length !== 1 ? 's' : ''}
+                    {total} total user{total !== 1 ? 's' : ''}
                 </div>
             </div>
 
+            <div style={{ display: 'flex', gap: '0.75rem', marginBottom: '1rem' }}>
+                <input
+                    type="search"
+                    placeholder="Search by name, email, company or location"
+                    value={search}
+                    onChange={e => setSearch(e.target.value)}
+                    style={{ flex: 1 }}
+                />
+                <select value={role} onChange={e => setRole(e.target.value)}>
+                    <option value="">All roles</option>
+                    <option value="candidate">Candidates</option>
+                    <option value="client">Clients</option>
+                    <option value="admin">Admins</option>
+                </select>
+            </div>
+
             <div className="card" style={{ padding: 0, overflow: 'hidden' }}>
                 <div style={{ overflowX: 'auto' }}>
                     <table style={{ margin: 0, border: 'none', borderRadius: 0 }}>